@@ -1,33 +1,76 @@
 import asyncio
 import re
 import ssl
-from datetime import datetime, timedelta, timezone
+import time
+from datetime import datetime, timedelta
 
 import aiohttp
 import certifi
 import requests
 
-from api.weather import fetch_weather_data
-from utils import debug
-from utils.utils import get_eastern
+from utils import bandwidth, connectivity, debug, metrics
+from utils.time_utils import get_eastern, iso_to_epoch, parse_iso
 
 troublesome_attraction_64x64_ids = ["8d7ccdb1-a22b-4e26-8dc8-65b1938ed5f0","06c599f9-1ddf-4d47-9157-a992acafc96b", "22f48b73-01df-460e-8969-9eb2b4ae836c",  "9211adc9-b296-4667-8e97-b40cf76108e4","64a6915f-a835-4226-ba5c-8389fc4cade3"]
 troublesome_attraction_64x32_ids = ["9211adc9-b296-4667-8e97-b40cf76108e4","64a6915f-a835-4226-ba5c-8389fc4cade3"]
 troublesome_attraction_single_ids = ["1e735ffb-4868-47f1-b2cd-2ac1156cd5f0"]
 
 DISNEY_WORLD_DESTINATION_ID = "e957da41-3552-4cf6-b636-5babc5cbc4e5"
+ROSTER_ENTITY_TYPES = ("ATTRACTION", "SHOW")
+# A live update naming an unknown attraction triggers a roster refresh, at most
+# this often per park; otherwise rosters are only refreshed once a day.
+ROSTER_REFRESH_MIN_SECS = 15 * 60
+ROSTER_MAX_AGE_SECS = 24 * 60 * 60
+# Park id -> unknown attraction ids waiting for the next roster refresh
+_pending_attraction_ids = {}
+# Park id -> ids still missing after a refresh (not in /children at all)
+_unresolved_attraction_ids = {}
+# Failures that mean no response arrived at all (as opposed to an HTTP error
+# status); these feed the offline detection in utils.connectivity.
+NETWORK_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError, requests.ConnectionError, requests.Timeout)
+# Blocking requests share the single blocking-io worker, so none may hang it.
+REQUEST_TIMEOUT_SECS = 20
+# Live data older than STALE_DATA_SECS is shown as stale, older than
+# EXPIRED_DATA_SECS it is not shown at all.
+STALE_DATA_SECS = 30 * 60
+EXPIRED_DATA_SECS = 2 * 60 * 60
 _UUID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
 
 
+def _record_request(endpoint, started, outcome):
+    """Report one REST request (started = time.perf_counter() before it was sent) to the metrics registry."""
+    metrics.inc("rest_requests_total", endpoint=endpoint, outcome=outcome)
+    metrics.observe("rest_request_seconds", time.perf_counter() - started, endpoint=endpoint)
+
+
+def _get_json(api_url, endpoint):
+    """GET a ThemeParks Wiki URL, account its size under endpoint and return the decoded JSON."""
+    started = time.perf_counter()
+    try:
+        response = requests.get(api_url, timeout=REQUEST_TIMEOUT_SECS)
+    except NETWORK_ERRORS as e:
+        connectivity.record_failure(e)
+        _record_request(endpoint, started, "network_error")
+        raise
+    connectivity.record_success()
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        _record_request(endpoint, started, "http_error")
+        raise
+    _record_request(endpoint, started, "ok")
+    data = response.json()
+    bandwidth.record(endpoint, bandwidth.payload_size(response), connection="rest")
+    return data
+
+
 def resolve_destination_id(name_or_id):
     """Return a destination UUID. If name_or_id already looks like a UUID, return it as-is.
     Otherwise fetch the destinations list and match by name (case-insensitive)."""
     if _UUID_RE.match(name_or_id):
         return name_or_id
     try:
-        response = requests.get("https://api.themeparks.wiki/v1/destinations")
-        response.raise_for_status()
-        destinations = response.json().get("destinations", [])
+        destinations = _get_json("https://api.themeparks.wiki/v1/destinations", "destinations").get("destinations", [])
         name_lower = name_or_id.lower()
         for dest in destinations:
             if dest.get("name", "").lower() == name_lower:
@@ -45,9 +88,7 @@ def get_park_location(park_id):
     debug.info("Fetching Disney World schedule data...")
 
     try:
-        response = requests.get(api_url)
-        park_data = response.json()
-        return park_data.get("location")
+        return _get_json(api_url, "entity").get("location")
     except requests.RequestException as e:
         debug.error(f"Failed get park data with location data: {e}")
         return []
@@ -65,16 +106,14 @@ def fetch_park_schedule(park_id):
     debug.info(f"Fetching schedule for park with ID: {park_id}")
 
     try:
-        response = requests.get(api_url)
-        response.raise_for_status()  # Ensure we raise an error for bad responses
-        schedule_data = response.json().get("schedule", [])
+        schedule_data = _get_json(api_url, "schedule").get("schedule", [])
 
         # Filter schedule events to include only those from today or yesterday.
         schedule_filtered = [
             event for event in schedule_data if event.get("date") in (today_str, yesterday_str)
         ]
 
-        debug.log(f"Schedule Data for park ID {park_id}: {schedule_data}")
+        debug.log("Schedule Data for park ID %s: %s", park_id, schedule_data)
         return schedule_filtered
     except requests.RequestException as e:
         debug.error(f"Failed to fetch schedule for park ID {park_id}: {e}")
@@ -91,9 +130,7 @@ def fetch_parks_from_destination(destination_id):
     debug.info("Fetching parks for destination %s", destination_id)
 
     try:
-        response = requests.get(api_url)
-        response.raise_for_status()
-        parks_data = response.json().get("parks", [])
+        parks_data = _get_json(api_url, "schedule").get("parks", [])
 
         today = datetime.now()
         today_str = today.strftime('%Y-%m-%d')
@@ -111,7 +148,7 @@ def fetch_parks_from_destination(destination_id):
             schedule_filtered = [
                 event for event in schedule if event.get("date") in (today_str, yesterday_str)
             ]
-            debug.log(f"Schedule Filter: {schedule_filtered}")
+            debug.log("Schedule Filter: %s", schedule_filtered)
             filtered_parks.append({
                 "name": clean_park_name(park_name) if is_disney else park_name,
                 "id": park.get("id", "Unknown"),
@@ -145,9 +182,7 @@ def resolve_parks_from_config(park_names):
         return fetch_list_of_disney_world_parks()
 
     try:
-        response = requests.get("https://api.themeparks.wiki/v1/destinations")
-        response.raise_for_status()
-        destinations = response.json().get("destinations", [])
+        destinations = _get_json("https://api.themeparks.wiki/v1/destinations", "destinations").get("destinations", [])
     except requests.RequestException as e:
         debug.error(f"Failed to fetch destinations list: {e}")
         return []
@@ -184,56 +219,63 @@ def resolve_parks_from_config(park_names):
 def fetch_parks_and_attractions(disney_park_list):
     parks = []
     for park_info in disney_park_list:
-        park_name = park_info.get("name", "Unknown")
-        park_id = park_info.get("id", "Unknown")
-        schedule = park_info.get("schedule", [])
-        location = park_info.get("location")
-
-        # Use the first OPERATING event to extract opening/closing times and pricing info.
-        operating_event = next((event for event in schedule if event.get("type") == "OPERATING"), {})
-
-        debug.info(f"Fetching attractions for park: {park_name} (ID: {park_id})")
-        api_url = f"https://api.themeparks.wiki/v1/entity/{park_id}/children"
-        try:
-            response = requests.get(api_url)
-            response.raise_for_status()
-            park_data = response.json()
-            debug.log(f"{park_name} Park Data: {park_data}")
-        except requests.RequestException as e:
-            debug.error(f"Failed to fetch attractions for park {park_name}: {e}")
-            continue
-
-        attractions = []
-        for item in park_data.get("children", []):
-            if item.get("entityType") in ("ATTRACTION", "SHOW"):
-                attraction = {
-                    "id": item.get("id"),
-                    "name": get_attraction_name(item),
-                    "entityType": item.get("entityType"),
-                    "parkId": park_id,
-                    "waitTime": '',      # Placeholder for wait time
-                    "status": '',        # Placeholder for status
-                    "lastUpdatedTs": ''  # Placeholder for timestamp
-                }
-                debug.log(f"Attraction found: {attraction}")
-                attractions.append(attraction)
-        debug.info(f"{len(attractions)} were found in {park_name}")
-        park_obj = {
-            "id": park_id,
-            "name": park_name,
-            "destination_id": park_info.get("destination_id"),
-            "attractions": attractions,
-            "specialTicketedEvent": is_special_event(schedule),
-            "closingTime": operating_event.get("closingTime", ""),
-            "openingTime": operating_event.get("openingTime", ""),
-            "llmpPrice": determine_llmp_price(operating_event),
-            "weather": fetch_weather_data(location.get("latitude"), location.get("longitude")),
-            "location": location
-        }
-        parks.append(park_obj)
+        park = fetch_park_and_attractions(park_info)
+        if park is not None:
+            parks.append(park)
     return parks
 
 
+def fetch_park_and_attractions(park_info):
+    """Build one park's object (roster, schedule fields), or None if its roster can't be fetched. Weather is filled in later."""
+    park_name = park_info.get("name", "Unknown")
+    park_id = park_info.get("id", "Unknown")
+    schedule = park_info.get("schedule", [])
+    location = park_info.get("location")
+
+    # Use the first OPERATING event to extract opening/closing times and pricing info.
+    operating_event = next((event for event in schedule if event.get("type") == "OPERATING"), {})
+
+    debug.info(f"Fetching attractions for park: {park_name} (ID: {park_id})")
+    api_url = f"https://api.themeparks.wiki/v1/entity/{park_id}/children"
+    try:
+        park_data = _get_json(api_url, "children")
+        debug.log("%s Park Data: %s", park_name, park_data)
+    except requests.RequestException as e:
+        debug.error(f"Failed to fetch attractions for park {park_name}: {e}")
+        return None
+
+    attractions = []
+    for item in park_data.get("children", []):
+        if item.get("entityType") in ROSTER_ENTITY_TYPES:
+            attraction = {
+                "id": item.get("id"),
+                "name": get_attraction_name(item),
+                "entityType": item.get("entityType"),
+                "parkId": park_id,
+                "waitTime": '',      # Placeholder for wait time
+                "status": '',        # Placeholder for status
+                "lastUpdatedTs": ''  # Placeholder for timestamp
+            }
+            debug.log("Attraction found: %s", attraction)
+            attractions.append(attraction)
+    debug.info(f"{len(attractions)} were found in {park_name}")
+    park_obj = {
+        "id": park_id,
+        "name": park_name,
+        "destination_id": park_info.get("destination_id"),
+        "attractions": attractions,
+        "specialTicketedEvent": is_special_event(schedule),
+        "closingTime": operating_event.get("closingTime", ""),
+        "openingTime": operating_event.get("openingTime", ""),
+        "llmpPrice": determine_llmp_price(operating_event),
+        "weather": None,
+        "location": location,
+        "roster_refreshed_at": time.time()
+    }
+    set_schedule_epochs(park_obj)
+    return park_obj
+
+
 def clean_park_name(raw_name):
     return raw_name.replace("Theme", " ").replace("Park", " ").replace("Disney's", "").strip()
 
@@ -251,6 +293,36 @@ def is_special_event(schedule):
         for event in schedule
     )
 
+# Schedule entry types during which a park has guests and live data changes.
+OPEN_SCHEDULE_TYPES = ("OPERATING", "EXTRA_HOURS", "TICKETED_EVENT")
+
+
+def schedule_windows(schedule):
+    """
+    Return (opening, closing) aware datetimes for every open-to-guests entry in a
+    park schedule. Entries with missing or unparseable times are skipped.
+    """
+    windows = []
+    for event in schedule or []:
+        if event.get("type") not in OPEN_SCHEDULE_TYPES:
+            continue
+        opening = parse_iso(event.get("openingTime"))
+        closing = parse_iso(event.get("closingTime"))
+        if opening is None or closing is None:
+            continue
+        windows.append((opening, closing))
+    return windows
+
+def set_schedule_epochs(park):
+    """
+    Parse the park's openingTime/closingTime once into 'openingEpoch' /
+    'closingEpoch' so status checks and schedule timers compare floats.
+    """
+    park["openingEpoch"] = iso_to_epoch(park.get("openingTime"))
+    park["closingEpoch"] = iso_to_epoch(park.get("closingTime"))
+    return park
+
+
 def determine_llmp_price(operating_event):
     lightning_lane_multi_pass_price = ""
     if operating_event and "purchases" in operating_event:
@@ -261,73 +333,167 @@ def determine_llmp_price(operating_event):
     return lightning_lane_multi_pass_price
 
 
-def get_down_time(last_updated_date):
-    try:
-        normalized = last_updated_date.replace("Z", "+00:00")
-        target_date = datetime.fromisoformat(normalized)
-        current_time = datetime.now(timezone.utc)
-        time_diff = current_time - target_date
-        minutes = time_diff.total_seconds() / 60
-        return round(minutes)
-    except (ValueError, AttributeError):
-        debug.error(f"Invalid date format: {last_updated_date}")
+def apply_queue_data(attraction, status, queue, entity_type=None):
+    """
+    Store typed wait fields from a liveData queue: 'waitTime' (standby minutes)
+    and 'boardingGroup' ({"start", "end"}). Nothing is formatted here; the
+    display derives its text (including minutes down) at render time.
+    CLOSED/REFURBISHMENT keep their last values; DOWN clears them, unless
+    entity_type names something other than an ATTRACTION (a DOWN show keeps them).
+    """
+    if status in ("CLOSED", "REFURBISHMENT"):
+        return
+    if status == "DOWN":
+        if entity_type in (None, "ATTRACTION"):
+            attraction["waitTime"] = None
+            attraction["boardingGroup"] = None
+        return
+    attraction["waitTime"] = None
+    attraction["boardingGroup"] = None
+    queue = queue or {}
+    standby_wait = queue.get("STANDBY", {}).get("waitTime", None)
+    if standby_wait is not None:
+        attraction["waitTime"] = standby_wait
+        return
+    bg = queue.get("BOARDING_GROUP", {})
+    if bg.get("currentGroupStart") is not None:
+        attraction["boardingGroup"] = {"start": bg["currentGroupStart"], "end": bg.get("currentGroupEnd")}
+
+
+def has_wait_info(attraction):
+    """True if the attraction has a standby wait or a boarding group to show."""
+    return attraction.get("waitTime") not in (None, '') or bool(attraction.get("boardingGroup"))
+
+
+def data_age(attraction, now=None):
+    """Seconds since the attraction's live data was last updated upstream, or None if unknown."""
+    epoch = attraction.get("lastUpdatedEpoch")
+    if epoch is None:
+        epoch = iso_to_epoch(attraction.get("lastUpdatedTs"))
+    if epoch is None:
         return None
+    now = time.time() if now is None else now
+    return max(0.0, now - epoch)
+
+
+def _report_fetch_error(what, error):
+    """Log a failed live fetch; while offline, network failures are expected and only logged at debug level."""
+    if isinstance(error, NETWORK_ERRORS):
+        connectivity.record_failure(error)
+        if connectivity.is_offline():
+            debug.log(f"Offline; live data for {what} not fetched: {error}")
+            return
+    debug.error(f"Error occurred while fetching live data for {what}: {error}")
+
+
+def apply_live_entry(attraction, live_data_entry):
+    """Copy status, timestamp and typed wait fields from a ThemeParks liveData entry onto an attraction."""
+    attraction["lastUpdatedTs"] = live_data_entry.get("lastUpdated", None)
+    attraction["lastUpdatedEpoch"] = iso_to_epoch(attraction["lastUpdatedTs"])
+    attraction["status"] = live_data_entry.get("status", None)
+    apply_queue_data(attraction, attraction["status"], live_data_entry.get("queue"),
+                     live_data_entry.get("entityType"))
+
 
 async def fetch_live_data_for_attraction(session, attraction):
     """
     Fetch live data for a single attraction.
-    If the status is not "CLOSED" or "REFURBISHMENT", update the waitTime.
+    Returns an updated copy (ready for merge_live_data), or the attraction
+    itself, unchanged, if the request failed.
     """
-    current_data = attraction.copy()
-
     api_url = f"https://api.themeparks.wiki/v1/entity/{attraction['id']}/live"
-    debug.log(f"Fetching live data for attraction: {attraction['name']} (ID: {attraction['id']})")
+    debug.log("Fetching live data for attraction: %s (ID: %s)", attraction['name'], attraction['id'])
+    started = time.perf_counter()
     try:
         async with session.get(api_url) as response:
-            if response.status == 200:
-                data = await response.json()
-                live_data_info = data.get('liveData', [])
-                if live_data_info:
-                    live_data_entry = live_data_info[0]  # Use the first liveData entry
-                    attraction["lastUpdatedTs"] = live_data_entry.get("lastUpdated", None)
-                    attraction["status"] = live_data_entry.get("status", None)
-                    if live_data_entry.get("status") == "DOWN" and live_data_entry.get("entityType") == "ATTRACTION":
-                        attraction["waitTime"] = f"Down {get_down_time(live_data_entry.get('lastUpdated'))}"
-                    if live_data_entry.get("status") not in ["CLOSED", "REFURBISHMENT","DOWN"]:
-                        queue = live_data_entry.get("queue", {})
-                        standby_wait = queue.get("STANDBY", {}).get("waitTime", None)
-                        if standby_wait is not None:
-                            attraction["waitTime"] = standby_wait
-                        else:
-                            bg = queue.get("BOARDING_GROUP", {})
-                            start = bg.get("currentGroupStart")
-                            end = bg.get("currentGroupEnd")
-                            if start is not None and end is not None:
-                                attraction["waitTime"] = f"Groups {start}-{end}"
-                            elif start is not None:
-                                attraction["waitTime"] = f"Group {start}+"
-                            else:
-                                attraction["waitTime"] = None
-            else:
+            connectivity.record_success()
+            if response.status != 200:
+                _record_request("live", started, "http_error")
                 debug.error(f"Failed to fetch live data for {attraction['name']}, Status Code: {response.status}")
+                return attraction
+            data = await response.json()
+            _record_request("live", started, "ok")
+            bandwidth.record("live", bandwidth.payload_size(response), connection="rest")
+    except Exception as e:
+        _record_request("live", started, "network_error" if isinstance(e, NETWORK_ERRORS) else "error")
+        _report_fetch_error(attraction['name'], e)
+        return attraction
+
+    fresh = attraction.copy()
+    live_data_info = data.get('liveData', [])
+    if live_data_info:
+        apply_live_entry(fresh, live_data_info[0])  # Use the first liveData entry
+    if debug.enabled() and fresh != attraction:
+        debug.log("There is new data for %s | Wait time: %s(Existing) vs %s(New) | Status: %s(Existing) vs %s(New) "
+                  "| Last updated: %s(Existing) vs %s(New)", attraction['name'],
+                  attraction['waitTime'], fresh['waitTime'], attraction['status'], fresh['status'],
+                  get_eastern(attraction['lastUpdatedTs']), get_eastern(fresh['lastUpdatedTs']))
+    elif debug.enabled():
+        debug.log("No new data for %s", attraction['name'])
+    return fresh
+
+
+async def fetch_park_live_data(session, park):
+    """
+    Fetch live data for every attraction in a park with a single request to the
+    park's /live endpoint. Returns updated copies of the park's known attractions
+    (ready for merge_live_data), or None if the request failed.
+    """
+    park_name = park.get("name", "Unknown")
+    api_url = f"https://api.themeparks.wiki/v1/entity/{park.get('id')}/live"
+    debug.log("Fetching bulk live data for park: %s", park_name)
+    started = time.perf_counter()
+    try:
+        async with session.get(api_url) as response:
+            connectivity.record_success()
+            if response.status != 200:
+                _record_request("park_live", started, "http_error")
+                debug.error(f"Failed to fetch live data for {park_name}, Status Code: {response.status}")
+                return None
+            data = await response.json()
+            _record_request("park_live", started, "ok")
+            bandwidth.record("live", bandwidth.payload_size(response), connection="rest")
     except Exception as e:
-        debug.error(f"Error occurred while fetching live data for {attraction['name']}: {e}")
+        _record_request("park_live", started, "network_error" if isinstance(e, NETWORK_ERRORS) else "error")
+        _report_fetch_error(park_name, e)
+        return None
+
+    entries = {entry.get("id"): entry for entry in data.get("liveData", [])}
+    known_ids = {attraction.get("id") for attraction in park.get("attractions", [])}
+    for entity_id, entry in entries.items():
+        if (entity_id not in known_ids and entry.get("entityType") in ROSTER_ENTITY_TYPES
+                and entry.get("parkId", park.get("id")) == park.get("id")):
+            note_unknown_attraction(park, entity_id)
+    updated = []
+    for attraction in park.get("attractions", []):
+        entry = entries.get(attraction.get("id"))
+        if entry is None:
+            continue
+        fresh = attraction.copy()
+        apply_live_entry(fresh, entry)
+        updated.append(fresh)
+    debug.log(f"Bulk live data for {park_name}: {len(updated)} of {len(park.get('attractions', []))} attractions")
+    return updated
+
+
+def create_client_session():
+    """Return an aiohttp session that verifies TLS against certifi's CA bundle."""
+    ssl_ctx = ssl.create_default_context(cafile=certifi.where())
+    connector = aiohttp.TCPConnector(ssl=ssl_ctx)
+    return aiohttp.ClientSession(connector=connector)
 
-    if current_data != attraction:
-        debug.log(f"There is new data for {attraction['name']} | Wait time: {current_data['waitTime']}(Existing) vs {attraction['waitTime']}(New) | Status: {current_data['status']}(Existing) vs {attraction['status']}(New) | Last updated: {get_eastern(current_data['lastUpdatedTs'])}(Existing) vs {get_eastern(attraction['lastUpdatedTs'])}(New)")
-    else:
-        debug.log(f"No new data for {attraction['name']}")
-    return attraction
 
-async def fetch_live_data(attractions):
+async def fetch_live_data(attractions, session=None):
     """
     Fetch live data for all attractions concurrently.
+    Pass a long-lived session to reuse its connection pool; otherwise a
+    session is opened for this call only.
     """
-    ssl_ctx = ssl.create_default_context(cafile=certifi.where())
-    connector = aiohttp.TCPConnector(ssl=ssl_ctx)
-    async with aiohttp.ClientSession(connector=connector) as session:
-        tasks = [fetch_live_data_for_attraction(session, attraction) for attraction in attractions]
-        results = await asyncio.gather(*tasks)
+    if session is None:
+        async with create_client_session() as own_session:
+            return await fetch_live_data(attractions, own_session)
+    tasks = [fetch_live_data_for_attraction(session, attraction) for attraction in attractions]
+    results = await asyncio.gather(*tasks)
     debug.log(f"Total live data fetched: {len(results)}")
     return results
 
@@ -338,61 +504,51 @@ def park_has_operating_attraction(park):
     A park whose entire live feed has gone stale (all DOWN, no OPERATING) returns False.
     A park past its closing time returns False regardless of API status.
     """
-    closing_time_str = park.get("closingTime")
-    if closing_time_str:
-        try:
-            closing_dt = datetime.fromisoformat(closing_time_str)
-            now = datetime.now(closing_dt.tzinfo)
-            if now > closing_dt:
-                debug.info(f"{park['name']} is past closing time ({closing_time_str}), marking non-operating.")
-                return False
-        except (ValueError, TypeError):
-            pass
-
-    debug.log(f"Searching for open attractions in {park['name']}")
+    if "closingEpoch" not in park:
+        set_schedule_epochs(park)
+    closing_epoch = park["closingEpoch"]
+    if closing_epoch is not None and time.time() > closing_epoch:
+        debug.info(f"{park['name']} is past closing time ({park.get('closingTime')}), marking non-operating.")
+        return False
+
+    debug.log("Searching for open attractions in %s", park['name'])
     for attraction in park.get("attractions", []):
-        wait_time = attraction.get("waitTime")
         status = attraction.get("status")
-        debug.log(
-            f"Attraction: {attraction['name']} (Park: {park['name']}) | "
-            f"Wait Time: {wait_time} | Status: {status}"
-        )
-        if status and status.upper() == "OPERATING" and wait_time not in (None, ''):
+        debug.log("Attraction: %s", debug.Fields(name=attraction['name'], park=park['name'],
+                                                 wait=attraction.get("waitTime"), status=status))
+        if status and status.upper() == "OPERATING" and has_wait_info(attraction):
             debug.info(f"Found open attraction in {park['name']}: {attraction['name']}")
             return True
     debug.info(f"{park['name']}: no OPERATING attractions found, marking non-operating.")
     return False
 
 
-def update_parks_operating_status(parks, fetch_schedules=True):
+def update_parks_operating_status(parks):
     """
     Updates each park object in the list with a new key 'operating' that is
     True if the park has at least one operating attraction with a valid
     wait time, otherwise False.
 
-    When a park transitions from closed to open it needs a schedule fetch
-    (blocking HTTP). With fetch_schedules=False that work is only flagged via
-    'schedule_refresh_needed' — safe to call from the WS event loop — and a
-    later call with fetch_schedules=True (the REST thread) performs it.
+    When a park transitions from closed to open it needs a schedule fetch,
+    unless it was prefetched ahead of its opening. That blocking HTTP is only
+    flagged via 'schedule_refresh_needed', so this is safe to call from the
+    event loop; the schedule_refresher task performs it.
     """
 
     for park in parks:
         is_park_open = park_has_operating_attraction(park)  # Check if any attractions are operating
         if not park.get("operating") and is_park_open:
-            park["schedule_refresh_needed"] = True
+            # A park warmed up by opening_prefetcher already has today's schedule.
+            if not park.pop("prefetched_for", None):
+                park["schedule_refresh_needed"] = True
         # Update the operating status
         park["operating"] = is_park_open
 
-        if fetch_schedules and park.get("schedule_refresh_needed"):
-            handle_park_schedule_update(park)
-            park["schedule_refresh_needed"] = False
-
     return parks
 
 
-def handle_park_schedule_update(park):
-    debug.info(f"{park.get('name')} is now operating. Fetching schedule...")
-    schedule = fetch_park_schedule(park.get("id"))
+def apply_park_schedule(park, schedule):
+    """Store a freshly fetched schedule and the details derived from it on the park."""
     park["schedule"] = schedule
     debug.info(f"Updated schedule for {park.get('name')}")
 
@@ -402,31 +558,62 @@ def handle_park_schedule_update(park):
     park["specialTicketedEvent"] = is_special_event(schedule)
     park["closingTime"] = operating_event.get("closingTime", "")
     park["openingTime"] = operating_event.get("openingTime", "")
-
-    refresh_park_attractions(park)
+    set_schedule_epochs(park)
 
 
-def refresh_park_attractions(park):
+def note_unknown_attraction(park, entity_id):
     """
-    Re-fetch the children endpoint when a park opens and reconcile the attraction list:
-    update names, add new attractions, remove ones no longer returned.
+    Record that a live update mentioned an attraction the park's roster doesn't
+    know. Flags the park with 'roster_refresh_needed'; any number of unknown ids
+    seen before the refresh runs are coalesced into that one refresh. Ids that a
+    refresh already failed to resolve are ignored.
     """
-    park_id = park.get("id")
-    park_name = park.get("name", "Unknown")
-    api_url = f"https://api.themeparks.wiki/v1/entity/{park_id}/children"
+    if entity_id in _unresolved_attraction_ids.get(park.get("id"), ()):
+        return
+    pending = _pending_attraction_ids.setdefault(park.get("id"), set())
+    if entity_id in pending:
+        return
+    pending.add(entity_id)
+    if not park.get("roster_refresh_needed"):
+        debug.info(f"Unknown attraction {entity_id} in {park.get('name')} live data; roster refresh requested.")
+    park["roster_refresh_needed"] = True
 
+
+def roster_refresh_due(park, now=None):
+    """
+    True when the park's roster should be re-fetched: on demand (an unknown id was
+    seen) no more than once per ROSTER_REFRESH_MIN_SECS, and otherwise once it is
+    ROSTER_MAX_AGE_SECS old.
+    """
+    now = time.time() if now is None else now
+    refreshed_at = park.get("roster_refreshed_at")
+    if refreshed_at is None:
+        return True
+    age = now - refreshed_at
+    if park.get("roster_refresh_needed"):
+        return age >= ROSTER_REFRESH_MIN_SECS
+    return age >= ROSTER_MAX_AGE_SECS
+
+
+def fetch_park_children(park):
+    """Return the raw /children list for a park, or None if the request failed."""
+    api_url = f"https://api.themeparks.wiki/v1/entity/{park.get('id')}/children"
     try:
-        response = requests.get(api_url)
-        response.raise_for_status()
-        children = response.json().get("children", [])
+        return _get_json(api_url, "children").get("children", [])
     except requests.RequestException as e:
-        debug.error(f"Failed to refresh attractions for {park_name}: {e}")
-        return
+        debug.error(f"Failed to refresh attractions for {park.get('name', 'Unknown')}: {e}")
+        return None
+
+
+def reconcile_park_attractions(park, children):
+    """Reconcile a park's attraction list against a fetched /children list."""
+    park_id = park.get("id")
+    park_name = park.get("name", "Unknown")
 
     fresh = {
         item["id"]: item
         for item in children
-        if item.get("entityType") in ("ATTRACTION", "SHOW")
+        if item.get("entityType") in ROSTER_ENTITY_TYPES
     }
 
     existing = park.get("attractions", [])
@@ -456,6 +643,14 @@ def refresh_park_attractions(park):
     if removed:
         debug.info(f"Removed {removed} attraction(s) from {park_name} no longer in roster")
 
+    park["roster_refreshed_at"] = time.time()
+    park["roster_refresh_needed"] = False
+    # Ids the new roster still doesn't contain won't trigger another refresh.
+    unresolved = _pending_attraction_ids.pop(park_id, set()) - fresh.keys()
+    if unresolved:
+        _unresolved_attraction_ids.setdefault(park_id, set()).update(unresolved)
+        debug.info(f"{len(unresolved)} live id(s) not in the {park_name} roster; ignoring them from now on")
+
     debug.info(f"Refreshed {len(park['attractions'])} attractions for {park_name}")
 
 
@@ -1,49 +1,152 @@
+import asyncio
 import json
+import time
 
-import pyowm
-import requests
+import aiohttp
 
-from utils import debug
+from utils import bandwidth, debug, metrics
+
+# Observations are cached per coordinate bucket for this long...
+WEATHER_TTL_SECS = 10 * 60
+# ...and coordinates are snapped to a grid of this many degrees (~20 km), so
+# parks at one resort share a single observation.
+WEATHER_BUCKET_DEGREES = 0.2
+# The async client calls OpenWeatherMap's current-weather endpoint directly;
+# base_url can point at a local stub server instead.
+OWM_BASE_URL = "https://api.openweathermap.org/data/2.5"
+WEATHER_TIMEOUT_SECS = 10
+WEATHER_REFRESH_SECS = 10 * 60
 
 weather_api_key_valid= True
 
+_settings = None     # apikey, ttl, bucket_degrees, base_url, timeout, refresh; read from config.json once
+_cache = {}          # (lat, lon) bucket -> (monotonic fetch time, weather dict)
+cache_stats = {"hits": 0, "misses": 0}
+
 def load_config(file_path):
     """Load the configuration from a JSON file."""
     with open(file_path, 'r') as file:
         config = json.load(file)
     return config
 
-def fetch_weather_data(lat, lon):
-    """Fetch the current weather data for the specified city."""
-    config = load_config('config.json')
-    weather_api_key = config['weather']['apikey']  # Set up your weather API key
-    global weather_api_key_valid  # Use the global flag to modify the outside state
-    debug.info(f"Your Open Weather API Key is valid? {weather_api_key_valid}")
+def reset():
+    """Forget the loaded settings and every cached observation."""
+    global _settings, weather_api_key_valid
+    _settings = None
+    weather_api_key_valid = True
+    _cache.clear()
+    cache_stats.update(hits=0, misses=0)
+
+def _get_settings():
+    global _settings
+    if _settings is None:
+        weather_config = load_config('config.json').get('weather', {})
+        _settings = {
+            "apikey": weather_config.get('apikey'),
+            "ttl": float(weather_config.get('cache_ttl_minutes', WEATHER_TTL_SECS / 60)) * 60,
+            "bucket_degrees": float(weather_config.get('bucket_degrees', WEATHER_BUCKET_DEGREES)),
+            "base_url": weather_config.get('base_url', OWM_BASE_URL).rstrip('/'),
+            "timeout": float(weather_config.get('timeout_seconds', WEATHER_TIMEOUT_SECS)),
+            "refresh": float(weather_config.get('refresh_minutes', WEATHER_REFRESH_SECS / 60)) * 60,
+        }
+    return _settings
+
+def refresh_interval():
+    """Seconds between weather refreshes (the weather task's own interval)."""
+    return _get_settings()["refresh"]
+
+def coordinate_bucket(lat, lon, degrees=None):
+    """Snap coordinates to the centre of their grid cell."""
+    degrees = _get_settings()["bucket_degrees"] if degrees is None else degrees
+    if not degrees:
+        return (lat, lon)
+    return (round(round(lat / degrees) * degrees, 4), round(round(lon / degrees) * degrees, 4))
+
+def weather_from_owm(data):
+    """Build the park weather dict from an OpenWeatherMap current-weather response (imperial units)."""
+    condition = (data.get("weather") or [{}])[0]
+    status = condition.get("main", "")
+    return {
+        "temperature": str(int(data.get("main", {}).get("temp", 0))) + "°",
+        "description": condition.get("description", ""),
+        "short_description": "T-Storm" if "thunderstorm" in status.lower() else status,
+        "city": data.get("name", ""),
+        "icon": condition.get("icon"),
+    }
+
+async def fetch_weather_async(session, lat, lon, now=None):
+    """
+    Current weather near the given coordinates: one request with its own
+    timeout, on the given aiohttp session. Parks in the same coordinate bucket
+    share one cached observation until it is older than the TTL. If a refresh
+    fails, the last observation for the bucket (if any) is returned.
+    """
+    global weather_api_key_valid
+    settings = _get_settings()
+    now = time.monotonic() if now is None else now
+    bucket = coordinate_bucket(lat, lon)
+    cached = _cache.get(bucket)
+    if cached is not None and now - cached[0] < settings["ttl"]:
+        cache_stats["hits"] += 1
+        return cached[1]
+    fallback = cached[1] if cached is not None else None
+    if not weather_api_key_valid or not settings["apikey"]:
+        return fallback
+    cache_stats["misses"] += 1
+    params = {"lat": bucket[0], "lon": bucket[1], "appid": settings["apikey"], "units": "imperial"}
+    debug.info(f"Fetching weather for lat:{bucket[0]} and lon:{bucket[1]}")
+    outcome = "error"
+    started = time.perf_counter()
     try:
-        debug.info(f"Fetching weather for lat:{lat} and lon:{lon}")
-        if weather_api_key_valid:
-            owm = pyowm.OWM(weather_api_key)
-            client = owm.weather_manager()
-            observation = client.weather_at_coords(lat, lon)
-            weather_data = observation.weather  # Get the weather data
-            debug.log(f"Weather Data for {observation.location.name}: {weather_data}")
-            return {
-                "temperature": str(int(weather_data.temperature('fahrenheit')["temp"])) + "°",
-                "description": weather_data.detailed_status,
-                "short_description": "T-Storm" if "thunderstorm" in weather_data.status.lower() else weather_data.status,
-                "city": observation.location.name,
-                "icon": weather_data.weather_icon_name # Icon code
-            }
-        else:
-            debug.warning("[WEATHER] API key is invalid. Skipping API call.")
-            return None  # Don't make further calls if the key is invalid
-    except pyowm.commons.exceptions.UnauthorizedError:
-        weather_api_key_valid = False  # Mark the key as invalid
-        debug.warning(
-            "[WEATHER] The API key provided doesn't appear to be valid. Please check your config.json."
-        )
-        return None
-    except requests.RequestException as e:
-        weather_api_key_valid = False  # Mark the key as invalid
-        debug.error(f"Failed to fetch weather data: {e}")
-        return None
\ No newline at end of file
+        async with session.get(f"{settings['base_url']}/weather", params=params,
+                               timeout=aiohttp.ClientTimeout(total=settings["timeout"])) as response:
+            if response.status == 401:
+                outcome = "unauthorized"
+                weather_api_key_valid = False
+                debug.warning(
+                    "[WEATHER] The API key provided doesn't appear to be valid. Please check your config.json."
+                )
+                return None
+            if response.status != 200:
+                outcome = "http_error"
+                debug.error(f"Failed to fetch weather data: HTTP {response.status}")
+                return fallback
+            bandwidth.record("weather", bandwidth.payload_size(response), connection="rest")
+            outcome = "bad_response"
+            weather = weather_from_owm(await response.json())
+            outcome = "ok"
+    except asyncio.TimeoutError as e:
+        outcome = "timeout"
+        debug.error(f"Failed to fetch weather data: {e!r}")
+        return fallback
+    except aiohttp.ClientError as e:
+        debug.error(f"Failed to fetch weather data: {e!r}")
+        return fallback
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        # A 200 with a body we can't read (bad JSON, missing or null fields).
+        debug.error(f"Unexpected weather response: {e!r}")
+        return fallback
+    finally:
+        metrics.inc("weather_requests_total", outcome=outcome)
+        metrics.observe("weather_request_seconds", time.perf_counter() - started)
+    _cache[bucket] = (now, weather)
+    return weather
+
+async def refresh_weather(parks, session):
+    """
+    Refresh weather for every park with a location: parks are grouped by
+    coordinate bucket and each bucket is fetched once, all buckets concurrently.
+    A park keeps its previous weather if its bucket can't be fetched.
+    """
+    by_bucket = {}
+    for park in parks:
+        location = park.get("location")
+        if location:
+            bucket = coordinate_bucket(location.get("latitude"), location.get("longitude"))
+            by_bucket.setdefault(bucket, []).append(park)
+    results = await asyncio.gather(*(fetch_weather_async(session, *bucket) for bucket in by_bucket))
+    for bucket_parks, weather in zip(by_bucket.values(), results):
+        if weather is not None:
+            for park in bucket_parks:
+                park["weather"] = weather
+    return len(by_bucket)
@@ -0,0 +1,127 @@
+"""
+Measure the CPU cost of hot-path log lines with DEBUG off (the production
+setting), comparing eager f-strings with the lazy, level-guarded calls in
+utils.debug.
+
+Cases, each run for the same number of iterations:
+
+  * "Updated parks data" dump of a four-park parks_data list
+  * "WS raw" dump of one WebSocket frame
+  * the per-attraction "new data" comparison with two get_eastern calls
+  * "Skipping {park}" at INFO, emitted on every rotation vs throttled
+
+Records that are emitted go to a formatter writing into memory, so file I/O is
+not part of the numbers. Reported: CPU microseconds per call.
+
+Run from the repository root:
+
+    python benchmarks/bench_logging.py
+"""
+import io
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import debug  # noqa: E402
+from utils.time_utils import get_eastern  # noqa: E402
+
+ITERATIONS = 20000
+PARKS = 4
+ATTRACTIONS_PER_PARK = 60
+
+_ATTRACTION = {
+    "id": "75ea578a-adc8-4116-a54d-dccb60765ef9",
+    "name": "Space Mountain",
+    "waitTime": 35,
+    "status": "OPERATING",
+    "lastUpdatedTs": "2025-05-10T16:11:00Z",
+    "lastUpdatedEpoch": 1746893460.0,
+    "boardingGroup": None,
+}
+PARKS_DATA = [{"id": f"park-{p}", "name": f"Park {p}", "operating": True,
+               "attractions": [dict(_ATTRACTION, id=f"ride-{p}-{a}") for a in range(ATTRACTIONS_PER_PARK)]}
+              for p in range(PARKS)]
+WS_FRAME = json.dumps({"event": "update", "entityId": "ride-0-0", "data": {"liveData": [_ATTRACTION]}})
+
+
+def _quiet_logger():
+    """Point the app logger at an in-memory stream at INFO, like a production run."""
+    for handler in list(debug.logger.handlers):
+        debug.logger.removeHandler(handler)
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(debug.formatter)
+    debug.logger.addHandler(handler)
+    debug.logger.setLevel(logging.INFO)
+    return stream
+
+
+def cpu_per_call(func):
+    started = time.process_time()
+    for _ in range(ITERATIONS):
+        func()
+    return (time.process_time() - started) / ITERATIONS * 1e6
+
+
+def eager_parks():
+    debug.log(f"Updated parks data: {PARKS_DATA}")
+
+
+def lazy_parks():
+    debug.log("Updated parks data: %s", PARKS_DATA)
+
+
+def eager_ws():
+    debug.log(f"WS raw: {WS_FRAME}")
+
+
+def lazy_ws():
+    debug.log("WS raw: %s", WS_FRAME)
+
+
+def eager_compare():
+    current, new = _ATTRACTION.copy(), _ATTRACTION
+    debug.log(f"No new data for {new['name']} | Last updated: {get_eastern(current['lastUpdatedTs'])} "
+              f"vs {get_eastern(new['lastUpdatedTs'])}")
+
+
+def guarded_compare():
+    current = _ATTRACTION.copy() if debug.enabled() else None
+    if current is not None:
+        debug.log("No new data for %s | Last updated: %s vs %s", _ATTRACTION['name'],
+                  get_eastern(current['lastUpdatedTs']), get_eastern(_ATTRACTION['lastUpdatedTs']))
+
+
+def every_skip():
+    debug.info(f"Skipping {PARKS_DATA[0]['name']} because no attractions are operating.")
+
+
+def throttled_skip():
+    debug.throttled("Skipping %s because no attractions are operating.", PARKS_DATA[0]['name'])
+
+
+CASES = [
+    ("parks data dump", eager_parks, lazy_parks),
+    ("WS raw frame", eager_ws, lazy_ws),
+    ("attraction compare", eager_compare, guarded_compare),
+    ("skipping park (INFO)", every_skip, throttled_skip),
+]
+
+
+def main():
+    stream = _quiet_logger()
+    print(f"{'case (us/call, DEBUG off)':<28}{'eager':>10}{'lazy':>10}{'saved':>9}")
+    for name, eager, lazy in CASES:
+        debug.reset_throttle()
+        before = cpu_per_call(eager)
+        after = cpu_per_call(lazy)
+        print(f"{name:<28}{before:>10.2f}{after:>10.2f}{1 - after / before:>9.0%}")
+    print(f"\nbytes logged: {len(stream.getvalue())}")
+
+
+if __name__ == "__main__":
+    main()
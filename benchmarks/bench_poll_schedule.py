@@ -0,0 +1,104 @@
+"""
+Compare how the old burst polling (every park back to back, then sleep) and
+the staggered ParkPollScheduler spread REST requests over a compressed
+timeline.
+
+Each simulated park poll issues one request per attraction with a fixed
+network latency. Reported per strategy: total requests, and the peak number
+started in any 1/20th of the interval after the startup poll (which is a
+burst under both strategies because no park has data). Each park's own poll
+is the same size under both, so this measures request spreading only.
+
+Run from the repository root:
+
+    python benchmarks/bench_poll_schedule.py
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from updater.poll_scheduler import ParkPollScheduler  # noqa: E402
+
+PARKS = 4
+ATTRACTIONS_PER_PARK = 60
+INTERVAL = 4.0           # compressed stand-in for the 300s production interval
+CYCLES = 3
+REQUEST_LATENCY = 0.05
+
+
+class RequestLog:
+    def __init__(self):
+        self.started = []
+        self._lock = threading.Lock()
+
+    def record(self):
+        with self._lock:
+            self.started.append(time.monotonic())
+
+
+async def _fake_request(log):
+    log.record()
+    await asyncio.sleep(REQUEST_LATENCY)
+
+
+def poll_park(log):
+    async def _poll():
+        return await asyncio.gather(*(_fake_request(log) for _ in range(ATTRACTIONS_PER_PARK)))
+    asyncio.run(_poll())
+
+
+def run_burst(log, stop_at):
+    while time.monotonic() < stop_at:
+        started = time.monotonic()
+        for _ in range(PARKS):
+            poll_park(log)
+        time.sleep(max(0.0, INTERVAL - (time.monotonic() - started)))
+
+
+def run_staggered(log, stop_at):
+    scheduler = ParkPollScheduler(INTERVAL)
+    park_ids = [f"park-{i}" for i in range(PARKS)]
+    while time.monotonic() < stop_at:
+        scheduler.sync(park_ids)
+        for park_id in scheduler.due_parks():
+            scheduler.mark_polled(park_id)
+            poll_park(log)
+        time.sleep(min(scheduler.seconds_until_next(), max(0.0, stop_at - time.monotonic())))
+
+
+def peak_window_count(timestamps, window):
+    timestamps = sorted(timestamps)
+    peak = 0
+    lo = 0
+    for hi, ts in enumerate(timestamps):
+        while ts - timestamps[lo] >= window:
+            lo += 1
+        peak = max(peak, hi - lo + 1)
+    return peak
+
+
+def measure(strategy):
+    log = RequestLog()
+    started_at = time.monotonic()
+    strategy(log, started_at + INTERVAL * CYCLES)
+    steady_state = [ts for ts in log.started if ts - started_at >= INTERVAL / 4]
+    return {
+        "requests": len(log.started),
+        "peak_requests_per_window": peak_window_count(steady_state, INTERVAL / 20),
+    }
+
+
+def main():
+    results = {"burst": measure(run_burst), "staggered": measure(run_staggered)}
+    keys = list(results["burst"])
+    print(f"{'metric':<28}{'burst':>12}{'staggered':>12}")
+    for key in keys:
+        print(f"{key:<28}{results['burst'][key]:>12.2f}{results['staggered'][key]:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
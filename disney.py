@@ -12,16 +12,19 @@ import driver
 from driver import RGBMatrix, __version__
 
 from display.park.park_details import render_park_information_screen
+from display import asset_cache
 from display.display import initialize_fonts
+from display.weather_icons import initialize_weather_icons
 from display.startup import render_mickey_logo
 from utils.utils import args, led_matrix_options
-from api.disney_api import fetch_list_of_disney_world_parks, resolve_parks_from_config
-from display.attractions.attraction_info import render_attraction_info
-from updater.data_updater import live_data_updater
-from updater.websocket_updater import websocket_live_updater
+from api.disney_api import (EXPIRED_DATA_SECS, STALE_DATA_SECS, data_age, fetch_list_of_disney_world_parks,
+                            has_wait_info, resolve_parks_from_config)
+from display.attractions.attraction_info import format_wait_time, render_attraction_info
+from updater.checkpoint import CHECKPOINT_INTERVAL_SECS, load_checkpoint, save_checkpoint
+from updater.runtime import live_updates_runtime
 from display.countdown.countdown import render_countdown_to_disney
 
-from utils import debug
+from utils import bandwidth, debug, latency, metrics, profiler, thread_cpu
 
 # Configure logging
 def load_config(file_path):
@@ -38,6 +41,17 @@ else:
 
 use_image_logo = False
 
+# Attractions whose live data is older than these are drawn as stale, or hidden.
+stale_data_secs = STALE_DATA_SECS
+expired_data_secs = EXPIRED_DATA_SECS
+
+# Startup metric: time from launch to the first attraction frame on the board.
+_started_at = time.monotonic()
+_first_attraction_frame_secs = None
+# While no park has been published yet, check this often instead of replaying the intro.
+PARKS_WAIT_POLL_SECS = 0.5
+PARKS_WAIT_SECS = 5
+
 def main():
     # Load configuration
     config = load_config('config.json')
@@ -63,33 +77,52 @@ def main():
 
     matrix = RGBMatrix(options=matrixOptions)
     initialize_fonts(matrix.height)
+    initialize_weather_icons(matrix.height)
 
+    checkpoint_interval = max(0, int(config.get("state_checkpoint_secs", CHECKPOINT_INTERVAL_SECS)))
     park_names = config.get('parks', [])
-    disney_park_list = resolve_parks_from_config(park_names)
-    if not disney_park_list:
-        debug.error("No parks found. Exiting.")
-        return
+
+    # Warm restart: show the last checkpointed state (marked stale) straight
+    # away; the updater thread resolves the configured parks and fetches fresh
+    # data in the background.
+    if checkpoint_interval:
+        parks_data[:] = load_checkpoint()
+    disney_park_list = None
+    if not parks_data:
+        disney_park_list = resolve_parks_from_config(park_names)
+        if not disney_park_list:
+            debug.error("No parks found. Exiting.")
+            return
+
+    global stale_data_secs, expired_data_secs
+    stale_data_secs = float(config.get("stale_data_minutes", STALE_DATA_SECS / 60)) * 60
+    expired_data_secs = float(config.get("expired_data_minutes", EXPIRED_DATA_SECS / 60)) * 60
 
     api_key = config.get("themeparks_api_key")
     websocket_only = config.get("websocket_only", False)
     use_websocket = bool(api_key and not api_key.startswith("<")) or websocket_only
+    websocket_connections = max(1, int(config.get("websocket_connections", 1)))
+    bandwidth.configure(float(config.get("hourly_bandwidth_budget_mb", 0)) * 1024 * 1024)
+    asset_cache.configure(float(config.get("asset_cache_kb", asset_cache.MAX_BYTES / 1024)) * 1024)
+    start_metrics(config.get("metrics", {}))
+    thread_cpu_secs = float(config.get("thread_cpu_report_secs", thread_cpu.REPORT_SECS))
+    if thread_cpu_secs > 0:
+        thread_cpu.start(thread_cpu_secs)
 
     update_thread = threading.Thread(
-        target=live_data_updater,
+        name=profiler.UPDATER_THREAD_NAME,
+        target=live_updates_runtime,
         args=(disney_park_list, update_interval, parks_data),
-        kwargs={"use_websocket": use_websocket},
+        kwargs={"api_key": api_key, "use_websocket": use_websocket,
+                "websocket_connections": websocket_connections,
+                "checkpoint_interval": checkpoint_interval, "park_names": park_names},
         daemon=True
     )
     update_thread.start()
+    profile_run = start_profiler(config.get("profile", {}), command_line_args.profile)
 
     if use_websocket:
-        ws_thread = threading.Thread(
-            target=websocket_live_updater,
-            args=(api_key, parks_data),
-            daemon=True
-        )
-        ws_thread.start()
-        debug.info("WebSocket live updater started — REST live data polling disabled.")
+        debug.info("WebSocket live updater enabled — REST live data polling disabled.")
     else:
         debug.info("No ThemeParks API key configured; using polling only.")
 
@@ -117,20 +150,22 @@ def main():
                         last_active_trip_logged = active_trip
                     show_trip_countdown(matrix, active_trip)
                 else:
-                    logging.info("No upcoming trips; countdown hidden.")
-            else:
-                logging.info("Trip countdown is not enabled.")
-            if parks_data:
-                for park in parks_data:
-                    if not park.get("operating"):
-                        logging.info(f"Skipping {park['name']} because no attractions are operating.")
-                        continue
-                    initialize_park_information_screen(matrix, park)
-                    loop_through_attractions(matrix, park)
-                    matrix.Clear()
+                    debug.throttled("No upcoming trips; countdown hidden.")
             else:
+                debug.throttled("Trip countdown is not enabled.")
+            if not parks_data:
                 debug.info("No parks data yet, waiting...")
-                time.sleep(5)
+                wait_for_parks(parks_data)
+            # Parks are published one by one while the updaters start up.
+            for park in list(parks_data):
+                if not park.get("operating"):
+                    debug.throttled("Skipping %s because no attractions are operating.", park['name'])
+                    continue
+                initialize_park_information_screen(matrix, park)
+                loop_through_attractions(matrix, park)
+                matrix.Clear()
+            debug.log(asset_cache.summary())
+            latency.maybe_report()
             matrix.Clear()
     except Exception as e:
         matrix.Clear()
@@ -138,6 +173,36 @@ def main():
         debug.error(traceback.format_exc())
     finally:
         matrix.Clear()
+        if checkpoint_interval:
+            save_checkpoint(parks_data)
+        if config.get("metrics", {}).get("json_path"):
+            metrics.dump_json(config["metrics"]["json_path"])
+        if profile_run:
+            # Write what was sampled so far when the board stops mid-profile.
+            profile_run.stop()
+
+def start_metrics(metrics_config):
+    """Start the local metrics endpoint and the periodic JSON dump, if configured."""
+    port = int(metrics_config.get("port", 0) or 0)
+    if port:
+        try:
+            metrics.serve(port, metrics_config.get("host", "127.0.0.1"))
+        except OSError as e:
+            debug.error(f"Could not start the metrics endpoint on port {port}: {e}")
+    json_path = metrics_config.get("json_path")
+    if json_path:
+        metrics.start_json_dump(json_path, float(metrics_config.get("json_interval_secs", metrics.JSON_DUMP_SECS)))
+
+def start_profiler(profile_config, duration_override=None):
+    """Start a sampling profile run if --profile was given or the config enables one."""
+    if duration_override is None and not profile_config.get("enabled"):
+        return None
+    duration = duration_override or float(profile_config.get("duration_secs", profiler.DEFAULT_DURATION_SECS))
+    interval = float(profile_config.get("interval_ms", profiler.DEFAULT_INTERVAL_SECS * 1000)) / 1000
+    output_dir = profile_config.get("output_dir")
+    if output_dir:
+        output_dir = os.path.join(output_dir, time.strftime("%Y%m%d-%H%M%S"))
+    return profiler.SamplingProfiler(duration, interval, output_dir).start()
 
 def validate_date(date_string):
     """Validate the date string and convert it to a datetime object at midnight.
@@ -209,11 +274,11 @@ def render_logo(matrix):
     logo_path = os.path.abspath("./assets/MK.png")
     if os.path.exists(logo_path) and use_image_logo:
         debug.info("Logo found. Displaying...")
-        from PIL import Image
-        logo = Image.open(logo_path)
-        matrix.SetImage(logo.convert("RGB"))
+        logo = asset_cache.get(logo_path, (matrix.width, matrix.height), "rgb",
+                               lambda: asset_cache.load_rgb(logo_path))
+        if logo is not None:
+            matrix.SetImage(logo)
         time.sleep(8)
-        logo.close()
     else:
         # If no logo is available, render the Mickey silhouette as an intro.
         debug.info("No logo found. Rendering Mickey silhouette as intro...")
@@ -224,18 +289,45 @@ def render_logo(matrix):
 def initialize_park_information_screen(matrix, park):
     matrix.Clear()
     debug.info(f"Rendering {park['name']} Title Screen.")
-    render_park_information_screen(matrix, park)
+    with metrics.timed("frame_render_seconds", screen="park"):
+        render_park_information_screen(matrix, park)
     time.sleep(8)
 
+def wait_for_parks(parks_data, timeout=PARKS_WAIT_SECS):
+    """Sleep until the first park is published or timeout elapses."""
+    deadline = time.monotonic() + timeout
+    while not parks_data and time.monotonic() < deadline:
+        time.sleep(PARKS_WAIT_POLL_SECS)
+
+
+def note_attraction_frame():
+    """Log time-to-first-attraction-frame the first time an attraction is rendered."""
+    global _first_attraction_frame_secs
+    if _first_attraction_frame_secs is None:
+        _first_attraction_frame_secs = time.monotonic() - _started_at
+        debug.info(f"Startup: first attraction frame after {_first_attraction_frame_secs:.1f}s.")
+
 def loop_through_attractions(matrix, park):
     for attraction_info in park.get("attractions", []):
-        if (attraction_info.get("status") not in ["CLOSED", "REFURBISHMENT"]
-                and attraction_info.get("waitTime") not in [None, '']):
+        status = attraction_info.get("status")
+        if (status not in ["CLOSED", "REFURBISHMENT"]
+                and (status == "DOWN" or has_wait_info(attraction_info))):
+            age = data_age(attraction_info)
+            if age is not None and age > expired_data_secs:
+                debug.throttled("Hiding %s: live data is %.0f min old.", attraction_info['name'], age / 60,
+                                level=logging.DEBUG, key=("hidden", attraction_info['name']))
+                continue
+            stale = age is not None and age > stale_data_secs
             matrix.Clear()
-            debug.info(
-                f"Displaying ride: {attraction_info['name']} (Park: {park['name']}) | "
-                f"Wait Time: {attraction_info['waitTime']} min | Status: {attraction_info['status']}")
-            render_attraction_info(matrix, attraction_info)
+            debug.info("Displaying ride: %s (Park: %s) | Wait Time: %s | Status: %s%s",
+                       attraction_info['name'], park['name'], debug.Lazy(format_wait_time, attraction_info), status,
+                       f" | Stale: {age / 60:.0f} min old" if stale else "")
+            with metrics.timed("frame_render_seconds", screen="attraction"):
+                render_attraction_info(matrix, attraction_info, stale=stale)
+            if age is not None:
+                metrics.observe("attraction_data_age_seconds", age)
+            latency.note_rendered(attraction_info.get("id"))
+            note_attraction_frame()
             time.sleep(8)
 
 def show_trip_countdown(matrix, next_trip_time):
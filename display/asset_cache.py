@@ -0,0 +1,118 @@
+"""Bounded LRU cache of display-ready RGB images."""
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+from utils import debug
+
+MAX_BYTES = 4 * 1024 * 1024
+
+_max_bytes = MAX_BYTES
+_entries = OrderedDict()    # (asset, board_size, transform) -> (image, bytes)
+_bytes = 0
+_lock = threading.Lock()
+
+stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def configure(max_bytes=MAX_BYTES):
+    """Set the memory cap, evicting entries if the cache is now over it."""
+    global _max_bytes
+    with _lock:
+        _max_bytes = max(0, int(max_bytes))
+        _evict()
+
+
+def reset():
+    """Drop every entry and clear the counters."""
+    global _bytes
+    with _lock:
+        _entries.clear()
+        _bytes = 0
+        for key in stats:
+            stats[key] = 0
+
+
+def image_bytes(image):
+    """Memory held by an image's pixel buffer."""
+    return image.width * image.height * len(image.getbands())
+
+
+def _evict():
+    global _bytes
+    while _bytes > _max_bytes and _entries:
+        _, (_, size) = _entries.popitem(last=False)
+        _bytes -= size
+        stats["evictions"] += 1
+
+
+def _store(key, image):
+    global _bytes
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    size = image_bytes(image)
+    if size > _max_bytes:
+        return image
+    with _lock:
+        previous = _entries.pop(key, None)
+        if previous is not None:
+            _bytes -= previous[1]
+        _entries[key] = (image, size)
+        _bytes += size
+        _evict()
+    return image
+
+
+def get(asset, board_size, transform, loader):
+    """
+    The cached image for (asset, board_size, transform), calling loader() to
+    build it on a miss. loader returns a PIL image (converted to RGB here) or
+    None, which is not cached. An image larger than the whole cap is returned
+    without being cached.
+    """
+    key = (asset, board_size, transform)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+            stats["hits"] += 1
+            return entry[0]
+        stats["misses"] += 1
+    image = loader()
+    return _store(key, image) if image is not None else None
+
+
+def put(asset, board_size, transform, image):
+    """Store an already prepared image, e.g. one built off the render thread."""
+    return _store((asset, board_size, transform), image)
+
+
+def contains(asset, board_size, transform):
+    with _lock:
+        return (asset, board_size, transform) in _entries
+
+
+def load_rgb(path):
+    """Loader for a whole image file, flattened to RGB."""
+    try:
+        with Image.open(path) as image:
+            return image.convert("RGB")
+    except (OSError, ValueError) as e:
+        debug.error(f"Error loading image {path}: {e}")
+        return None
+
+
+def memory_bytes():
+    return _bytes
+
+
+def hit_rate():
+    lookups = stats["hits"] + stats["misses"]
+    return stats["hits"] / lookups if lookups else 0.0
+
+
+def summary():
+    return (f"Asset cache: {len(_entries)} images, {memory_bytes() / 1024:.1f} KB of "
+            f"{_max_bytes / 1024:.0f} KB, hit rate {hit_rate():.0%} "
+            f"({stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions)")
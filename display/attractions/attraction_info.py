@@ -1,24 +1,48 @@
+import functools
+
 from display.display import wrap_text, get_text_width, color_dict, loaded_fonts
 from driver import graphics
 from utils import debug
+from utils.time_utils import iso_to_epoch, minutes_since
 
 
-def _format_wait_time(raw_wait):
-    if isinstance(raw_wait, str) and raw_wait.startswith("Group"):
-        return raw_wait
-    return f"{raw_wait} Mins"
-
-
-def render_attraction_info(matrix, ride_info):
+def format_wait_time(attraction, now=None):
+    """
+    Render-time wait text from an attraction's typed fields: minutes down are
+    derived from 'down_since_epoch' at the moment of drawing, so a long outage
+    keeps counting up without any state being rewritten.
+    """
+    if attraction.get("status") == "DOWN":
+        down_since_epoch = attraction.get("down_since_epoch")
+        if down_since_epoch is None:
+            down_since_epoch = iso_to_epoch(attraction.get("down_since"))
+        return _wait_text("DOWN", minutes_since(down_since_epoch, now))
+    group = attraction.get("boardingGroup")
+    if group:
+        return _wait_text("GROUP", group.get("start"), group.get("end"))
+    return _wait_text("STANDBY", attraction.get("waitTime"))
+
+
+@functools.lru_cache(maxsize=1024)
+def _wait_text(kind, first=None, second=None):
+    if kind == "DOWN":
+        return f"Down {first} Mins" if first is not None else "Down"
+    if kind == "GROUP":
+        return f"Groups {first}-{second}" if second is not None else f"Group {first}+"
+    return f"{first} Mins"
+
+
+def render_attraction_info(matrix, ride_info, stale=False):
     """
     Renders ride name at the top and wait time at the bottom in a single draw call.
     The combined text block is drawn from the center of the screen.
     Each line is vertically centered, with a dynamic gap between ride name and wait time.
     Padding is added only if the text fits within the width and height of the board.
+    With stale=True the wait time is drawn in the dimmed 'stale' color.
     """
-    debug.log(f"Rendering ride info: {ride_info}")
+    debug.log("Rendering ride info: %s", ride_info)
     ride_name = ride_info["name"]
-    wait_time = _format_wait_time(ride_info["waitTime"])
+    wait_time = format_wait_time(ride_info)
 
 
     # waittime_font = loaded_fonts["waittime"]
@@ -45,9 +69,9 @@ def render_attraction_info(matrix, ride_info):
     y_position = calculate_y_position(matrix, total_lines_height)
 
     # Render each line of text
-    render_lines(matrix, combined_lines, y_position, line_heights, wrapped_ride_name, wrapped_wait_time)
+    render_lines(matrix, combined_lines, y_position, line_heights, wrapped_ride_name, wrapped_wait_time, stale)
 
-def render_lines(matrix, combined_lines, y_position, line_heights, wrapped_ride_name, wrapped_wait_time):
+def render_lines(matrix, combined_lines, y_position, line_heights, wrapped_ride_name, wrapped_wait_time, stale=False):
     """
     Render each line of text at the specified position on the matrix.
     """
@@ -64,6 +88,8 @@ def render_lines(matrix, combined_lines, y_position, line_heights, wrapped_ride_
         text_color = (
             color_dict["white"]
             if line in wrapped_ride_name
+            else color_dict["stale"]
+            if stale
             else color_dict["down"]
             if "down" in line.lower() or (any("down" in item.lower() for item in wrapped_wait_time) and line in wrapped_wait_time)
             else color_dict["white"]
@@ -60,6 +60,7 @@ def colors():
         "disney_blue": graphics.Color(17, 60, 207),
         "white": graphics.Color(255, 255, 255),
         "down": graphics.Color(250, 0, 0),
+        "stale": graphics.Color(110, 110, 110),
         "gold": graphics.Color(255, 215, 0)
     }
 
@@ -1,15 +1,9 @@
-from datetime import datetime
-from io import BytesIO
-
-import requests
-from PIL import Image
-
 from display.display import get_text_width, wrap_text, color_dict, loaded_fonts
+from display.weather_icons import get_weather_icon
 from driver import graphics
 from utils import debug
+from utils.time_utils import format_clock_hour
 
-# Icon cache for storing loaded weather icons
-icon_cache = {}
 def render_park_information_screen(matrix, park_obj):
     """
     Renders the park name at the top and the hours/price at the bottom.
@@ -59,30 +53,8 @@ def render_park_hours(vertical_start, horizontal_start, matrix, park_obj):
     graphics.DrawText(matrix, loaded_fonts["info"], horizontal_start, vertical_start, color_dict["disney_blue"], hours_text)
 
 def render_weather_icon(icon_code):
-    # Construct the URL for the weather icon
-    # Check if the icon is already cached
-    debug.log(f"Fetching cache: {icon_cache}")
-    if icon_code in icon_cache:
-        debug.info(f"Fetching icon from cache for code: {icon_code}")
-        return icon_cache[icon_code]
-
-    icon_url = f"https://openweathermap.org/img/wn/{icon_code}.png"
-
-    try:
-        # Fetch the icon image from the URL
-        response = requests.get(icon_url)
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        img = Image.open(BytesIO(response.content))
-        img = img.resize((15, 15))  # Resize the image to a smaller display size for the matrix
-        icon_cache[icon_code] = img
-
-        return img
-    except requests.RequestException as e:
-        debug.error(f"Failed to fetch icon from URL: {icon_url} - {e}")  # Log any issues
-        return None
-    except Exception as e:
-        debug.error(f"Failed to load icon: {e}")  # Log other errors
-        return None
+    """The atlas icon (board-sized, RGB) for an OWM icon code, or None if it isn't available yet."""
+    return get_weather_icon(icon_code)
 
 def display_weather_icon_and_description(matrix, weather_info, font_height,show_icon=True):
     """Display the weather icon and its description in the top right corner."""
@@ -97,14 +69,14 @@ def display_weather_icon_and_description(matrix, weather_info, font_height,show_
         if img:
             icon_width = img.width
             if matrix.height == 32:
-                matrix.SetImage(img.convert("RGB"), matrix.width - icon_width - 1, 1)
+                matrix.SetImage(img, matrix.width - icon_width - 1, 1)
                 graphics.DrawText(matrix, loaded_fonts["info"], matrix.width - get_text_width(loaded_fonts["info"], temp), img.height + padding, color_dict["white"], temp)
                 graphics.DrawText(matrix, loaded_fonts["info"], matrix.width - get_text_width(loaded_fonts["info"], weather_info['short_description']), (img.height + font_height + padding), color_dict["white"],weather_info['short_description'])
             if matrix.height >= 64:
                 weather_text = temp + ' ' + weather_info['short_description']
                 horizontal_point = int((matrix.width - img.width - get_text_width(loaded_fonts["info"], weather_text)) / 2)
                 vertical_point = int(matrix.height - (loaded_fonts["info"].height * 2.5))
-                matrix.SetImage(img.convert("RGB"), horizontal_point, vertical_point - img.height)
+                matrix.SetImage(img, horizontal_point, vertical_point - img.height)
                 graphics.DrawText(matrix, loaded_fonts["info"], horizontal_point + img.width, vertical_point - 3, color_dict["white"], weather_text)
         else:
             debug.warning("Icon could not be rendered, only displaying text.")
@@ -114,12 +86,11 @@ def format_iso_time(iso_str):
     Convert an ISO 8601 formatted time (e.g. '2025-03-17T09:00:00-04:00')
     into a simple string like '9am'.
     """
-    try:
-        dt = datetime.fromisoformat(iso_str)
-        return dt.strftime("%I%p").lstrip("0").upper()
-    except Exception as e:
-        debug.error(f"Error formatting ISO time: {e}")
+    formatted = format_clock_hour(iso_str)  # memoized: the same hours render every frame
+    if formatted is None:
+        debug.error(f"Error formatting ISO time: {iso_str}")
         return iso_str  # Fallback if parsing fails.
+    return formatted
 
 
 def draw_multi_line_park_name_text_block(matrix, text_lines):
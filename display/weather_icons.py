@@ -0,0 +1,148 @@
+"""Weather icons, loaded into the asset cache at startup and downloaded on demand."""
+import os
+import threading
+import time
+from io import BytesIO
+
+import requests
+from PIL import Image
+
+from display import asset_cache
+from utils import debug
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSET_DIR = os.path.join(BASE_DIR, "assets", "weather")
+CACHE_DIR = os.path.join(BASE_DIR, "cache", "weather_icons")
+ICON_URL = "https://openweathermap.org/img/wn/{code}.png"
+ICON_FETCH_TIMEOUT_SECS = 10
+# After a failed download, the code isn't requested again for this long.
+ICON_RETRY_SECS = 10 * 60
+# Icon edge length in pixels for each board height.
+ICON_SIZES = {32: 15, 64: 15}
+
+_paths = {}         # icon code -> PNG on disk (bundled or downloaded)
+_board_height = None
+_icon_size = None
+_pending = set()    # icon codes being downloaded
+_retry_at = {}      # icon code -> monotonic time a failed download may be retried
+_lock = threading.Lock()
+
+
+def reset():
+    """Forget the known icons and the board size."""
+    global _board_height, _icon_size
+    with _lock:
+        _paths.clear()
+        _pending.clear()
+        _retry_at.clear()
+        _board_height = None
+        _icon_size = None
+
+
+def prepare_icon(image, size):
+    """Resize an icon to size x size and flatten its transparency onto black (RGB)."""
+    image = image.convert("RGBA").resize((size, size))
+    prepared = Image.new("RGB", image.size, (0, 0, 0))
+    prepared.paste(image, mask=image.getchannel("A"))
+    return prepared
+
+
+def _size():
+    return _icon_size or ICON_SIZES[32]
+
+
+def _cache_key(code):
+    return ("weather", code), _board_height, ("icon", _size())
+
+
+def _load_icon(path, size):
+    try:
+        with Image.open(path) as image:
+            return prepare_icon(image, size)
+    except (OSError, ValueError) as e:
+        debug.error(f"Error loading weather icon {path}: {e}")
+        return None
+
+
+def _icon_paths(directory):
+    if not os.path.isdir(directory):
+        return {}
+    return {os.path.splitext(filename)[0]: os.path.join(directory, filename)
+            for filename in sorted(os.listdir(directory)) if filename.lower().endswith(".png")}
+
+
+def initialize_weather_icons(matrix_height, asset_dir=ASSET_DIR, cache_dir=CACHE_DIR):
+    """
+    Load the bundled icons, plus any previously downloaded ones, sized for the
+    board, into the asset cache. Returns {icon code: image}.
+    """
+    global _board_height, _icon_size
+    size = ICON_SIZES.get(matrix_height)
+    if size is None:
+        debug.error(f"No weather icon size defined for height {matrix_height}.")
+        return {}
+    paths = _icon_paths(cache_dir)
+    paths.update(_icon_paths(asset_dir))  # bundled icons win over downloads
+    with _lock:
+        _board_height = matrix_height
+        _icon_size = size
+        _paths.clear()
+        _paths.update(paths)
+    icons = {}
+    for code, path in paths.items():
+        icon = _load_icon(path, size)
+        if icon is not None:
+            icons[code] = asset_cache.put(*_cache_key(code), icon)
+    debug.info(f"Loaded {len(icons)} weather icons at {size}x{size}.")
+    return icons
+
+
+def fetch_missing_icon(code, cache_dir=CACHE_DIR):
+    """
+    Download an icon that isn't bundled, store it on disk and add it to the
+    asset cache (blocking; runs on the fetch thread).
+    """
+    url = ICON_URL.format(code=code)
+    try:
+        response = requests.get(url, timeout=ICON_FETCH_TIMEOUT_SECS)
+        response.raise_for_status()
+        with Image.open(BytesIO(response.content)) as image:
+            icon = prepare_icon(image, _size())
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(cache_dir, f"{code}.png")
+        with open(path, "wb") as file:
+            file.write(response.content)
+        icon = asset_cache.put(*_cache_key(code), icon)
+        _paths[code] = path
+    except requests.RequestException as e:
+        debug.error(f"Failed to fetch weather icon from {url}: {e}")
+        _retry_at[code] = time.monotonic() + ICON_RETRY_SECS
+        return None
+    except (OSError, ValueError) as e:
+        debug.error(f"Failed to store weather icon {code}: {e}")
+        _retry_at[code] = time.monotonic() + ICON_RETRY_SECS
+        return None
+    finally:
+        with _lock:
+            _pending.discard(code)
+    debug.info(f"Added downloaded weather icon {code}.")
+    return icon
+
+
+def get_weather_icon(code):
+    """
+    The prepared icon for an OWM icon code, or None. Never blocks: a missing
+    icon is fetched in the background and shows up on a later frame.
+    """
+    if not code:
+        return None
+    path = _paths.get(code)
+    if path is not None:
+        # Preloaded at startup; only reloaded from disk if it was evicted.
+        return asset_cache.get(*_cache_key(code), lambda: _load_icon(path, _size()))
+    with _lock:
+        if code in _pending or time.monotonic() < _retry_at.get(code, 0):
+            return None
+        _pending.add(code)
+    threading.Thread(target=fetch_missing_icon, args=(code,), name=f"weather-icon-{code}", daemon=True).start()
+    return None
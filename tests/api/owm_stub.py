@@ -0,0 +1,49 @@
+"""
+Local stand-in for OpenWeatherMap's current-weather endpoint, for exercising
+the async weather client without network access. Point the weather settings'
+base_url at OwmStubServer.base_url.
+"""
+import asyncio
+
+from aiohttp import web
+
+
+class OwmStubServer:
+    def __init__(self, temperature=75.0, delay=0.0, status=200, body=None):
+        self.temperature = temperature
+        self.body = body        # raw response text, served instead of the usual JSON
+        self.delay = delay
+        self.status = status
+        self.requests = []      # (lat, lon) of every request received
+        self.base_url = None
+        self._runner = None
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/data/2.5/weather", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/data/2.5"
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._runner.cleanup()
+
+    async def _handle(self, request):
+        lat, lon = float(request.query["lat"]), float(request.query["lon"])
+        self.requests.append((lat, lon))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return web.json_response({"cod": self.status, "message": "stub error"}, status=self.status)
+        if self.body is not None:
+            return web.Response(text=self.body, content_type="application/json")
+        return web.json_response({
+            "coord": {"lat": lat, "lon": lon},
+            "weather": [{"main": "Thunderstorm", "description": "thunderstorm with rain", "icon": "11d"}],
+            "main": {"temp": self.temperature},
+            "name": f"Stub {lat},{lon}",
+        })
@@ -17,15 +17,14 @@ from api.disney_api import (
     clean_park_name,
     is_special_event,
     determine_llmp_price,
-    get_down_time,
     fetch_live_data_for_attraction,
     fetch_live_data,
     park_has_operating_attraction,
     update_parks_operating_status,
-    handle_park_schedule_update,
-    refresh_park_attractions,
     resolve_destination_id,
     resolve_parks_from_config,
+    fetch_park_children,
+    reconcile_park_attractions,
     DISNEY_WORLD_DESTINATION_ID,
 )
 
@@ -195,6 +194,15 @@ def test_get_park_location_exception(monkeypatch):
     result = get_park_location("dummy-park-id")
     assert result == []
 
+def test_get_park_location_is_reported_like_other_rest_calls(monkeypatch):
+    from utils import metrics
+    metrics.reset()
+    monkeypatch.setattr(requests, "get", lambda url, **kwargs: DummyResponse({"location": {}}, 200))
+    assert get_park_location("dummy-park-id") == {}
+    counters = {tuple(sorted(c["labels"].items())): c["value"] for c in metrics.snapshot()["counters"]}
+    assert counters == {(("endpoint", "entity"), ("outcome", "ok")): 1}
+    metrics.reset()
+
 def test_fetch_park_schedule_success(monkeypatch):
     today = datetime.now()
     today_str = today.strftime('%Y-%m-%d')
@@ -270,8 +278,6 @@ def test_fetch_parks_and_attractions_success(monkeypatch):
         else:
             return DummyResponse({"location": {"latitude": 28.3759, "longitude": -81.5494}}, 200)
     monkeypatch.setattr(requests, "get", fake_get)
-    # To avoid real weather calls, patch fetch_weather_data.
-    monkeypatch.setattr(disney_api, "fetch_weather_data", lambda lat, lon: {"temp": "dummy"})
     result = fetch_parks_and_attractions(fake_parks_list)
     assert len(result) == 1
     park = result[0]
@@ -297,7 +303,6 @@ def test_fetch_parks_and_attractions_includes_shows(monkeypatch):
             ]}, 200)
         return DummyResponse({}, 200)
     monkeypatch.setattr(requests, "get", fake_get)
-    monkeypatch.setattr(disney_api, "fetch_weather_data", lambda lat, lon: {})
     result = fetch_parks_and_attractions(fake_parks_list)
     attractions = result[0]["attractions"]
     ids = [a["id"] for a in attractions]
@@ -323,7 +328,6 @@ def test_fetch_parks_and_attractions_includes_destination_id(monkeypatch):
         return DummyResponse({}, 200)
 
     monkeypatch.setattr(requests, "get", fake_get)
-    monkeypatch.setattr(disney_api, "fetch_weather_data", lambda lat, lon: {})
     result = fetch_parks_and_attractions(fake_parks_list)
     assert len(result) == 1
     assert result[0]["destination_id"] == "dest-abc"
@@ -374,6 +378,18 @@ def test_is_special_event():
     }]
     assert is_special_event(schedule) is False
 
+def test_schedule_windows_only_open_entries_with_valid_times():
+    schedule = [
+        {"type": "OPERATING", "openingTime": "2025-03-17T09:00:00-04:00", "closingTime": "2025-03-17T22:00:00-04:00"},
+        {"type": "TICKETED_EVENT", "openingTime": "2025-03-17T22:00:00-04:00", "closingTime": "2025-03-18T01:00:00-04:00"},
+        {"type": "INFO", "openingTime": "2025-03-17T00:00:00-04:00", "closingTime": "2025-03-17T23:00:00-04:00"},
+        {"type": "OPERATING", "openingTime": "09:00", "closingTime": "22:00"},
+        {"type": "OPERATING"},
+    ]
+    windows = disney_api.schedule_windows(schedule)
+    assert [(o.hour, c.hour) for o, c in windows] == [(9, 22), (22, 1)]
+    assert disney_api.schedule_windows(None) == []
+
 def test_determine_llmp_price():
     operating_event = {
         "purchases": [
@@ -385,33 +401,6 @@ def test_determine_llmp_price():
     operating_event = {"purchases": []}
     assert determine_llmp_price(operating_event) == ""
 
-def test_get_down_time_valid():
-    # Test get_down_time by computing a known difference.
-    # Create a timestamp 30 minutes ago.
-    past = datetime.now(timezone.utc) - timedelta(minutes=30)
-    past_iso = past.strftime('%Y-%m-%dT%H:%M:%SZ')
-    minutes = get_down_time(past_iso)
-    # Allow a range since actual computation might vary slightly.
-    assert 29 <= minutes <= 31
-
-def test_get_down_time_with_milliseconds():
-    past = datetime.now(timezone.utc) - timedelta(minutes=45)
-    past_iso = past.strftime('%Y-%m-%dT%H:%M:%S.') + f"{past.microsecond // 1000:03d}Z"
-    minutes = get_down_time(past_iso)
-    assert 44 <= minutes <= 46
-
-def test_get_down_time_invalid():
-    result = get_down_time("invalid-date")
-    assert result is None
-
-def test_get_down_time_none_input():
-    result = get_down_time(None)
-    assert result is None
-
-def test_get_down_time_empty_string():
-    result = get_down_time("")
-    assert result is None
-
 ###########
 # Asynchronous Live Data Tests
 ###########
@@ -469,6 +458,16 @@ async def test_fetch_live_data_for_attraction_success(monkeypatch):
     assert result["status"] == "OPERATING"
     assert result["lastUpdatedTs"] == "2023-10-01T12:00:00Z"
 
+def test_down_clears_wait_fields_for_attractions_only():
+    entry = {"lastUpdated": "2023-10-01T12:00:00Z", "status": "DOWN", "entityType": "ATTRACTION"}
+    ride = {"waitTime": 45, "boardingGroup": None}
+    disney_api.apply_live_entry(ride, entry)
+    assert ride["waitTime"] is None and ride["status"] == "DOWN"
+
+    show = {"waitTime": 20, "boardingGroup": None}
+    disney_api.apply_live_entry(show, dict(entry, entityType="SHOW"))
+    assert show["waitTime"] == 20 and show["status"] == "DOWN"
+
 @pytest.mark.asyncio
 async def test_fetch_live_data_for_attraction_standby_takes_priority_over_boarding_group():
     dummy_live_entry = {
@@ -534,7 +533,8 @@ async def test_fetch_live_data_for_attraction_boarding_group_range():
     dummy_attraction = {"id": "attr-2", "name": "Tron", "waitTime": "", "status": "", "lastUpdatedTs": ""}
     from api.disney_api import fetch_live_data_for_attraction
     result = await fetch_live_data_for_attraction(FakeSession(), dummy_attraction)
-    assert result["waitTime"] == "Groups 1-50"
+    assert result["waitTime"] is None
+    assert result["boardingGroup"] == {"start": 1, "end": 50}
     assert result["status"] == "OPERATING"
 
 @pytest.mark.asyncio
@@ -592,6 +592,62 @@ async def test_fetch_live_data_exception(monkeypatch):
     assert result[0]["status"] == ''
     assert result[0]["lastUpdatedTs"] == ''
 
+class _BulkResponse:
+    def __init__(self, json_data, status=200):
+        self._json = json_data
+        self.status = status
+
+    async def json(self):
+        return self._json
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+class _BulkSession:
+    def __init__(self, response):
+        self.response = response
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        return self.response
+
+
+@pytest.mark.asyncio
+async def test_fetch_park_live_data_single_request_for_whole_park(clean_roster_demand):
+    park = {"id": "park-1", "name": "MK", "attractions": [
+        {"id": "a1", "name": "Ride A", "entityType": "ATTRACTION", "waitTime": "", "status": "", "lastUpdatedTs": ""},
+        {"id": "a2", "name": "Ride B", "entityType": "ATTRACTION", "waitTime": "", "status": "", "lastUpdatedTs": ""},
+    ]}
+    session = _BulkSession(_BulkResponse({"liveData": [
+        {"id": "a1", "entityType": "ATTRACTION", "status": "OPERATING",
+         "lastUpdated": "2023-10-01T12:00:00Z", "queue": {"STANDBY": {"waitTime": 25}}},
+        {"id": "unknown", "entityType": "ATTRACTION", "status": "OPERATING", "queue": {}},
+    ]}))
+
+    result = await disney_api.fetch_park_live_data(session, park)
+
+    assert session.urls == ["https://api.themeparks.wiki/v1/entity/park-1/live"]
+    assert [a["id"] for a in result] == ["a1"]
+    # The unknown attraction asks for a roster refresh instead of being dropped silently.
+    assert park["roster_refresh_needed"] is True
+    assert result[0]["waitTime"] == 25
+    assert result[0]["status"] == "OPERATING"
+    # Returns copies; the park's own attraction is untouched until merged.
+    assert park["attractions"][0]["waitTime"] == ""
+
+
+@pytest.mark.asyncio
+async def test_fetch_park_live_data_returns_none_on_error_status():
+    park = {"id": "park-1", "name": "MK", "attractions": []}
+    result = await disney_api.fetch_park_live_data(_BulkSession(_BulkResponse({}, status=500)), park)
+    assert result is None
+
+
 ###########
 # Tests for Park Operating Status & Schedule Update
 ###########
@@ -607,22 +663,17 @@ def test_park_has_operating_attraction(monkeypatch):
     park["attractions"][0]["status"] = "CLOSED"
     assert park_has_operating_attraction(park) is False
 
-def test_handle_park_schedule_update(monkeypatch):
+def test_apply_park_schedule(monkeypatch):
     park = {"name": "Test Park", "id": "dummy-id", "schedule": []}
-    # Patch fetch_park_schedule to return a dummy schedule with an OPERATING event.
     dummy_schedule = [{
         "type": "OPERATING", 
         "openingTime": "09:00", 
         "closingTime": "22:00",
         "purchases": [{"name": "Lightning Lane Multi Pass", "price": {"formatted": "$25"}}]
     }]
-    monkeypatch.setattr("api.disney_api.fetch_park_schedule", lambda park_id: dummy_schedule)
     # Patch is_special_event to return True.
     monkeypatch.setattr("api.disney_api.is_special_event", lambda sch: True)
-    monkeypatch.setattr("api.disney_api.refresh_park_attractions", lambda p: None)
-    # Capture debug info if desired.
-    from api.disney_api import handle_park_schedule_update
-    handle_park_schedule_update(park)
+    disney_api.apply_park_schedule(park, dummy_schedule)
     # Verify that schedule is updated, and llmpPrice and specialTicketedEvent are set.
     assert park["schedule"] == dummy_schedule
     assert park["llmpPrice"] == "$25"
@@ -630,14 +681,6 @@ def test_handle_park_schedule_update(monkeypatch):
     assert park["openingTime"] == "09:00"
     assert park["closingTime"] == "22:00"
 
-def test_handle_park_schedule_update_calls_refresh(monkeypatch):
-    park = {"name": "Test Park", "id": "dummy-id", "schedule": [], "attractions": []}
-    monkeypatch.setattr("api.disney_api.fetch_park_schedule", lambda park_id: [])
-    refreshed = []
-    monkeypatch.setattr("api.disney_api.refresh_park_attractions", lambda p: refreshed.append(p))
-    handle_park_schedule_update(park)
-    assert refreshed == [park]
-
 def test_update_parks_operating_status_no_refresh_when_already_operating(monkeypatch):
     park = {
         "name": "Test Park", "id": "dummy-id", "schedule": [], "operating": True,
@@ -645,52 +688,34 @@ def test_update_parks_operating_status_no_refresh_when_already_operating(monkeyp
     }
     monkeypatch.setattr("api.disney_api.fetch_park_schedule",
                         lambda park_id: (_ for _ in ()).throw(AssertionError("schedule fetched")))
-    refreshed = []
-    monkeypatch.setattr("api.disney_api.refresh_park_attractions", lambda p: refreshed.append(p))
+    monkeypatch.setattr("api.disney_api.fetch_park_children",
+                        lambda p: (_ for _ in ()).throw(AssertionError("roster fetched")))
     updated = update_parks_operating_status([park])
     assert updated[0]["operating"] is True
-    assert refreshed == []
     assert not updated[0].get("schedule_refresh_needed")
 
 def test_update_parks_operating_status_defers_schedule_fetch(monkeypatch):
-    """fetch_schedules=False (WS thread): transition flags the park but does no HTTP."""
+    """A closed-to-open transition flags the park for schedule_refresher but does no HTTP."""
     park = {
         "name": "Test Park", "id": "dummy-id", "schedule": [],
         "attractions": [{"name": "Ride A", "waitTime": "10", "status": "OPERATING"}],
     }
     monkeypatch.setattr("api.disney_api.fetch_park_schedule",
                         lambda park_id: (_ for _ in ()).throw(AssertionError("schedule fetched")))
-    monkeypatch.setattr("api.disney_api.refresh_park_attractions",
-                        lambda p: (_ for _ in ()).throw(AssertionError("attractions refreshed")))
-    updated = update_parks_operating_status([park], fetch_schedules=False)
+    monkeypatch.setattr("api.disney_api.fetch_park_children",
+                        lambda p: (_ for _ in ()).throw(AssertionError("roster fetched")))
+    updated = update_parks_operating_status([park])
     assert updated[0]["operating"] is True
     assert updated[0]["schedule_refresh_needed"] is True
 
-def test_update_parks_operating_status_consumes_deferred_flag(monkeypatch):
-    """fetch_schedules=True (REST thread): a pending flag triggers the fetch and is cleared."""
-    park = {
-        "name": "Test Park", "id": "dummy-id", "schedule": [],
-        "operating": True, "schedule_refresh_needed": True,
-        "attractions": [{"name": "Ride A", "waitTime": "10", "status": "OPERATING"}],
-    }
-    monkeypatch.setattr("api.disney_api.fetch_park_schedule", lambda park_id: [{
-        "type": "OPERATING", "openingTime": "09:00", "closingTime": "22:00"
-    }])
-    refreshed = []
-    monkeypatch.setattr("api.disney_api.refresh_park_attractions", lambda p: refreshed.append(p))
-    updated = update_parks_operating_status([park])
-    assert updated[0]["schedule_refresh_needed"] is False
-    assert updated[0]["openingTime"] == "09:00"
-    assert refreshed == [park]
-
 ###########
-# Tests for refresh_park_attractions
+# Tests for the roster refresh (fetch_park_children + reconcile_park_attractions)
 ###########
 
 def _make_children_response(children):
     return DummyResponse({"children": children}, 200)
 
-def test_refresh_park_attractions_updates_name(monkeypatch):
+def test_roster_refresh_updates_name(monkeypatch):
     park = {
         "id": "park-1", "name": "Test Park",
         "attractions": [{"id": "a1", "name": "Old Name", "waitTime": 10, "status": "OPERATING", "lastUpdatedTs": "ts"}]
@@ -698,11 +723,11 @@ def test_refresh_park_attractions_updates_name(monkeypatch):
     monkeypatch.setattr(requests, "get", lambda url, **kw: _make_children_response([
         {"id": "a1", "name": "New Name", "entityType": "ATTRACTION"}
     ]))
-    refresh_park_attractions(park)
+    reconcile_park_attractions(park, fetch_park_children(park))
     assert park["attractions"][0]["name"] == "New Name"
     assert park["attractions"][0]["waitTime"] == 10  # live data preserved
 
-def test_refresh_park_attractions_adds_new(monkeypatch):
+def test_roster_refresh_adds_new(monkeypatch):
     park = {
         "id": "park-1", "name": "Test Park",
         "attractions": [{"id": "a1", "name": "Ride A", "waitTime": 5, "status": "OPERATING", "lastUpdatedTs": ""}]
@@ -711,13 +736,13 @@ def test_refresh_park_attractions_adds_new(monkeypatch):
         {"id": "a1", "name": "Ride A", "entityType": "ATTRACTION"},
         {"id": "a2", "name": "Ride B", "entityType": "ATTRACTION"},
     ]))
-    refresh_park_attractions(park)
+    reconcile_park_attractions(park, fetch_park_children(park))
     ids = [a["id"] for a in park["attractions"]]
     assert "a1" in ids and "a2" in ids
     new = next(a for a in park["attractions"] if a["id"] == "a2")
     assert new["waitTime"] == ""
 
-def test_refresh_park_attractions_removes_dropped(monkeypatch):
+def test_roster_refresh_removes_dropped(monkeypatch):
     park = {
         "id": "park-1", "name": "Test Park",
         "attractions": [
@@ -728,20 +753,99 @@ def test_refresh_park_attractions_removes_dropped(monkeypatch):
     monkeypatch.setattr(requests, "get", lambda url, **kw: _make_children_response([
         {"id": "a1", "name": "Ride A", "entityType": "ATTRACTION"},
     ]))
-    refresh_park_attractions(park)
+    reconcile_park_attractions(park, fetch_park_children(park))
     assert len(park["attractions"]) == 1
     assert park["attractions"][0]["id"] == "a1"
 
-def test_refresh_park_attractions_request_error(monkeypatch):
+def test_roster_refresh_request_error(monkeypatch):
     park = {
         "id": "park-1", "name": "Test Park",
         "attractions": [{"id": "a1", "name": "Ride A", "waitTime": 5, "status": "OPERATING", "lastUpdatedTs": ""}]
     }
     monkeypatch.setattr(requests, "get",
                         lambda url, **kw: (_ for _ in ()).throw(requests.RequestException("err")))
-    refresh_park_attractions(park)
+    assert fetch_park_children(park) is None
     assert len(park["attractions"]) == 1  # unchanged on error
 
+@pytest.fixture
+def clean_roster_demand(monkeypatch):
+    monkeypatch.setattr(disney_api, "_pending_attraction_ids", {})
+    monkeypatch.setattr(disney_api, "_unresolved_attraction_ids", {})
+
+
+def test_unknown_attractions_coalesce_into_one_roster_request(clean_roster_demand):
+    park = {"id": "park-1", "name": "Test Park", "attractions": []}
+    disney_api.note_unknown_attraction(park, "new-1")
+    disney_api.note_unknown_attraction(park, "new-2")
+    assert park["roster_refresh_needed"] is True
+    assert disney_api._pending_attraction_ids == {"park-1": {"new-1", "new-2"}}
+
+
+def test_roster_refresh_due_is_rate_limited_and_daily():
+    park = {"id": "park-1", "roster_refreshed_at": 1000.0}
+    assert disney_api.roster_refresh_due({"id": "park-1"}, now=1000.0)
+    assert not disney_api.roster_refresh_due(park, now=1000.0 + disney_api.ROSTER_MAX_AGE_SECS - 1)
+    assert disney_api.roster_refresh_due(park, now=1000.0 + disney_api.ROSTER_MAX_AGE_SECS)
+
+    park["roster_refresh_needed"] = True
+    assert not disney_api.roster_refresh_due(park, now=1000.0 + disney_api.ROSTER_REFRESH_MIN_SECS - 1)
+    assert disney_api.roster_refresh_due(park, now=1000.0 + disney_api.ROSTER_REFRESH_MIN_SECS)
+
+
+def test_roster_refresh_clears_demand_and_remembers_unresolved_ids(clean_roster_demand, monkeypatch):
+    park = {"id": "park-1", "name": "Test Park", "attractions": []}
+    disney_api.note_unknown_attraction(park, "a2")
+    disney_api.note_unknown_attraction(park, "not-a-ride")
+    monkeypatch.setattr(requests, "get", lambda url, **kw: _make_children_response([
+        {"id": "a2", "name": "Ride B", "entityType": "ATTRACTION"},
+    ]))
+    reconcile_park_attractions(park, fetch_park_children(park))
+
+    assert [a["id"] for a in park["attractions"]] == ["a2"]
+    assert park["roster_refresh_needed"] is False
+    # An id the roster doesn't contain never re-triggers a refresh.
+    disney_api.note_unknown_attraction(park, "not-a-ride")
+    assert park["roster_refresh_needed"] is False
+
+
+def test_park_past_closing_epoch_is_not_operating(monkeypatch):
+    park = {
+        "name": "Test Park", "closingTime": "2020-01-01T20:00:00-05:00",
+        "attractions": [{"name": "Ride A", "waitTime": 15, "status": "OPERATING"}],
+    }
+    assert park_has_operating_attraction(park) is False
+    assert park["closingEpoch"] == datetime(2020, 1, 2, 1, tzinfo=timezone.utc).timestamp()
+
+    # The epoch is parsed once; later checks never touch fromisoformat.
+    class NoParse(datetime):
+        @classmethod
+        def fromisoformat(cls, value):
+            raise AssertionError("closingTime re-parsed")
+
+    monkeypatch.setattr(disney_api, "datetime", NoParse)
+    assert park_has_operating_attraction(park) is False
+
+
+def test_apply_park_schedule_sets_epochs():
+    park = {"name": "Test Park"}
+    disney_api.apply_park_schedule(park, [{
+        "type": "OPERATING", "openingTime": "2025-05-10T09:00:00-04:00", "closingTime": "2025-05-10T22:00:00-04:00",
+    }])
+    assert park["openingEpoch"] == datetime(2025, 5, 10, 13, tzinfo=timezone.utc).timestamp()
+    assert park["closingEpoch"] == datetime(2025, 5, 11, 2, tzinfo=timezone.utc).timestamp()
+
+
+def test_prefetched_park_opens_without_schedule_refresh():
+    park = {
+        "name": "Test Park", "operating": False, "prefetched_for": "2025-05-10T09:00:00-04:00",
+        "attractions": [{"name": "Ride A", "waitTime": 15, "status": "OPERATING"}],
+    }
+    update_parks_operating_status([park])
+    assert park["operating"] is True
+    assert not park.get("schedule_refresh_needed")
+    assert "prefetched_for" not in park
+
+
 def test_update_parks_operating_status(monkeypatch):
     park = {
         "name": "Test Park",
@@ -759,7 +863,64 @@ def test_update_parks_operating_status(monkeypatch):
         "openingTime": "09:00",
         "closingTime": "22:00"
     }])
-    monkeypatch.setattr("api.disney_api.fetch_weather_data", lambda lat, lon: {"temp": "dummy"})
-    monkeypatch.setattr("api.disney_api.refresh_park_attractions", lambda p: None)
     updated = update_parks_operating_status(copy.deepcopy(parks))
-    assert updated[0]["operating"] is True
\ No newline at end of file
+    assert updated[0]["operating"] is True
+
+def test_network_errors_put_connectivity_offline(monkeypatch):
+    """Connection failures (not HTTP errors) count towards offline mode; a response clears it."""
+    from utils import connectivity
+    connectivity.reset()
+
+    def unreachable(url, **kwargs):
+        raise requests.ConnectionError("Name or service not known")
+
+    monkeypatch.setattr(requests, "get", unreachable)
+    parks = [{"id": f"park{i}", "name": f"Park {i}", "location": {}} for i in range(connectivity.FAILURES_BEFORE_OFFLINE)]
+    try:
+        assert fetch_parks_and_attractions(parks) == []
+        assert connectivity.is_offline()
+
+        monkeypatch.setattr(requests, "get", lambda url, **kwargs: DummyResponse({"children": []}))
+        fetch_parks_and_attractions(parks[:1])
+        assert not connectivity.is_offline()
+    finally:
+        connectivity.reset()
+
+
+def test_blocking_requests_have_a_timeout(monkeypatch):
+    timeouts = []
+
+    def recording_get(url, **kwargs):
+        timeouts.append(kwargs.get("timeout"))
+        return DummyResponse({"children": [], "location": {}})
+
+    monkeypatch.setattr(requests, "get", recording_get)
+    disney_api.fetch_park_children({"id": "park-1"})
+    disney_api.get_park_location("park-1")
+    assert timeouts == [disney_api.REQUEST_TIMEOUT_SECS] * 2
+
+
+def test_data_age_prefers_epoch_and_falls_back_to_timestamp():
+    assert disney_api.data_age({"lastUpdatedEpoch": 1000.0}, now=1600.0) == 600.0
+    assert disney_api.data_age({"lastUpdatedTs": "1970-01-01T00:10:00Z"}, now=900.0) == 300.0
+    assert disney_api.data_age({"lastUpdatedTs": ""}) is None
+
+
+def test_rest_requests_are_reported_to_metrics(monkeypatch):
+    from utils import metrics
+    metrics.reset()
+    monkeypatch.setattr(requests, "get", lambda url, **kwargs: DummyResponse({"children": []}))
+    disney_api._get_json("https://api.themeparks.wiki/v1/entity/x/children", "children")
+
+    def unreachable(url, **kwargs):
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(requests, "get", unreachable)
+    with pytest.raises(requests.ConnectionError):
+        disney_api._get_json("https://api.themeparks.wiki/v1/entity/x/children", "children")
+
+    counters = {tuple(sorted(c["labels"].items())): c["value"] for c in metrics.snapshot()["counters"]}
+    assert counters == {(("endpoint", "children"), ("outcome", "ok")): 1,
+                        (("endpoint", "children"), ("outcome", "network_error")): 1}
+    assert metrics.snapshot()["histograms"][0]["count"] == 2
+    metrics.reset()
@@ -1,78 +1,151 @@
 import unittest
-from unittest.mock import patch, MagicMock
-import pyowm
-import requests
+from unittest.mock import patch
 
-from api.weather import load_config, fetch_weather_data
+from api.weather import load_config
 
 class TestWeatherModule(unittest.TestCase):
 
-    def setUp(self):
-        try:
-            import api.weather as weather_mod
-            weather_mod.weather_api_key_valid = True
-        except AttributeError:
-            pass
-
     @patch('builtins.open', new_callable=unittest.mock.mock_open, read_data='{"weather": {"apikey": "valid_api_key"}}')
     def test_load_config(self, mock_open):
         config = load_config('fake_path.json')
         self.assertEqual(config['weather']['apikey'], 'valid_api_key')
 
-    @patch('api.weather.load_config')
-    @patch('pyowm.OWM')
-    def test_fetch_weather_data_valid(self, mock_OWM, mock_load_config):
-        from api.weather import fetch_weather_data
-        mock_load_config.return_value = {'weather': {'apikey': 'valid_api_key'}}
-        import api.weather as weather_mod
-        weather_mod.weather_api_key_valid = True
-
-        mock_weather_manager = MagicMock()
-        mock_observation = MagicMock()
-        mock_weather_data = MagicMock()
-        mock_weather_data.temperature.return_value = {"temp": 75.0}
-        mock_weather_data.detailed_status = "Sunny"
-        mock_weather_data.status = "Clear"
-        mock_weather_data.weather_icon_name = "01d"
-
-        mock_observation.weather = mock_weather_data
-        mock_observation.location.name = "Test City"
-
-        mock_OWM.return_value.weather_manager.return_value = mock_weather_manager
-        mock_weather_manager.weather_at_coords.return_value = mock_observation
-
-        result = fetch_weather_data(0, 0)
-        self.assertIsNotNone(result)
-        self.assertEqual(result['temperature'], "75°")
-        self.assertEqual(result['description'], "Sunny")
-        self.assertEqual(result['city'], "Test City")
-
-    @patch('api.weather.load_config')
-    @patch('pyowm.OWM')
-    @patch('api.weather.debug.warning')
-    def test_fetch_weather_data_invalid_key(self, mock_warning, mock_OWM, mock_load_config):
-        from api.weather import fetch_weather_data
-        mock_load_config.return_value = {'weather': {'apikey': 'invalid_api_key'}}
-        mock_OWM.side_effect = pyowm.commons.exceptions.UnauthorizedError()
-        result = fetch_weather_data(0, 0)
-        self.assertIsNone(result)
-        mock_warning.assert_called_with(
-            "[WEATHER] The API key provided doesn't appear to be valid. Please check your config.json."
-        )
-
-    @patch('api.weather.load_config')
-    @patch('pyowm.OWM')
-    def test_fetch_weather_data_request_failure(self, mock_OWM, mock_load_config):
-        from api.weather import fetch_weather_data
-        mock_load_config.return_value = {'weather': {'apikey': 'valid_api_key'}}
-        mock_weather_manager = MagicMock()
-        mock_weather_manager.weather_at_coords.side_effect = requests.RequestException("Request failed")
-        mock_OWM.return_value.weather_manager.return_value = mock_weather_manager
-
-        with patch('api.weather.debug.error') as mock_error:
-            result = fetch_weather_data(0, 0)
-            self.assertIsNone(result)
-            mock_error.assert_called_with("Failed to fetch weather data: Request failed")
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+# --- Async client against a local OpenWeatherMap stub ---
+
+import asyncio
+import time
+
+import aiohttp
+import pytest
+
+import api.weather as weather_mod
+from api.weather import fetch_weather_async, refresh_weather
+from tests.api.owm_stub import OwmStubServer
+
+WDW_PARKS = [
+    {"name": "MK", "location": {"latitude": 28.4177, "longitude": -81.5812}},
+    {"name": "EPCOT", "location": {"latitude": 28.3747, "longitude": -81.5494}},
+    {"name": "HS", "location": {"latitude": 28.3575, "longitude": -81.5582}},
+    {"name": "AK", "location": {"latitude": 28.3553, "longitude": -81.5901}},
+]
+
+
+def _use_stub(monkeypatch, stub, timeout=5.0):
+    weather_mod.reset()
+    monkeypatch.setattr(weather_mod, "_settings", {
+        "apikey": "key", "ttl": 600.0, "bucket_degrees": 0.2,
+        "base_url": stub.base_url, "timeout": timeout, "refresh": 600.0,
+    })
+
+
+def _run_with_stub(monkeypatch, parks, timeout=5.0, **stub_options):
+    async def scenario():
+        async with OwmStubServer(**stub_options) as stub:
+            _use_stub(monkeypatch, stub, timeout)
+            async with aiohttp.ClientSession() as session:
+                started = time.monotonic()
+                regions = await refresh_weather(parks, session)
+                return stub, regions, time.monotonic() - started
+
+    try:
+        return asyncio.run(scenario())
+    finally:
+        weather_mod.reset()
+
+
+def test_refresh_weather_fetches_each_region_once_concurrently(monkeypatch):
+    cedar_point = {"name": "Cedar Point", "location": {"latitude": 41.4822, "longitude": -82.6835}}
+    parks = [dict(park) for park in WDW_PARKS] + [cedar_point]
+
+    stub, regions, elapsed = _run_with_stub(monkeypatch, parks, delay=0.3)
+
+    assert regions == 2
+    assert sorted(stub.requests) == [(28.4, -81.6), (41.4, -82.6)]
+    assert elapsed < 0.55, "regions should be fetched concurrently"
+    assert all(park["weather"]["temperature"] == "75°" for park in parks)
+    assert parks[0]["weather"]["short_description"] == "T-Storm"
+    assert parks[0]["weather"]["icon"] == "11d"
+
+
+def test_refresh_weather_timeout_keeps_previous_weather(monkeypatch):
+    parks = [dict(WDW_PARKS[0], weather={"temperature": "70°"})]
+    stub, _, elapsed = _run_with_stub(monkeypatch, parks, timeout=0.1, delay=1.0)
+    assert stub.requests
+    assert elapsed < 0.5
+    assert parks[0]["weather"] == {"temperature": "70°"}
+
+
+@pytest.mark.parametrize("body", ['{"weather": [', '{"weather": [], "main": {"temp": null}}'])
+def test_refresh_weather_malformed_response_keeps_previous_weather(monkeypatch, body):
+    parks = [dict(WDW_PARKS[0], weather={"temperature": "70°"})]
+    stub, regions, _ = _run_with_stub(monkeypatch, parks, body=body)
+    assert stub.requests and regions == 1
+    assert parks[0]["weather"] == {"temperature": "70°"}
+
+
+def test_refresh_weather_unauthorized_disables_further_calls(monkeypatch):
+    parks = [dict(WDW_PARKS[0])]
+
+    async def scenario():
+        async with OwmStubServer(status=401) as stub:
+            _use_stub(monkeypatch, stub)
+            async with aiohttp.ClientSession() as session:
+                await refresh_weather(parks, session)
+                assert weather_mod.weather_api_key_valid is False
+                weather_mod._cache.clear()
+                await refresh_weather(parks, session)
+            return stub
+
+    try:
+        stub = asyncio.run(scenario())
+    finally:
+        weather_mod.reset()
+    assert len(stub.requests) == 1
+    assert "weather" not in parks[0]
+
+
+def _fetch_with_stub(monkeypatch, calls, **stub_options):
+    """
+    Run fetch_weather_async for each (lat, lon, now); a None entry takes the
+    network down. Returns the stub, the results and whether the key is still valid.
+    """
+    async def scenario():
+        async with OwmStubServer(**stub_options) as stub:
+            _use_stub(monkeypatch, stub)
+            results = []
+            async with aiohttp.ClientSession() as session:
+                for call in calls:
+                    if call is None:
+                        weather_mod._settings["base_url"] = "http://127.0.0.1:1/data/2.5"
+                        continue
+                    results.append(await fetch_weather_async(session, *call))
+            return stub, results, weather_mod.weather_api_key_valid
+
+    try:
+        return asyncio.run(scenario())
+    finally:
+        weather_mod.reset()
+
+
+def test_nearby_parks_share_one_cached_observation(monkeypatch):
+    stub, (magic_kingdom, epcot, animal_kingdom), _ = _fetch_with_stub(
+        monkeypatch, [(28.4177, -81.5812, 0), (28.3747, -81.5494, 60), (28.3553, -81.5901, 120)])
+
+    assert magic_kingdom["temperature"] == "75°"
+    assert magic_kingdom["description"] == "thunderstorm with rain"
+    assert epcot is magic_kingdom and animal_kingdom is magic_kingdom
+    assert stub.requests == [(28.4, -81.6)]
+
+
+def test_cache_expires_after_ttl(monkeypatch):
+    stub, results, _ = _fetch_with_stub(monkeypatch, [(28.4, -81.6, 0), (28.4, -81.6, 599), (28.4, -81.6, 600)])
+    assert results[1] is results[0]
+    assert results[2] is not results[0]
+    assert len(stub.requests) == 2
+
+
+def test_network_failure_returns_last_observation_and_keeps_the_key(monkeypatch):
+    _, (first, after_failure), key_valid = _fetch_with_stub(
+        monkeypatch, [(28.4, -81.6, 0), None, (28.4, -81.6, 3600)])
+    assert after_failure is first
+    assert key_valid is True
@@ -110,7 +110,8 @@ def test_boarding_group_3digit_fits_32row(monkeypatch):
 
     mod.render_attraction_info(
         FakeMatrix(),
-        {"name": "Tron", "entityType": "ATTRACTION", "waitTime": "Groups 100-200", "status": "OPERATING"}
+        {"name": "Tron", "entityType": "ATTRACTION", "waitTime": None,
+         "boardingGroup": {"start": 100, "end": 200}, "status": "OPERATING"}
     )
     assert calls, "No DrawText calls were made"
     for y, text in calls:
@@ -133,7 +134,8 @@ def test_boarding_group_3digit_fits_64row(monkeypatch):
 
     mod.render_attraction_info(
         FakeMatrix(),
-        {"name": "Tron", "entityType": "ATTRACTION", "waitTime": "Groups 100-200", "status": "OPERATING"}
+        {"name": "Tron", "entityType": "ATTRACTION", "waitTime": None,
+         "boardingGroup": {"start": 100, "end": 200}, "status": "OPERATING"}
     )
     assert calls, "No DrawText calls were made"
     for y, text in calls:
@@ -141,21 +143,49 @@ def test_boarding_group_3digit_fits_64row(monkeypatch):
 
 
 def test_wait_time_formatting_integer():
-    """Numeric wait times get ' Mins' appended."""
-    from display.attractions.attraction_info import _format_wait_time
-    assert _format_wait_time(45) == "45 Mins"
-
-def test_wait_time_formatting_down():
-    """'Down X' strings still get ' Mins' appended."""
-    from display.attractions.attraction_info import _format_wait_time
-    assert _format_wait_time("Down 15") == "Down 15 Mins"
+    """Standby wait times get ' Mins' appended."""
+    from display.attractions.attraction_info import format_wait_time
+    assert format_wait_time({"status": "OPERATING", "waitTime": 45}) == "45 Mins"
+
+def test_wait_time_formatting_down_counts_from_down_since():
+    """Minutes down are derived at render time from down_since_epoch."""
+    from display.attractions.attraction_info import format_wait_time
+    ride = {"status": "DOWN", "waitTime": None, "down_since_epoch": 1000.0}
+    assert format_wait_time(ride, now=1000.0 + 15 * 60) == "Down 15 Mins"
+    assert format_wait_time(ride, now=1000.0 + 37 * 60) == "Down 37 Mins"
+
+def test_wait_time_formatting_down_from_iso_down_since():
+    from display.attractions.attraction_info import format_wait_time
+    ride = {"status": "DOWN", "down_since": "1970-01-01T00:10:00Z"}
+    assert format_wait_time(ride, now=20 * 60) == "Down 10 Mins"
+    ride = {"status": "DOWN", "down_since": "1970-01-01T00:10:00.250Z"}
+    assert format_wait_time(ride, now=55 * 60) == "Down 45 Mins"
+    for down_since in ("", None, "invalid-date"):
+        assert format_wait_time({"status": "DOWN", "down_since": down_since}) == "Down"
 
 def test_wait_time_formatting_boarding_group_range():
-    """Boarding group range strings are used as-is."""
-    from display.attractions.attraction_info import _format_wait_time
-    assert _format_wait_time("Groups 1-50") == "Groups 1-50"
+    from display.attractions.attraction_info import format_wait_time
+    ride = {"status": "OPERATING", "waitTime": None, "boardingGroup": {"start": 1, "end": 50}}
+    assert format_wait_time(ride) == "Groups 1-50"
 
 def test_wait_time_formatting_boarding_group_single():
-    """Single boarding group strings are used as-is."""
-    from display.attractions.attraction_info import _format_wait_time
-    assert _format_wait_time("Group 1+") == "Group 1+"
\ No newline at end of file
+    from display.attractions.attraction_info import format_wait_time
+    ride = {"status": "OPERATING", "waitTime": None, "boardingGroup": {"start": 1, "end": None}}
+    assert format_wait_time(ride) == "Group 1+"
+
+
+def test_stale_wait_time_drawn_in_stale_color(monkeypatch):
+    import display.attractions.attraction_info as mod
+
+    loaded_fonts["ride"] = DummyFont(width=5, height=8)
+    loaded_fonts["waittime"] = DummyFont(width=5, height=8)
+    calls = []
+    monkeypatch.setattr(mod.graphics, "DrawText", lambda matrix, font, x, y, color, text: calls.append((text, color)))
+
+    class FakeMatrix:
+        width, height = 64, 32
+
+    ride = {"name": "Tron", "waitTime": 45, "status": "OPERATING"}
+    mod.render_attraction_info(FakeMatrix(), ride, stale=True)
+    assert dict(calls)["45 Mins"] is mod.color_dict["stale"]
+    assert dict(calls)["Tron"] is mod.color_dict["white"]
@@ -96,14 +96,7 @@ def test_format_iso_time_valid():
     # Expect the formatted time to end with AM or PM.
     assert formatted.endswith("AM") or formatted.endswith("PM")
 
-def test_format_iso_time_invalid(monkeypatch):
-    # Create a dummy datetime class that always raises a ValueError.
-    class DummyDatetime:
-        @staticmethod
-        def fromisoformat(s):
-            raise ValueError("bad format")
-    # Patch park_details.datetime with our dummy.
-    monkeypatch.setattr(park_details, "datetime", DummyDatetime)
+def test_format_iso_time_invalid():
     formatted = format_iso_time("badtime")
     assert formatted == "badtime"
 
@@ -140,39 +133,11 @@ def test_render_park_hours():
     render_park_hours(60, 10, fake_matrix, park_obj)
     assert any("-" in call["text"] for call in text_recorder.calls)
 
-def test_render_weather_icon_success(monkeypatch):
-    # Create a dummy response for requests.get.
-    class DummyResponse:
-        def __init__(self, content):
-            self.content = content
-        def raise_for_status(self):
-            pass
-    def dummy_get(url):
-        return DummyResponse(b"\x89PNG\r\n\x1a\n")
-    monkeypatch.setattr(park_details, "requests", type("r", (), {"get": dummy_get, "RequestException": Exception}))
-    # Patch PIL.Image.open to return a fake image.
-    class FakeImage:
-        def __init__(self):
-            self.width = 15
-        def resize(self, size):
-            self.width = size[0]
-            return self
-    monkeypatch.setattr(park_details, "Image", type("PILImage", (), {"open": lambda f: FakeImage()}))
-    park_details.icon_cache.clear()
-    img = render_weather_icon("01d")
-    assert img is not None
-    # Ensure caching: calling again returns the same object.
-    cached = render_weather_icon("01d")
-    assert cached is img
-
-def test_render_weather_icon_failure(monkeypatch):
-    # Dummy get that simulates a network failure.
-    def dummy_get(url):
-        raise Exception("Network error")
-    monkeypatch.setattr(park_details, "requests", type("r", (), {"get": dummy_get, "RequestException": Exception}))
-    park_details.icon_cache.clear()
-    img = render_weather_icon("badcode")
-    assert img is None
+def test_render_weather_icon_reads_the_atlas(monkeypatch):
+    icon = object()
+    monkeypatch.setattr(park_details, "get_weather_icon", lambda code: icon if code == "01d" else None)
+    assert render_weather_icon("01d") is icon
+    assert render_weather_icon("badcode") is None
 
 def test_display_weather_icon_and_description(monkeypatch):
     fake_matrix = FakeMatrix(width=128, height=32)
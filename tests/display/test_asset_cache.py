@@ -0,0 +1,65 @@
+# tests/display/test_asset_cache.py
+import pytest
+from PIL import Image
+
+from display import asset_cache
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    asset_cache.reset()
+    asset_cache.configure(asset_cache.MAX_BYTES)
+    yield
+    asset_cache.reset()
+    asset_cache.configure(asset_cache.MAX_BYTES)
+
+
+def _image(width=10, height=10, mode="RGB"):
+    return Image.new(mode, (width, height))
+
+
+def test_get_loads_once_and_converts_to_rgb():
+    loads = []
+    loader = lambda: loads.append(1) or _image(mode="RGBA")
+    first = asset_cache.get("logo.png", (64, 32), "rgb", loader)
+    second = asset_cache.get("logo.png", (64, 32), "rgb", loader)
+    assert first is second
+    assert first.mode == "RGB"
+    assert loads == [1]
+    assert asset_cache.stats == {"hits": 1, "misses": 1, "evictions": 0}
+    assert asset_cache.hit_rate() == 0.5
+    assert asset_cache.memory_bytes() == 10 * 10 * 3
+
+
+def test_board_size_and_transform_are_part_of_the_key():
+    asset_cache.get("icon", 32, ("icon", 15), lambda: _image())
+    asset_cache.get("icon", 64, ("icon", 15), lambda: _image())
+    asset_cache.get("icon", 32, ("icon", 31), lambda: _image())
+    assert asset_cache.stats["misses"] == 3
+
+
+def test_least_recently_used_entries_are_evicted_over_the_cap():
+    asset_cache.configure(2 * 300)
+    asset_cache.get("a", 32, "rgb", lambda: _image())
+    asset_cache.get("b", 32, "rgb", lambda: _image())
+    asset_cache.get("a", 32, "rgb", lambda: _image())  # a is now most recent
+    asset_cache.get("c", 32, "rgb", lambda: _image())
+
+    assert asset_cache.contains("a", 32, "rgb")
+    assert not asset_cache.contains("b", 32, "rgb")
+    assert asset_cache.stats["evictions"] == 1
+    assert asset_cache.memory_bytes() == 600
+
+
+def test_oversized_and_missing_images_are_not_cached():
+    asset_cache.configure(100)
+    assert asset_cache.get("big", 32, "rgb", lambda: _image()).size == (10, 10)
+    assert asset_cache.get("gone", 32, "rgb", lambda: None) is None
+    assert asset_cache.memory_bytes() == 0
+
+
+def test_put_replaces_an_entry():
+    asset_cache.put("icon", 32, "rgb", _image(10, 10))
+    asset_cache.put("icon", 32, "rgb", _image(5, 5))
+    assert asset_cache.memory_bytes() == 5 * 5 * 3
+    assert "1 images" in asset_cache.summary()
@@ -0,0 +1,101 @@
+# tests/display/test_weather_icons.py
+from io import BytesIO
+
+import pytest
+import requests
+from PIL import Image
+
+from display import asset_cache, weather_icons
+from display.weather_icons import fetch_missing_icon, get_weather_icon, initialize_weather_icons
+
+
+@pytest.fixture(autouse=True)
+def clean_atlas():
+    weather_icons.reset()
+    asset_cache.reset()
+    yield
+    weather_icons.reset()
+    asset_cache.reset()
+
+
+def _png_bytes(size=50, color=(255, 200, 0, 255)):
+    buffer = BytesIO()
+    Image.new("RGBA", (size, size), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_initialize_loads_bundled_icons_resized_and_rgb(tmp_path):
+    icons = initialize_weather_icons(32, cache_dir=str(tmp_path / "none"))
+    assert len(icons) == 18
+    icon = icons["01d"]
+    assert icon.mode == "RGB"
+    assert icon.size == (15, 15)
+
+
+def test_initialize_includes_downloaded_icons(tmp_path):
+    (tmp_path / "99x.png").write_bytes(_png_bytes())
+    icons = initialize_weather_icons(64, cache_dir=str(tmp_path))
+    assert icons["99x"].size == (15, 15)
+    assert "01n" in icons
+
+
+def test_prepare_icon_flattens_transparency_onto_black():
+    icon = weather_icons.prepare_icon(Image.new("RGBA", (4, 4), (255, 255, 255, 0)), 2)
+    assert icon.getpixel((0, 0)) == (0, 0, 0)
+
+
+def test_get_weather_icon_never_fetches_on_the_calling_thread(monkeypatch, tmp_path):
+    initialize_weather_icons(32, cache_dir=str(tmp_path))
+    started = []
+
+    class FakeThread:
+        def __init__(self, target, args, name, daemon):
+            started.append(args)
+
+        def start(self):
+            pass
+
+    monkeypatch.setattr(weather_icons.threading, "Thread", FakeThread)
+    monkeypatch.setattr(weather_icons.requests, "get", lambda *a, **k: pytest.fail("fetched on render thread"))
+
+    assert get_weather_icon("01d") is not None
+    assert get_weather_icon("77z") is None
+    assert get_weather_icon("77z") is None  # already pending: no second download
+    assert started == [("77z",)]
+
+
+def test_fetch_missing_icon_stores_on_disk_and_in_atlas(monkeypatch, tmp_path):
+    initialize_weather_icons(32, cache_dir=str(tmp_path))
+
+    class Response:
+        content = _png_bytes()
+
+        def raise_for_status(self):
+            pass
+
+    monkeypatch.setattr(weather_icons.requests, "get", lambda url, timeout: Response())
+    icon = fetch_missing_icon("77z", cache_dir=str(tmp_path))
+    assert icon.size == (15, 15) and icon.mode == "RGB"
+    assert (tmp_path / "77z.png").exists()
+    assert get_weather_icon("77z") is icon
+
+
+def test_evicted_icon_is_reloaded_from_disk(tmp_path):
+    initialize_weather_icons(32, cache_dir=str(tmp_path))
+    asset_cache.reset()
+    icon = get_weather_icon("01d")
+    assert icon.size == (15, 15)
+    assert asset_cache.stats["misses"] == 1
+    assert get_weather_icon("01d") is icon
+    assert asset_cache.stats["hits"] == 1
+
+
+def test_failed_fetch_is_not_retried_straight_away(monkeypatch, tmp_path):
+    def fail(url, timeout):
+        raise requests.ConnectionError("offline")
+
+    monkeypatch.setattr(weather_icons.requests, "get", fail)
+    monkeypatch.setattr(weather_icons.threading, "Thread",
+                        lambda **kwargs: pytest.fail("retried too soon"))
+    assert fetch_missing_icon("77z", cache_dir=str(tmp_path)) is None
+    assert get_weather_icon("77z") is None
@@ -4,22 +4,17 @@ import tempfile
 from datetime import datetime, date
 
 import pytest
+from PIL import Image
 
 import disney  # Import your main module (disney.py)
 
 
 # ---- Helper/Fake Classes ----
 
-class FakeImage:
-    def __init__(self):
-        self.closed = False
-    def convert(self, mode):
-        return "converted_image"
-    def close(self):
-        self.closed = True
-
 class FakeMatrix2:
     def __init__(self):
+        self.width = 64
+        self.height = 32
         self.clear_count = 0
         self.image_set = None
     def Clear(self):
@@ -109,7 +104,7 @@ def test_initialize_park_information_screen(monkeypatch):
 def test_loop_through_attractions(monkeypatch):
     fake_matrix = FakeMatrix()
     # Override render_attraction_info to mark call on the matrix
-    def fake_render_attraction_info(matrix, attraction_info):
+    def fake_render_attraction_info(matrix, attraction_info, stale=False):
         matrix.attraction_info_rendered = True
     monkeypatch.setattr(disney, "render_attraction_info", fake_render_attraction_info)
     # Create a dummy park with one attraction that is operating
@@ -138,7 +133,7 @@ def test_loop_through_attractions_skips_closed(monkeypatch):
     fake_matrix = FakeMatrix()
 
     # Create a fake version of render_attraction_info that records the attraction name.
-    def fake_render_attraction_info(matrix, attraction_info):
+    def fake_render_attraction_info(matrix, attraction_info, stale=False):
         matrix.rendered_attractions.append(attraction_info['name'])
 
     monkeypatch.setattr(disney, "render_attraction_info", fake_render_attraction_info)
@@ -161,7 +156,7 @@ def test_loop_through_attractions_skips_closed(monkeypatch):
 def test_loop_through_attractions_skips_empty_wait_time(monkeypatch):
     fake_matrix = FakeMatrix()
 
-    def fake_render_attraction_info(matrix, attraction_info):
+    def fake_render_attraction_info(matrix, attraction_info, stale=False):
         matrix.rendered_attractions.append(attraction_info['name'])
 
     monkeypatch.setattr(disney, "render_attraction_info", fake_render_attraction_info)
@@ -226,26 +221,25 @@ def test_load_config_nonexistent(tmp_path):
 
 def test_render_logo_with_image(monkeypatch):
     """
-    Test the branch in render_logo that loads and displays an image.
-    We set use_image_logo to True, force os.path.exists to return True, and
-    monkey-patch PIL.Image.open to return a FakeImage instance.
-    Then, we verify that FakeMatrix2.SetImage is called with the
-    "converted_image" value.
+    With use_image_logo set, render_logo shows the logo as a display-ready RGB
+    image, loaded once and then served from the asset cache.
     """
     fake_matrix = FakeMatrix2()
-    disney.use_image_logo = True
-    # Force os.path.exists to return True regardless of the path
+    monkeypatch.setattr(disney, "use_image_logo", True)
     monkeypatch.setattr(os.path, "exists", lambda path: True)
-    # Monkey-patch PIL.Image.open to return a FakeImage instance
-    monkeyatch_target = "PIL.Image.open"
-    monkeypatch.setattr(monkeyatch_target, lambda path: FakeImage())
-    # Override time.sleep to avoid delay (if not already patched by a global fixture)
+    loads = []
+    logo = Image.new("RGB", (64, 32))
+    monkeypatch.setattr(disney.asset_cache, "load_rgb", lambda path: loads.append(path) or logo)
     monkeypatch.setattr(disney, "time", type("t", (), {"sleep": lambda x: None}))
+    disney.asset_cache.reset()
 
+    disney.render_logo(fake_matrix)
     disney.render_logo(fake_matrix)
 
-    # Check that SetImage was called and it received "converted_image"
-    assert fake_matrix.image_set == "converted_image"
+    assert fake_matrix.image_set is logo
+    assert len(loads) == 1
+    assert disney.asset_cache.stats["hits"] == 1
+    disney.asset_cache.reset()
 
 
 def test_validate_date_error_message():
@@ -257,4 +251,65 @@ def test_validate_date_error_message():
     assert "Invalid date format:" in str(excinfo.value)
 
 # Note: Testing main() is more challenging because it runs an infinite loop.
-# If needed, you could refactor main() for better testability (e.g., extract functionality into smaller functions)a
\ No newline at end of file
+# If needed, you could refactor main() for better testability (e.g., extract functionality into smaller functions)a
+
+def test_loop_through_attractions_shows_down_and_boarding_group_rides(monkeypatch):
+    fake_matrix = FakeMatrix()
+    monkeypatch.setattr(disney, "render_attraction_info",
+                        lambda matrix, attraction_info, stale=False: matrix.rendered_attractions.append(attraction_info['name']))
+    monkeypatch.setattr(disney.time, "sleep", lambda s: None)
+    park = {
+        "name": "Magic Kingdom",
+        "attractions": [
+            {"name": "Tron", "waitTime": None, "boardingGroup": {"start": 5, "end": 20}, "status": "OPERATING"},
+            {"name": "Space Mountain", "waitTime": None, "status": "DOWN", "down_since": ""},
+            {"name": "No Data Yet", "waitTime": "", "status": "OPERATING"},
+        ]
+    }
+    disney.loop_through_attractions(fake_matrix, park)
+    assert fake_matrix.rendered_attractions == ["Tron", "Space Mountain"]
+
+
+def test_first_attraction_frame_is_measured_once(monkeypatch):
+    monkeypatch.setattr(disney, "_first_attraction_frame_secs", None)
+    monkeypatch.setattr(disney, "_started_at", 100.0)
+    now = iter([112.5, 200.0])
+    monkeypatch.setattr(disney.time, "monotonic", lambda: next(now))
+    disney.note_attraction_frame()
+    disney.note_attraction_frame()
+    assert disney._first_attraction_frame_secs == 12.5
+
+
+def test_wait_for_parks_returns_once_a_park_is_published(monkeypatch):
+    parks_data = []
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 2:
+            parks_data.append({"id": "mk"})
+
+    monkeypatch.setattr(disney.time, "sleep", fake_sleep)
+    disney.wait_for_parks(parks_data, timeout=60)
+    assert sleeps == [disney.PARKS_WAIT_POLL_SECS] * 2
+
+
+def test_loop_through_attractions_marks_stale_and_hides_expired(monkeypatch):
+    rendered = []
+    monkeypatch.setattr(disney, "render_attraction_info",
+                        lambda matrix, attraction_info, stale=False: rendered.append((attraction_info['name'], stale)))
+    monkeypatch.setattr(disney.time, "sleep", lambda s: None)
+    now = disney.time.time()
+    park = {
+        "name": "Magic Kingdom",
+        "attractions": [
+            {"name": "Fresh", "waitTime": 10, "status": "OPERATING", "lastUpdatedEpoch": now - 60},
+            {"name": "Old", "waitTime": 20, "status": "OPERATING",
+             "lastUpdatedEpoch": now - disney.stale_data_secs - 60},
+            {"name": "Expired", "waitTime": 30, "status": "OPERATING",
+             "lastUpdatedEpoch": now - disney.expired_data_secs - 60},
+            {"name": "Unknown Age", "waitTime": 40, "status": "OPERATING", "lastUpdatedTs": ""},
+        ]
+    }
+    disney.loop_through_attractions(FakeMatrix(), park)
+    assert rendered == [("Fresh", False), ("Old", True), ("Unknown Age", False)]
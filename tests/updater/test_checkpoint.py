@@ -0,0 +1,137 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from updater import checkpoint
+from updater.checkpoint import (
+    checkpoint_writer,
+    load_checkpoint,
+    park_list_from_checkpoint,
+    restore_checkpointed_state,
+    save_checkpoint,
+    write_checkpoint,
+)
+
+
+def _park(**overrides):
+    park = {
+        "id": "park1",
+        "name": "MK",
+        "operating": True,
+        "closingEpoch": None,
+        "attractions": [
+            {"id": "a1", "name": "Space", "status": "OPERATING", "waitTime": 30, "lastUpdatedTs": "t1"},
+            {"id": "a2", "name": "Tron", "status": "DOWN", "waitTime": None, "lastUpdatedTs": "t2",
+             "down_since": "2025-05-10T12:00:00Z", "down_since_epoch": 1746878400.0},
+        ],
+    }
+    park.update(overrides)
+    return park
+
+
+def test_save_then_load_round_trips_marked_stale(tmp_path):
+    path = str(tmp_path / "cache" / "state.json")
+    parks = [_park(schedule_refresh_needed=True)]
+    assert save_checkpoint(parks, path) is True
+
+    loaded = load_checkpoint(path)
+    assert len(loaded) == 1
+    assert loaded[0]["stale"] is True
+    assert loaded[0]["operating"] is True
+    assert "schedule_refresh_needed" not in loaded[0]
+    assert loaded[0]["attractions"][1]["down_since"] == "2025-05-10T12:00:00Z"
+
+
+def test_write_is_atomic_and_leaves_no_temp_file(tmp_path):
+    path = str(tmp_path / "state.json")
+    write_checkpoint('{"old": true}', path)
+    write_checkpoint('{"new": true}', path)
+    with open(path) as file:
+        assert json.load(file) == {"new": True}
+    assert os.listdir(tmp_path) == ["state.json"]
+
+
+def test_save_skips_while_any_park_is_stale(tmp_path):
+    path = str(tmp_path / "state.json")
+    assert save_checkpoint([_park(stale=True)], path) is False
+    assert save_checkpoint([], path) is False
+    assert not os.path.exists(path)
+
+
+def test_load_ignores_missing_corrupt_old_and_unconfigured(tmp_path):
+    path = str(tmp_path / "state.json")
+    assert load_checkpoint(path) == []
+
+    with open(path, "w") as file:
+        file.write("{not json")
+    assert load_checkpoint(path) == []
+
+    write_checkpoint(checkpoint.snapshot([_park()], now=1000.0), path)
+    assert load_checkpoint(path, now=1000.0 + checkpoint.CHECKPOINT_MAX_AGE_SECS + 1) == []
+    assert load_checkpoint(path, park_ids={"other"}, now=1000.0) == []
+    assert len(load_checkpoint(path, park_ids={"park1"}, now=1000.0)) == 1
+
+
+def test_load_clears_operating_for_park_past_closing(tmp_path):
+    path = str(tmp_path / "state.json")
+    write_checkpoint(checkpoint.snapshot([_park(closingEpoch=1.0)]), path)
+    assert load_checkpoint(path)[0]["operating"] is False
+
+
+def test_restore_carries_live_fields_onto_fresh_roster():
+    fresh = [{
+        "id": "park1",
+        "name": "MK",
+        "attractions": [
+            {"id": "a2", "name": "Tron", "status": "", "waitTime": "", "lastUpdatedTs": ""},
+            {"id": "a3", "name": "New Ride", "status": "", "waitTime": "", "lastUpdatedTs": ""},
+        ],
+    }]
+    restore_checkpointed_state(fresh, [_park(stale=True)])
+
+    park = fresh[0]
+    assert park["stale"] is True and park["operating"] is True
+    tron, new_ride = park["attractions"]
+    assert tron["status"] == "DOWN"
+    assert tron["down_since_epoch"] == 1746878400.0
+    assert new_ride["status"] == ""
+
+
+def test_restore_ignores_parks_that_are_not_stale():
+    fresh = [{"id": "park1", "attractions": [{"id": "a1", "status": ""}]}]
+    restore_checkpointed_state(fresh, [_park()])
+    assert fresh[0]["attractions"][0]["status"] == ""
+    assert "stale" not in fresh[0]
+
+
+def test_checkpoint_writer_writes_reconciled_state(monkeypatch, tmp_path):
+    path = str(tmp_path / "state.json")
+    parks_data = [_park(stale=True)]
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 2:
+            parks_data[0].pop("stale")
+        if len(sleeps) == 4:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(checkpoint.asyncio, "sleep", fake_sleep)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(checkpoint_writer(parks_data, interval=30, path=path))
+
+    assert sleeps == [30, 30, 30, 30]
+    with open(path) as file:
+        saved = json.load(file)
+    assert saved["parks"][0]["id"] == "park1"
+    assert "stale" not in saved["parks"][0]
+
+
+def test_park_list_from_checkpoint_rebuilds_configured_parks():
+    park = _park(destination_id="dest", location={"latitude": 1, "longitude": 2}, stale=True)
+    assert park_list_from_checkpoint([park]) == [
+        {"id": "park1", "name": "MK", "destination_id": "dest",
+         "location": {"latitude": 1, "longitude": 2}, "schedule": []},
+    ]
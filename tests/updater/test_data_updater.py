@@ -1,11 +1,23 @@
+import asyncio
 import copy
-import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
 
 from updater.data_updater import (
+    bootstrap_parks_data,
+    live_data_poller,
     merge_live_data,
+    next_opening,
+    opening_prefetcher,
+    publish_park,
+    schedule_refresher,
+    schedule_transitions,
     update_parks_live_data,
-    live_data_updater
+    weather_refresher,
 )
+from utils import bandwidth, connectivity
 
 # Dummy parks list used for testing.
 DUMMY_PARKS = [{
@@ -35,7 +47,7 @@ def test_update_parks_live_data(monkeypatch):
         "lastUpdatedTs": "new"
     }]
 
-    async def dummy_fetch_live_data(attractions):
+    async def dummy_fetch_live_data(attractions, session=None):
         return dummy_live_data
 
     # Patch fetch_live_data inside updater.data_updater.
@@ -43,7 +55,7 @@ def test_update_parks_live_data(monkeypatch):
 
     # Call update_parks_live_data with a copy of the dummy parks.
     parks_copy = copy.deepcopy(DUMMY_PARKS)
-    updated_parks = update_parks_live_data(parks_copy)
+    updated_parks = asyncio.run(update_parks_live_data(parks_copy))
 
     # Verify that the attraction has been updated.
     updated_attr = updated_parks[0]["attractions"][0]
@@ -53,13 +65,22 @@ def test_update_parks_live_data(monkeypatch):
     assert updated_attr["down_since"] == ""
 
 
-def test_live_data_updater(monkeypatch):
+def _cancel_sleep(monkeypatch, sleeps=None):
+    """Make the task loops stop after their first pass."""
+    async def cancel_sleep(delay):
+        if sleeps is not None:
+            sleeps.append(delay)
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr("updater.data_updater.asyncio.sleep", cancel_sleep)
+
+
+def test_live_data_poller(monkeypatch):
     """
-    Test live_data_updater by running it in a separate thread and forcing it to break out
-    after one iteration. We patch updater.data_updater.fetch_live_data to return updated live data,
-    and patch time.sleep along with fetch_parks_and_attractions to bypass real HTTP calls.
+    live_data_poller polls every park once on its first pass (new parks are due
+    immediately), merges the results and flags operating status without blocking.
     """
-    parks_data = []
+    parks_data = copy.deepcopy(DUMMY_PARKS)
 
     # Dummy live data to update the attraction.
     dummy_live_data = [{
@@ -68,40 +89,47 @@ def test_live_data_updater(monkeypatch):
         "status": "OPERATING",
         "lastUpdatedTs": "new_live"
     }]
+    sessions = []
+    status_calls = []
 
-    async def dummy_fetch_live_data(attractions):
+    async def dummy_fetch_live_data(attractions, session=None):
+        sessions.append(session)
         return dummy_live_data
 
-    # Patch fetch_live_data inside updater.data_updater.
-    monkeypatch.setattr("updater.data_updater.fetch_live_data", dummy_fetch_live_data)
-
-    # Patch fetch_parks_and_attractions to return the parks unchanged.
-    monkeypatch.setattr("updater.data_updater.fetch_parks_and_attractions", lambda parks: parks)
-
-    # Fake sleep function that raises KeyboardInterrupt to break the loop.
-    def fake_sleep(duration):
-        raise KeyboardInterrupt()
+    def recording_update(parks):
+        status_calls.append([park["id"] for park in parks])
+        return parks
 
-    # Patch time.sleep used by live_data_updater via updater.data_updater.
-    monkeypatch.setattr("updater.data_updater.time", type("t", (), {"sleep": fake_sleep}))
+    monkeypatch.setattr("updater.data_updater.fetch_live_data", dummy_fetch_live_data)
+    monkeypatch.setattr("updater.data_updater.update_parks_operating_status", recording_update)
+    _cancel_sleep(monkeypatch)
 
-    # Run live_data_updater in a thread. It takes parameters: (parks_list, update_interval, parks_data)
-    updater_thread = threading.Thread(
-        target=live_data_updater,
-        args=(copy.deepcopy(DUMMY_PARKS), 0, parks_data),
-        daemon=True
-    )
-    try:
-        updater_thread.start()
-        updater_thread.join(timeout=2)
-    except KeyboardInterrupt:
-        pass
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(live_data_poller(parks_data, 300, session="shared-session"))
 
-    # Check that parks_data has been updated. Expect at least one park.
-    assert len(parks_data) > 0
     updated_attr = parks_data[0]["attractions"][0]
     assert updated_attr["waitTime"] == 30
     assert updated_attr["lastUpdatedTs"] == "new_live"
+    assert sessions == ["shared-session"]
+    assert status_calls == [["park1"]]
+
+
+def test_live_data_poller_sleeps_until_next_slot(monkeypatch):
+    parks_data = copy.deepcopy(DUMMY_PARKS)
+    sleeps = []
+
+    async def dummy_fetch_live_data(attractions, session=None):
+        return attractions
+
+    monkeypatch.setattr("updater.data_updater.fetch_live_data", dummy_fetch_live_data)
+    monkeypatch.setattr("updater.data_updater.update_parks_operating_status", lambda parks: parks)
+    _cancel_sleep(monkeypatch, sleeps)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(live_data_poller(parks_data, 300, session=None))
+
+    # A single park's next slot is one full interval after its first poll.
+    assert 299 <= sleeps[0] <= 300
 
 
 def test_merge_live_data_updates_existing():
@@ -204,13 +232,13 @@ def test_update_parks_live_data_no_change(monkeypatch):
         "lastUpdatedTs": "old"
     }]
 
-    async def dummy_fetch_live_data(attractions):
+    async def dummy_fetch_live_data(attractions, session=None):
         return dummy_live_data
 
     monkeypatch.setattr("updater.data_updater.fetch_live_data", dummy_fetch_live_data)
 
     parks_copy = copy.deepcopy(DUMMY_PARKS)
-    updated_parks = update_parks_live_data(parks_copy)
+    updated_parks = asyncio.run(update_parks_live_data(parks_copy))
     # Verify that the attraction remains unchanged.
     updated_attr = updated_parks[0]["attractions"][0]
     assert updated_attr["waitTime"] == 10
@@ -259,13 +287,13 @@ def test_update_parks_live_data_multiple_attractions(monkeypatch):
         }
     ]
 
-    async def dummy_fetch_live_data(attractions):
+    async def dummy_fetch_live_data(attractions, session=None):
         return dummy_live_data
 
     monkeypatch.setattr("updater.data_updater.fetch_live_data", dummy_fetch_live_data)
 
     parks_copy = copy.deepcopy(parks)
-    updated_parks = update_parks_live_data(parks_copy)
+    updated_parks = asyncio.run(update_parks_live_data(parks_copy))
     attr1 = updated_parks[0]["attractions"][0]
     attr2 = updated_parks[0]["attractions"][1]
     assert attr1["waitTime"] == 12
@@ -296,113 +324,532 @@ def test_merge_live_data_no_change():
     assert result == existing
 
 
-def test_update_parks_live_data_websocket_skips_http_fetch(monkeypatch):
-    """When use_websocket=True, fetch_live_data must not be called."""
-    called = []
+def test_weather_refresher_refreshes_operating_parks_on_its_own_interval(monkeypatch):
+    refreshed = []
+    sleeps = []
+
+    async def fake_refresh(parks, session):
+        refreshed.append(([park["id"] for park in parks], session))
+        return 1
 
-    async def should_not_be_called(attractions):
-        called.append(True)
-        return []
+    monkeypatch.setattr("updater.data_updater.refresh_weather", fake_refresh)
+    _cancel_sleep(monkeypatch, sleeps)
+    parks = [
+        {"id": "p1", "name": "Open", "operating": True, "location": {"latitude": 1, "longitude": 2}},
+        {"id": "p2", "name": "Closed", "operating": False, "location": {"latitude": 3, "longitude": 4}},
+        {"id": "p3", "name": "Nowhere", "operating": True},
+    ]
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(weather_refresher(parks, "shared-session", interval=900))
+    assert refreshed == [(["p1"], "shared-session")]
+    assert sleeps == [900]
 
-    monkeypatch.setattr("updater.data_updater.fetch_live_data", should_not_be_called)
 
-    parks_copy = copy.deepcopy(DUMMY_PARKS)
-    update_parks_live_data(parks_copy, use_websocket=True)
+def test_bootstrap_parks_data_websocket_does_initial_fetch(monkeypatch):
+    """In websocket mode bootstrap performs exactly one REST live fetch per park."""
+    parks_data = []
+    fetch_call_count = []
+
+    async def counting_fetch(attractions, session=None):
+        fetch_call_count.append(1)
+        return attractions
+
+    monkeypatch.setattr("updater.data_updater.fetch_live_data", counting_fetch)
+    monkeypatch.setattr("updater.data_updater.fetch_park_and_attractions",
+                        lambda park_info: copy.deepcopy(DUMMY_PARKS[0]))
+    monkeypatch.setattr("updater.data_updater.update_parks_operating_status", lambda parks: parks)
 
-    assert called == [], "fetch_live_data should not be called when use_websocket=True"
+    asyncio.run(bootstrap_parks_data(DUMMY_PARKS, parks_data, session=None, use_websocket=True))
+
+    assert len(parks_data) == 1
+    assert len(fetch_call_count) == 1, "fetch_live_data should be called once for the initial fetch"
 
 
-def test_update_parks_live_data_no_websocket_calls_http_fetch(monkeypatch):
-    """When use_websocket=False (default), fetch_live_data must be called."""
-    called = []
+def test_bootstrap_parks_data_polling_mode_fetches_live_data_before_publishing(monkeypatch):
+    """Each park gets its first live fetch before it is published, so it can render straight away."""
+    parks_data = []
+    published_before_fetch = []
 
-    async def dummy_fetch_live_data(attractions):
-        called.append(True)
+    async def fetch(attractions, session=None):
+        published_before_fetch.append(len(parks_data))
         return attractions
 
-    monkeypatch.setattr("updater.data_updater.fetch_live_data", dummy_fetch_live_data)
+    monkeypatch.setattr("updater.data_updater.fetch_live_data", fetch)
+    monkeypatch.setattr("updater.data_updater.fetch_park_and_attractions",
+                        lambda park_info: copy.deepcopy(DUMMY_PARKS[0]))
+    monkeypatch.setattr("updater.data_updater.update_parks_operating_status", lambda parks: parks)
 
-    parks_copy = copy.deepcopy(DUMMY_PARKS)
-    update_parks_live_data(parks_copy, use_websocket=False)
+    fetched_ids = asyncio.run(bootstrap_parks_data(DUMMY_PARKS, parks_data, session=None, use_websocket=False))
 
-    assert called == [True], "fetch_live_data should be called when use_websocket=False"
+    assert len(parks_data) == 1
+    assert published_before_fetch == [0]
+    assert fetched_ids == ["park1"]
 
 
-def test_live_data_updater_websocket_does_initial_fetch_then_skips_polling(monkeypatch):
-    """
-    live_data_updater with use_websocket=True must call fetch_live_data once for the
-    initial population, then skip it in the polling loop.
-    """
+def test_bootstrap_fetches_weather_on_the_shared_session_before_publishing(monkeypatch):
     parks_data = []
-    fetch_call_count = []
+    refreshed = []
 
-    async def counting_fetch(attractions):
-        fetch_call_count.append(1)
+    async def fake_refresh(parks, session):
+        refreshed.append(([park["id"] for park in parks], session, len(parks_data)))
+        parks[0]["weather"] = {"temperature": "80°"}
+        return 1
+
+    async def fetch(attractions, session=None):
         return attractions
 
-    monkeypatch.setattr("updater.data_updater.fetch_live_data", counting_fetch)
-    monkeypatch.setattr("updater.data_updater.fetch_parks_and_attractions", lambda parks: copy.deepcopy(DUMMY_PARKS))
+    monkeypatch.setattr("updater.data_updater.refresh_weather", fake_refresh)
+    monkeypatch.setattr("updater.data_updater.fetch_live_data", fetch)
+    monkeypatch.setattr("updater.data_updater.fetch_park_and_attractions",
+                        lambda park_info: copy.deepcopy(DUMMY_PARKS[0]))
     monkeypatch.setattr("updater.data_updater.update_parks_operating_status", lambda parks: parks)
 
-    loop_iterations = []
+    asyncio.run(bootstrap_parks_data(DUMMY_PARKS, parks_data, session="shared-session"))
 
-    def fake_sleep(duration):
-        loop_iterations.append(1)
-        raise KeyboardInterrupt()
+    assert refreshed == [(["park1"], "shared-session", 0)]
+    assert parks_data[0]["weather"] == {"temperature": "80°"}
 
-    monkeypatch.setattr("updater.data_updater.time", type("t", (), {"sleep": fake_sleep}))
 
-    updater_thread = threading.Thread(
-        target=live_data_updater,
-        args=(copy.deepcopy(DUMMY_PARKS), 0, parks_data),
-        kwargs={"use_websocket": True},
-        daemon=True,
-    )
-    try:
-        updater_thread.start()
-        updater_thread.join(timeout=2)
-    except KeyboardInterrupt:
-        pass
+def test_bootstrap_continues_when_weather_fails(monkeypatch):
+    parks_data = []
 
-    # fetch_live_data called exactly once (initial fetch), not again in the loop
-    assert len(fetch_call_count) == 1, "fetch_live_data should be called once for the initial fetch"
-    assert loop_iterations == [1], "polling loop should have run once then stopped"
+    async def broken_refresh(parks, session):
+        raise ValueError("bad weather payload")
 
+    async def fetch(attractions, session=None):
+        return attractions
 
-def test_live_data_updater_websocket_loop_updates_operating_status(monkeypatch):
-    """
-    In websocket mode the polling loop must still call update_parks_operating_status
-    (with schedule fetching enabled) so schedule refreshes deferred by the WS thread
-    via 'schedule_refresh_needed' get serviced.
-    """
+    monkeypatch.setattr("updater.data_updater.refresh_weather", broken_refresh)
+    monkeypatch.setattr("updater.data_updater.fetch_live_data", fetch)
+    monkeypatch.setattr("updater.data_updater.fetch_park_and_attractions",
+                        lambda park_info: copy.deepcopy(DUMMY_PARKS[0]))
+    monkeypatch.setattr("updater.data_updater.update_parks_operating_status", lambda parks: parks)
+
+    fetched_ids = asyncio.run(bootstrap_parks_data(DUMMY_PARKS, parks_data, session=None))
+
+    assert fetched_ids == ["park1"]
+    assert [park["id"] for park in parks_data] == ["park1"]
+
+
+def test_bootstrap_publishes_each_park_as_soon_as_it_is_ready(monkeypatch):
+    """The first park is visible in parks_data while the second is still loading."""
+    park_list = [{"id": "mk", "name": "MK"}, {"id": "ep", "name": "EPCOT"}]
     parks_data = []
-    status_calls = []
+    visible_while_fetching = {}
 
-    async def dummy_fetch(attractions):
+    def fetch_park(park_info):
+        visible_while_fetching[park_info["id"]] = [park["id"] for park in parks_data]
+        if park_info["id"] == "ep":
+            return None  # roster fetch failed
+        return {"id": park_info["id"], "name": park_info["name"], "attractions": [{"id": "a", "name": "Ride", "status": ""}]}
+
+    async def fetch(attractions, session=None):
         return attractions
 
-    def recording_update(parks, fetch_schedules=True):
-        status_calls.append(fetch_schedules)
-        return parks
+    monkeypatch.setattr("updater.data_updater.fetch_park_and_attractions", fetch_park)
+    monkeypatch.setattr("updater.data_updater.fetch_live_data", fetch)
 
-    monkeypatch.setattr("updater.data_updater.fetch_live_data", dummy_fetch)
-    monkeypatch.setattr("updater.data_updater.fetch_parks_and_attractions", lambda parks: copy.deepcopy(DUMMY_PARKS))
-    monkeypatch.setattr("updater.data_updater.update_parks_operating_status", recording_update)
+    fetched_ids = asyncio.run(bootstrap_parks_data(park_list, parks_data, session=None))
+
+    assert visible_while_fetching == {"mk": [], "ep": ["mk"]}
+    assert [park["id"] for park in parks_data] == ["mk"]
+    assert fetched_ids == ["mk"]
+
+
+def test_publish_park_replaces_by_id_and_keeps_configured_order():
+    order = {"mk": 0, "ep": 1, "hs": 2}
+    parks_data = [{"id": "ep", "stale": True}]
+    publish_park(parks_data, {"id": "hs"}, order)
+    publish_park(parks_data, {"id": "mk"}, order)
+    publish_park(parks_data, {"id": "ep"}, order)
+    assert parks_data == [{"id": "mk"}, {"id": "ep"}, {"id": "hs"}]
+
+
+def test_live_data_poller_waits_for_slot_after_bootstrap_fetch(monkeypatch):
+    """Parks bootstrap just fetched are not polled again on the poller's first pass."""
+    parks_data = copy.deepcopy(DUMMY_PARKS)
+    fetched = []
+
+    async def fetch(attractions, session=None):
+        fetched.append(1)
+        return attractions
+
+    monkeypatch.setattr("updater.data_updater.fetch_live_data", fetch)
+    _cancel_sleep(monkeypatch)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(live_data_poller(parks_data, 300, session=None, polled_ids=["park1"]))
+
+    assert fetched == []
+
+
+def test_schedule_refresher_services_deferred_flag(monkeypatch):
+    """
+    Parks flagged 'schedule_refresh_needed' (by the WS handler or the poller) get
+    their schedule and roster refreshed, and the flag is cleared.
+    """
+    parks_data = [{
+        "id": "park1", "name": "Fantasy Land", "schedule": [], "schedule_refresh_needed": True,
+        "attractions": [{"id": "1", "name": "Old", "waitTime": 10, "status": "OPERATING"}],
+    }, {
+        "id": "park2", "name": "Untouched", "schedule": [], "attractions": [],
+    }]
+    fetched = []
+
+    def fake_schedule(park_id):
+        fetched.append(park_id)
+        return [{"type": "OPERATING", "openingTime": "09:00", "closingTime": "22:00"}]
 
-    def fake_sleep(duration):
-        raise KeyboardInterrupt()
+    monkeypatch.setattr("updater.data_updater.fetch_park_schedule", fake_schedule)
+    monkeypatch.setattr("updater.data_updater.fetch_park_children",
+                        lambda park: [{"id": "1", "name": "New", "entityType": "ATTRACTION"}])
+    _cancel_sleep(monkeypatch)
 
-    monkeypatch.setattr("updater.data_updater.time", type("t", (), {"sleep": fake_sleep}))
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(schedule_refresher(parks_data))
 
-    updater_thread = threading.Thread(
-        target=live_data_updater,
-        args=(copy.deepcopy(DUMMY_PARKS), 0, parks_data),
-        kwargs={"use_websocket": True},
-        daemon=True,
-    )
-    updater_thread.start()
-    updater_thread.join(timeout=2)
+    assert fetched == ["park1"]
+    assert parks_data[0]["schedule_refresh_needed"] is False
+    assert parks_data[0]["openingTime"] == "09:00"
+    assert parks_data[0]["attractions"][0]["name"] == "New"
 
-    # One call from the initial fetch, one from the loop iteration — both with
-    # schedule fetching enabled (the REST thread is where blocking HTTP belongs).
-    assert status_calls == [True, True]
\ No newline at end of file
+
+def test_schedule_refresher_keeps_roster_when_children_fetch_fails(monkeypatch):
+    parks_data = [{
+        "id": "park1", "name": "Fantasy Land", "schedule": [], "schedule_refresh_needed": True,
+        "attractions": [{"id": "1", "name": "Old", "waitTime": 10, "status": "OPERATING"}],
+    }]
+    monkeypatch.setattr("updater.data_updater.fetch_park_schedule", lambda park_id: [])
+    monkeypatch.setattr("updater.data_updater.fetch_park_children", lambda park: None)
+    _cancel_sleep(monkeypatch)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(schedule_refresher(parks_data))
+
+    assert parks_data[0]["attractions"][0]["name"] == "Old"
+    assert parks_data[0]["schedule_refresh_needed"] is False
+
+
+@pytest.fixture
+def bandwidth_exhausted():
+    bandwidth.reset()
+    bandwidth.configure(1000)
+    bandwidth.record("live", 2000)
+    yield
+    bandwidth.configure(0)
+    bandwidth.reset()
+
+
+def test_weather_refresher_skips_when_bandwidth_short(monkeypatch, bandwidth_exhausted):
+    parks_data = [{"id": "park1", "name": "MK", "operating": True, "location": {"latitude": 1, "longitude": 2}}]
+    sleeps = []
+    async def fail_refresh(parks, session):
+        pytest.fail("weather fetched")
+
+    monkeypatch.setattr("updater.data_updater.refresh_weather", fail_refresh)
+    _cancel_sleep(monkeypatch, sleeps)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(weather_refresher(parks_data, None, interval=300))
+
+    assert "weather" not in parks_data[0]
+    # Over budget the interval is stretched fourfold.
+    assert 1199 <= sleeps[0] <= 1200
+
+
+def test_schedule_refresher_skips_roster_when_bandwidth_short(monkeypatch, bandwidth_exhausted):
+    parks_data = [{
+        "id": "park1", "name": "Fantasy Land", "schedule": [], "schedule_refresh_needed": True,
+        "attractions": [{"id": "1", "name": "Old", "waitTime": 10, "status": "OPERATING"}],
+    }]
+    monkeypatch.setattr("updater.data_updater.fetch_park_schedule", lambda park_id: [])
+    monkeypatch.setattr("updater.data_updater.fetch_park_children", lambda park: pytest.fail("roster fetched"))
+    _cancel_sleep(monkeypatch)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(schedule_refresher(parks_data))
+
+    assert parks_data[0]["attractions"][0]["name"] == "Old"
+    assert parks_data[0]["schedule_refresh_needed"] is False
+
+
+def test_schedule_refresher_refreshes_roster_only_on_demand(monkeypatch):
+    now = time.time()
+    parks_data = [{
+        "id": "park1", "name": "Fresh", "roster_refreshed_at": now, "attractions": [],
+    }, {
+        "id": "park2", "name": "Unknown ride seen", "roster_refreshed_at": now - 3600,
+        "roster_refresh_needed": True, "attractions": [],
+    }]
+    fetched = []
+
+    def fake_children(park):
+        fetched.append(park["id"])
+        return [{"id": "new", "name": "New Ride", "entityType": "ATTRACTION"}]
+
+    monkeypatch.setattr("updater.data_updater.fetch_park_children", fake_children)
+    _cancel_sleep(monkeypatch)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(schedule_refresher(parks_data))
+
+    assert fetched == ["park2"]
+    assert [a["id"] for a in parks_data[1]["attractions"]] == ["new"]
+    assert parks_data[1]["roster_refresh_needed"] is False
+    assert parks_data[1]["roster_refreshed_at"] >= now
+
+
+def _closed_park(opening):
+    closing = opening + timedelta(hours=10)
+    return {
+        "id": "park1", "name": "MK", "operating": False,
+        "location": {"latitude": 1, "longitude": 2},
+        "roster_refreshed_at": time.time(),
+        "attractions": [{"id": "1", "name": "Ride", "waitTime": "", "status": "CLOSED", "lastUpdatedTs": ""}],
+        "schedule": [{"type": "OPERATING", "openingTime": opening.isoformat(), "closingTime": closing.isoformat()}],
+    }
+
+
+def test_next_opening_skips_closed_windows():
+    now = datetime(2025, 5, 10, 12, tzinfo=timezone.utc)
+    park = {"schedule": [
+        {"type": "OPERATING", "openingTime": "2025-05-09T09:00:00+00:00", "closingTime": "2025-05-09T22:00:00+00:00"},
+        {"type": "OPERATING", "openingTime": "2025-05-11T09:00:00+00:00", "closingTime": "2025-05-11T22:00:00+00:00"},
+    ]}
+    assert next_opening(park, now) == datetime(2025, 5, 11, 9, tzinfo=timezone.utc)
+    assert next_opening({"schedule": []}, now) is None
+
+
+def _patch_prefetch(monkeypatch, calls, schedule):
+    monkeypatch.setattr("updater.data_updater.fetch_park_schedule",
+                        lambda park_id: calls.append("schedule") or schedule)
+    async def fake_refresh(parks, session):
+        calls.append("weather")
+        for park in parks:
+            park["weather"] = {"temperature": "80°"}
+        return 1
+
+    monkeypatch.setattr("updater.data_updater.refresh_weather", fake_refresh)
+
+    async def fake_live(session, park):
+        calls.append("live")
+        return [{"id": "1", "waitTime": 5, "status": "OPERATING", "lastUpdatedTs": "new"}]
+
+    monkeypatch.setattr("updater.data_updater.fetch_park_live_data", fake_live)
+
+
+def test_opening_prefetcher_warms_park_once_before_opening(monkeypatch):
+    park = _closed_park(datetime.now(timezone.utc) + timedelta(minutes=3))
+    calls = []
+    _patch_prefetch(monkeypatch, calls, park["schedule"])
+    passes = []
+
+    async def two_passes(delay):
+        passes.append(delay)
+        if len(passes) == 2:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr("updater.data_updater.asyncio.sleep", two_passes)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(opening_prefetcher([park], session=None))
+
+    # Roster is fresh, so only schedule, weather and a live snapshot, and only once.
+    assert calls == ["schedule", "weather", "live"]
+    assert park["weather"] == {"temperature": "80°"}
+    assert park["attractions"][0]["waitTime"] == 5
+    assert park["prefetched_for"]
+
+
+def test_failed_prefetch_leaves_opening_schedule_refresh_in_place(monkeypatch):
+    park = _closed_park(datetime.now(timezone.utc) + timedelta(minutes=3))
+    calls = []
+    _patch_prefetch(monkeypatch, calls, [])    # schedule fetch failed
+    passes = []
+
+    async def two_passes(delay):
+        passes.append(delay)
+        if len(passes) == 2:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr("updater.data_updater.asyncio.sleep", two_passes)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(opening_prefetcher([park], session=None))
+
+    # Not marked, so it is retried on the next check and the opening refresh still happens.
+    assert calls.count("schedule") == 2
+    assert "prefetched_for" not in park
+
+
+def test_opening_prefetcher_waits_until_lead_time(monkeypatch):
+    park = _closed_park(datetime.now(timezone.utc) + timedelta(hours=2))
+    calls = []
+    _patch_prefetch(monkeypatch, calls, park["schedule"])
+    _cancel_sleep(monkeypatch)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(opening_prefetcher([park], session=None))
+
+    assert calls == []
+    assert "prefetched_for" not in park
+
+
+def test_schedule_transitions_closes_park_at_boundary(monkeypatch):
+    now = time.time()
+    park = {"id": "park1", "name": "MK", "operating": True, "openingEpoch": now - 3600, "closingEpoch": now + 0.01,
+            "attractions": [{"id": "1", "name": "Ride", "waitTime": 10, "status": "OPERATING"}]}
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        if len(sleeps) == 2:
+            raise asyncio.CancelledError
+        time.sleep(delay)
+
+    monkeypatch.setattr("updater.data_updater.asyncio.sleep", fake_sleep)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(schedule_transitions([park]))
+
+    # Slept only until the closing timer, then flipped the park without re-parsing anything.
+    assert sleeps[0] <= 0.01
+    assert park["operating"] is False
+
+
+def test_merge_live_data_carries_epochs():
+    existing = [{"id": "1", "waitTime": 10, "status": "OPERATING", "down_since": "", "lastUpdatedTs": "old"}]
+    merged = merge_live_data(existing, [{
+        "id": "1", "waitTime": None, "status": "DOWN",
+        "lastUpdatedTs": "2025-05-10T16:11:00Z", "lastUpdatedEpoch": 1746893460.0,
+    }])
+    assert merged[0]["lastUpdatedEpoch"] == 1746893460.0
+    assert merged[0]["down_since_epoch"] == 1746893460.0
+
+    merged = merge_live_data(merged, [{
+        "id": "1", "waitTime": 5, "status": "OPERATING",
+        "lastUpdatedTs": "2025-05-10T16:30:00Z", "lastUpdatedEpoch": 1746894600.0,
+    }])
+    assert "down_since_epoch" not in merged[0]
+
+
+def test_bootstrap_restores_checkpointed_state_until_live_data_arrives(monkeypatch):
+    """A stale checkpoint's live fields and down_since survive the fresh roster fetch."""
+    parks_data = copy.deepcopy(DUMMY_PARKS)
+    checkpointed = parks_data[0]["attractions"][0]
+    checkpointed.update({"status": "DOWN", "waitTime": None, "down_since": "2025-05-10T12:00:00Z",
+                         "down_since_epoch": 1746878400.0})
+    parks_data[0].update({"stale": True, "operating": True})
+
+    seen_before_live_fetch = []
+
+    async def still_down(attractions, session=None):
+        seen_before_live_fetch.append(dict(attractions[0]))
+        return [dict(a, lastUpdatedTs="2025-05-10T12:30:00Z") for a in attractions]
+
+    monkeypatch.setattr("updater.data_updater.fetch_park_and_attractions",
+                        lambda park_info: copy.deepcopy(DUMMY_PARKS[0]))
+    monkeypatch.setattr("updater.data_updater.fetch_live_data", still_down)
+    monkeypatch.setattr("updater.data_updater.update_parks_operating_status", lambda parks: parks)
+    asyncio.run(bootstrap_parks_data(DUMMY_PARKS, parks_data, session=None, use_websocket=False))
+
+    assert seen_before_live_fetch[0]["status"] == "DOWN"
+    park = parks_data[0]
+    assert "stale" not in park and park["operating"] is True
+    assert park["attractions"][0]["down_since"] == "2025-05-10T12:00:00Z"
+
+
+def test_live_data_poller_suspended_while_offline(monkeypatch):
+    """Offline, the poller doesn't touch the network and sleeps until the next probe."""
+    connectivity.reset()
+    for _ in range(connectivity.FAILURES_BEFORE_OFFLINE):
+        connectivity.record_failure("unreachable")
+    parks_data = copy.deepcopy(DUMMY_PARKS)
+    sleeps = []
+
+    async def fetch(attractions, session=None):
+        pytest.fail("polled while offline")
+
+    monkeypatch.setattr("updater.data_updater.fetch_live_data", fetch)
+    _cancel_sleep(monkeypatch, sleeps)
+    try:
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(live_data_poller(parks_data, 300, session=None))
+    finally:
+        connectivity.reset()
+
+    assert 0 < sleeps[0] <= connectivity.BACKOFF_INITIAL_SECS
+
+
+class _LiveResponse:
+    def __init__(self, payload, status=200):
+        self.status = status
+        self._payload = payload
+        self.headers = {}
+
+    async def json(self):
+        return self._payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+class _LiveSession:
+    """Serves /entity/<id>/live from a dict of attraction id -> liveData entry; other ids fail."""
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def get(self, url, **kwargs):
+        attraction_id = url.rsplit("/", 2)[-2]
+        if attraction_id not in self.entries:
+            return _LiveResponse({}, status=503)
+        return _LiveResponse({"liveData": [self.entries[attraction_id]]})
+
+
+def test_rest_poll_stamps_display_changes_for_latency():
+    from utils import latency
+    latency.reset()
+    park = {"id": "park1", "name": "Fantasy Land", "attractions": [
+        {"id": "1", "name": "Steady", "waitTime": 10, "status": "OPERATING", "down_since": "",
+         "lastUpdatedTs": "2025-05-10T16:01:00Z"},
+        {"id": "2", "name": "Breaks", "waitTime": 30, "status": "OPERATING", "down_since": "",
+         "lastUpdatedTs": "2025-05-10T16:01:00Z"},
+    ]}
+    session = _LiveSession({
+        "1": {"status": "OPERATING", "lastUpdated": "2025-05-10T16:11:00Z", "queue": {"STANDBY": {"waitTime": 10}}},
+        "2": {"status": "DOWN", "lastUpdated": "2025-05-10T16:11:00Z", "queue": {}},
+    })
+    try:
+        asyncio.run(update_parks_live_data([park], session))
+
+        assert park["attractions"][1]["status"] == "DOWN"
+        assert latency.stats["changes"] == 1
+        assert latency.note_rendered("1") is None
+        assert latency.note_rendered("2") is not None
+    finally:
+        latency.reset()
+    existing = [{"id": "1", "waitTime": 10, "status": "OPERATING", "down_since": "", "lastUpdatedTs": "old"},
+                {"id": "2", "waitTime": 5, "status": "OPERATING", "down_since": "", "lastUpdatedTs": "old"}]
+    new_live = [{"id": "1", "waitTime": 10, "status": "OPERATING", "lastUpdatedTs": "new"},
+                {"id": "2", "waitTime": 25, "status": "OPERATING", "lastUpdatedTs": "new"}]
+    merge_live_data(existing, new_live)
+    assert latency.note_rendered("1") is None
+    assert latency.note_rendered("2") is not None
+    latency.reset()
+
+
+def test_park_stays_stale_until_a_live_response_arrives():
+    park = {"id": "park1", "name": "Fantasy Land", "stale": True, "attractions": [
+        {"id": "1", "name": "Steady", "waitTime": 10, "status": "OPERATING", "down_since": "",
+         "lastUpdatedTs": "2025-05-10T16:01:00Z"},
+    ]}
+    asyncio.run(update_parks_live_data([park], _LiveSession({})))
+    assert park["stale"] is True
+
+    live = {"1": {"status": "OPERATING", "lastUpdated": "2025-05-10T16:11:00Z", "queue": {"STANDBY": {"waitTime": 10}}}}
+    asyncio.run(update_parks_live_data([park], _LiveSession(live)))
+    assert "stale" not in park
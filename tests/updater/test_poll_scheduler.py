@@ -0,0 +1,116 @@
+from updater.poll_scheduler import ParkPollScheduler
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _scheduler(interval=300, parks=("a", "b", "c", "d")):
+    clock = FakeClock()
+    scheduler = ParkPollScheduler(interval, clock=clock)
+    scheduler.sync(list(parks))
+    return scheduler, clock
+
+
+def _poll_all_due(scheduler):
+    due = scheduler.due_parks()
+    for park_id in due:
+        scheduler.mark_polled(park_id)
+    return due
+
+
+def test_new_parks_are_due_immediately():
+    scheduler, _ = _scheduler()
+    assert scheduler.due_parks() == ["a", "b", "c", "d"]
+
+
+def test_parks_settle_into_even_phases_after_first_poll():
+    scheduler, clock = _scheduler()
+    _poll_all_due(scheduler)
+
+    polled_at = {}
+    for second in range(1, 1200):
+        clock.now = second
+        for park_id in _poll_all_due(scheduler):
+            polled_at.setdefault(park_id, []).append(second)
+
+    # Phases are 0/75/150/225 within each 300s cycle; the first slot is at
+    # least half an interval after the startup poll.
+    assert polled_at["c"][:2] == [150, 450]
+    assert polled_at["d"][:2] == [225, 525]
+    assert polled_at["b"][:2] == [375, 675]
+    assert polled_at["a"][:2] == [300, 600]
+
+
+def test_never_more_than_one_park_due_per_slot_in_steady_state():
+    scheduler, clock = _scheduler()
+    _poll_all_due(scheduler)
+    for second in range(1, 1500):
+        clock.now = second
+        assert len(_poll_all_due(scheduler)) <= 1
+
+
+def test_seconds_until_next():
+    scheduler, clock = _scheduler()
+    assert scheduler.seconds_until_next() == 0
+    _poll_all_due(scheduler)
+    assert scheduler.seconds_until_next() == 150
+    clock.now = 100
+    assert scheduler.seconds_until_next() == 50
+
+
+def test_seconds_until_next_without_parks_is_interval():
+    scheduler = ParkPollScheduler(300, clock=FakeClock())
+    assert scheduler.seconds_until_next() == 300
+
+
+def test_added_park_is_due_immediately_and_phases_respread():
+    scheduler, clock = _scheduler(parks=("a", "b"))
+    _poll_all_due(scheduler)
+    clock.now = 10
+    scheduler.sync(["a", "b", "c"])
+    assert scheduler.due_parks() == ["c"]
+    scheduler.mark_polled("c")
+    # b moved from phase 150 to phase 100; 100 is less than half an interval
+    # after its last poll at t=0, so it skips ahead to the next cycle's slot.
+    clock.now = 200
+    assert scheduler.due_parks() == ["c"]
+    scheduler.mark_polled("c")
+    clock.now = 399
+    assert scheduler.due_parks() == ["a"]
+    scheduler.mark_polled("a")
+    clock.now = 400
+    assert scheduler.due_parks() == ["b"]
+
+
+def test_removed_park_is_dropped():
+    scheduler, clock = _scheduler()
+    _poll_all_due(scheduler)
+    scheduler.sync(["a", "b"])
+    for second in range(0, 900):
+        clock.now = second
+        assert "c" not in _poll_all_due(scheduler)
+        assert "d" not in scheduler.due_parks()
+
+
+def test_mark_polled_ignores_unknown_park():
+    scheduler, _ = _scheduler(parks=("a",))
+    scheduler.mark_polled("zzz")
+    assert scheduler.due_parks() == ["a"]
+
+
+def test_set_interval_stretches_cycle_from_last_poll():
+    scheduler, clock = _scheduler(parks=("a", "b"))
+    _poll_all_due(scheduler)
+    scheduler.set_interval(600)
+    # b's phase moves to 300; a's next slot is a full 600s cycle away.
+    clock.now = 299
+    assert scheduler.due_parks() == []
+    clock.now = 300
+    assert scheduler.due_parks() == ["b"]
+    clock.now = 600
+    assert scheduler.due_parks() == ["a", "b"]
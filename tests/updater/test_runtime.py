@@ -0,0 +1,120 @@
+import asyncio
+
+from updater import runtime
+
+
+class _FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+def _patch_tasks(monkeypatch, started):
+    async def fake_bootstrap(disney_park_list, parks_data, session, use_websocket=False):
+        started.append(("bootstrap", use_websocket))
+        parks_data[:] = [{"id": "park1", "name": "MK"}]
+
+    def recorder(name):
+        async def task(*args, **kwargs):
+            started.append(name)
+        return task
+
+    monkeypatch.setattr(runtime, "create_client_session", _FakeSession)
+    monkeypatch.setattr(runtime, "bootstrap_parks_data", fake_bootstrap)
+    monkeypatch.setattr(runtime, "weather_refresher", recorder("weather"))
+    monkeypatch.setattr(runtime, "schedule_refresher", recorder("schedule"))
+    monkeypatch.setattr(runtime, "traffic_reporter", recorder("traffic"))
+    monkeypatch.setattr(runtime, "opening_prefetcher", recorder("prefetch"))
+    monkeypatch.setattr(runtime, "schedule_transitions", recorder("transitions"))
+    monkeypatch.setattr(runtime, "live_data_poller", recorder("poller"))
+    monkeypatch.setattr(runtime, "websocket_live_updater", recorder("websocket"))
+    monkeypatch.setattr(runtime, "ws_state_auditor", recorder("auditor"))
+    monkeypatch.setattr(runtime, "checkpoint_writer", recorder("checkpoint"))
+
+
+def test_polling_mode_runs_poller_weather_and_schedule_tasks(monkeypatch):
+    started = []
+    _patch_tasks(monkeypatch, started)
+    parks_data = []
+    asyncio.run(runtime.run_updaters([], 300, parks_data))
+    assert started[0] == ("bootstrap", False)
+    assert sorted(started[1:]) == ["poller", "prefetch", "schedule", "traffic", "transitions", "weather"]
+    assert parks_data == [{"id": "park1", "name": "MK"}]
+
+
+def test_websocket_mode_replaces_poller_with_websocket_task(monkeypatch):
+    started = []
+    _patch_tasks(monkeypatch, started)
+    asyncio.run(runtime.run_updaters([], 300, [], api_key="key", use_websocket=True))
+    assert started[0] == ("bootstrap", True)
+    assert sorted(started[1:]) == ["auditor", "prefetch", "schedule", "traffic", "transitions", "weather", "websocket"]
+
+
+def test_live_updates_runtime_runs_on_one_loop_with_single_io_worker(monkeypatch):
+    seen = {}
+
+    async def fake_run_updaters(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        seen["workers"] = loop._default_executor._max_workers
+        seen["kwargs"] = kwargs
+
+    monkeypatch.setattr(runtime, "run_updaters", fake_run_updaters)
+    runtime.live_updates_runtime([], 300, [], api_key="key", use_websocket=True)
+    assert seen["workers"] == 1
+    assert seen["kwargs"] == {"api_key": "key", "use_websocket": True, "websocket_connections": 1,
+                              "checkpoint_interval": 0, "park_names": None}
+
+
+def test_websocket_connections_passed_to_websocket_task(monkeypatch):
+    started = []
+    _patch_tasks(monkeypatch, started)
+
+    async def fake_websocket(api_key, parks_data, session, connections=1):
+        started.append(("websocket", connections, type(session)))
+
+    monkeypatch.setattr(runtime, "websocket_live_updater", fake_websocket)
+    asyncio.run(runtime.run_updaters([], 300, [], api_key="key", use_websocket=True, websocket_connections=3))
+    assert ("websocket", 3, _FakeSession) in started
+
+
+def test_checkpoint_writer_runs_only_when_interval_set(monkeypatch):
+    started = []
+    _patch_tasks(monkeypatch, started)
+    asyncio.run(runtime.run_updaters([], 300, [], checkpoint_interval=60))
+    assert "checkpoint" in started
+
+
+def test_warm_start_resolves_parks_on_the_loop_and_drops_unconfigured_ones(monkeypatch):
+    started = []
+    _patch_tasks(monkeypatch, started)
+    resolved = []
+
+    async def fake_bootstrap(disney_park_list, parks_data, session, use_websocket=False):
+        resolved.append(disney_park_list)
+
+    monkeypatch.setattr(runtime, "bootstrap_parks_data", fake_bootstrap)
+    monkeypatch.setattr(runtime, "resolve_parks_from_config", lambda names: [{"id": "park1", "name": "MK"}])
+    parks_data = [{"id": "park1", "name": "MK", "stale": True}, {"id": "old", "name": "Gone", "stale": True}]
+    asyncio.run(runtime.run_updaters(None, 300, parks_data, park_names=["MK"]))
+
+    assert resolved == [[{"id": "park1", "name": "MK"}]]
+    assert [park["id"] for park in parks_data] == ["park1"]
+
+
+def test_offline_warm_start_runs_on_the_checkpointed_parks(monkeypatch):
+    started = []
+    _patch_tasks(monkeypatch, started)
+    resolved = []
+
+    async def fake_bootstrap(disney_park_list, parks_data, session, use_websocket=False):
+        resolved.append([park["id"] for park in disney_park_list])
+
+    monkeypatch.setattr(runtime, "bootstrap_parks_data", fake_bootstrap)
+    monkeypatch.setattr(runtime, "resolve_parks_from_config", lambda names: [])
+    parks_data = [{"id": "park1", "name": "MK", "stale": True}]
+    asyncio.run(runtime.run_updaters(None, 300, parks_data, park_names=["MK"]))
+
+    assert resolved == [["park1"]]
+    assert parks_data[0]["stale"] is True
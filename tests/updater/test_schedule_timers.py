@@ -0,0 +1,53 @@
+from updater.schedule_timers import CLOSING, OPENING, ScheduleTimers
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _park(park_id, opening, closing):
+    return {"id": park_id, "openingEpoch": opening, "closingEpoch": closing}
+
+
+def test_fires_opening_then_closing_in_order():
+    clock = FakeClock(100)
+    timers = ScheduleTimers(clock=clock)
+    timers.sync([_park("a", 200, 900), _park("b", 150, 800)])
+
+    assert timers.due() == []
+    assert timers.seconds_until_next() == 50
+    clock.now = 200
+    assert timers.due() == [("b", OPENING), ("a", OPENING)]
+    clock.now = 1000
+    assert timers.due() == [("b", CLOSING), ("a", CLOSING)]
+    assert timers.seconds_until_next() is None
+
+
+def test_past_boundaries_are_not_armed():
+    timers = ScheduleTimers(clock=FakeClock(500))
+    timers.sync([_park("a", 200, 900), _park("b", None, None)])
+    assert timers.due(now=1000) == [("a", CLOSING)]
+
+
+def test_changed_schedule_rearms_and_drops_stale_timers():
+    clock = FakeClock(0)
+    timers = ScheduleTimers(clock=clock)
+    park = _park("a", 100, 500)
+    timers.sync([park])
+    park["closingEpoch"] = 700
+    timers.sync([park])
+
+    assert timers.due(now=600) == [("a", OPENING)]
+    assert timers.due(now=700) == [("a", CLOSING)]
+
+
+def test_removed_park_timers_are_dropped():
+    timers = ScheduleTimers(clock=FakeClock(0))
+    timers.sync([_park("a", 100, 500)])
+    timers.sync([])
+    assert timers.seconds_until_next() is None
+    assert timers.due(now=1000) == []
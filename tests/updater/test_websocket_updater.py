@@ -1,17 +1,31 @@
 import asyncio
 import copy
+import time
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
 import pytest
 
+from updater import websocket_updater
 from updater.websocket_updater import (
     _RECONNECT_DELAY_INITIAL,
     _RECONNECT_DELAY_MAX,
+    _RECONNECT_REFRESH_GAP_SECS,
     _WS_HEARTBEAT_SECS,
     _WS_RECEIVE_TIMEOUT_SECS,
     _apply_live_update,
+    _audit_park,
+    _destination_should_stream,
+    _next_stream_start,
+    _shard_destinations,
+    _sync_subscriptions,
+    _find_drift,
     _next_delay,
+    _parks_needing_refresh,
+    _refresh_parks_after_reconnect,
     _ws_loop,
+    websocket_live_updater,
+    ws_state_auditor,
 )
 
 DUMMY_ATTRACTION = {
@@ -90,7 +104,7 @@ def test_operating_status_updated_on_status_change():
     msg = _make_livedata_msg(data={"status": "OPERATING", "queue": {"STANDBY": {"waitTime": 10}}})
     with patch("updater.websocket_updater.update_parks_operating_status") as mock_update:
         _apply_live_update(msg, parks)
-    mock_update.assert_called_once_with([parks[0]], fetch_schedules=False)
+    mock_update.assert_called_once_with([parks[0]])
 
 
 def test_operating_status_not_updated_when_status_unchanged():
@@ -145,30 +159,40 @@ def test_down_status_preserves_existing_down_since():
     assert parks[0]["attractions"][0]["down_since"] == "2026-01-01T00:00:00Z"
 
 
-def test_down_wait_time_uses_down_since_not_current_time():
-    """down_since set 30 min ago — waitTime should reflect ~30 min, not 0."""
+def test_down_keeps_existing_down_since():
+    """Already DOWN: down_since is kept so the render-time duration keeps counting."""
     from datetime import datetime, timezone, timedelta
     down_since = (datetime.now(timezone.utc) - timedelta(minutes=30)).strftime("%Y-%m-%dT%H:%M:%SZ")
     parks = _parks_with_attr({"status": "DOWN", "down_since": down_since})
     msg = _make_livedata_msg(data={"status": "DOWN", "queue": {"STANDBY": {"waitTime": None}}})
     with patch("updater.websocket_updater.update_parks_operating_status"):
         _apply_live_update(msg, parks)
-    wait = parks[0]["attractions"][0]["waitTime"]
-    assert wait.startswith("Down ")
-    minutes = int(wait.split(" ")[1])
-    assert 28 <= minutes <= 32  # allow a couple seconds of drift
+    attr = parks[0]["attractions"][0]
+    assert attr["down_since"] == down_since
+    assert attr["waitTime"] is None
 
 
-def test_down_wait_time_is_zero_on_first_down_message():
-    """Ride just went down — down_since not set yet, so elapsed time should be ~0."""
+def test_first_down_message_stamps_down_since_epoch():
+    """Ride just went down: down_since and its epoch are stamped with the receive time."""
     parks = _parks_with_attr({"status": "OPERATING", "down_since": ""})
     msg = _make_livedata_msg(data={"status": "DOWN", "queue": {"STANDBY": {"waitTime": None}}})
+    before = time.time()
     with patch("updater.websocket_updater.update_parks_operating_status"):
         _apply_live_update(msg, parks)
-    wait = parks[0]["attractions"][0]["waitTime"]
-    assert wait.startswith("Down ")
-    minutes = int(wait.split(" ")[1])
-    assert 0 <= minutes <= 1
+    attr = parks[0]["attractions"][0]
+    assert before - 1 <= attr["down_since_epoch"] <= time.time()
+    assert attr["down_since"]
+    assert attr["waitTime"] is None
+
+
+def test_recovery_clears_down_since():
+    parks = _parks_with_attr({"status": "DOWN", "down_since": "2025-01-01T00:00:00Z", "down_since_epoch": 1.0})
+    with patch("updater.websocket_updater.update_parks_operating_status"):
+        _apply_live_update(_make_livedata_msg(), parks)
+    attr = parks[0]["attractions"][0]
+    assert attr["down_since"] == ""
+    assert "down_since_epoch" not in attr
+    assert attr["waitTime"] == 30
 
 
 # --- boarding group ---
@@ -181,7 +205,8 @@ def test_boarding_group_range():
     })
     with patch("updater.websocket_updater.update_parks_operating_status"):
         _apply_live_update(msg, parks)
-    assert parks[0]["attractions"][0]["waitTime"] == "Groups 1-50"
+    assert parks[0]["attractions"][0]["boardingGroup"] == {"start": 1, "end": 50}
+    assert parks[0]["attractions"][0]["waitTime"] is None
 
 
 def test_boarding_group_open_ended():
@@ -192,7 +217,7 @@ def test_boarding_group_open_ended():
     })
     with patch("updater.websocket_updater.update_parks_operating_status"):
         _apply_live_update(msg, parks)
-    assert parks[0]["attractions"][0]["waitTime"] == "Group 10+"
+    assert parks[0]["attractions"][0]["boardingGroup"] == {"start": 10, "end": None}
 
 
 def test_no_queue_data_sets_wait_none():
@@ -276,10 +301,11 @@ def test_ws_loop_connects_with_heartbeat_and_receive_timeout():
     with patch("updater.websocket_updater.aiohttp.ClientSession", lambda: _FakeSession(captured)), \
          patch("updater.websocket_updater.asyncio.sleep", cancel_sleep):
         with pytest.raises(asyncio.CancelledError):
-            asyncio.run(_ws_loop("dummy-key", parks))
+            asyncio.run(_ws_loop("dummy-key", parks, "rest-session"))
 
     assert captured["heartbeat"] == _WS_HEARTBEAT_SECS
     assert captured["receive_timeout"] == _WS_RECEIVE_TIMEOUT_SECS
+    assert captured["compress"] == 15
 
 
 # --- no match ---
@@ -290,3 +316,514 @@ def test_unknown_entity_id_is_ignored():
     _apply_live_update(msg, parks)
     assert parks[0]["attractions"][0]["waitTime"] == 20
     assert parks[0]["attractions"][0]["lastUpdatedTs"] == "old"
+    assert "roster_refresh_needed" not in parks[0]
+
+
+def test_unknown_entity_with_park_id_requests_roster_refresh(monkeypatch):
+    noted = []
+    monkeypatch.setattr(websocket_updater, "note_unknown_attraction",
+                        lambda park, entity_id: noted.append((park["id"], entity_id)))
+    parks = _parks_with_attr()
+    msg = _make_livedata_msg(entity_id="new-ride", data={"status": "OPERATING", "parkId": "park-1"})
+    _apply_live_update(msg, parks)
+    assert noted == [("park-1", "new-ride")]
+
+
+# --- gap-aware reconnect refresh ---
+
+@pytest.fixture
+def clean_gap_state(monkeypatch):
+    monkeypatch.setattr(websocket_updater, "_last_message_at", {})
+    monkeypatch.setattr(websocket_updater, "_ws_applied_at", {})
+
+
+def _gap_parks():
+    return [
+        {"id": "park-1", "name": "MK", "destination_id": "dest-1", "attractions": [copy.deepcopy(DUMMY_ATTRACTION)]},
+        {"id": "park-2", "name": "EPCOT", "destination_id": "dest-1", "attractions": [{"id": "attr-2", "name": "Soarin"}]},
+        {"id": "park-3", "name": "Cedar Point", "destination_id": "dest-2", "attractions": [{"id": "attr-3", "name": "Steel Vengeance"}]},
+    ]
+
+
+def test_livedata_message_records_park_and_destination(clean_gap_state):
+    parks = [{"id": "park-1", "name": "MK", "destination_id": "dest-1",
+              "attractions": [copy.deepcopy(DUMMY_ATTRACTION)]}]
+    with patch("updater.websocket_updater.update_parks_operating_status"):
+        _apply_live_update(_make_livedata_msg(), parks)
+    assert set(websocket_updater._last_message_at) == {"park-1", "dest-1"}
+    assert "attr-1" in websocket_updater._ws_applied_at
+
+
+def test_subscribed_message_records_destination(clean_gap_state):
+    _apply_live_update({"event": "subscribed", "entityId": "dest-1"}, [])
+    assert "dest-1" in websocket_updater._last_message_at
+
+
+def test_parks_needing_refresh_only_returns_parks_over_threshold(clean_gap_state):
+    now = time.monotonic()
+    websocket_updater._last_message_at.update({
+        "park-1": now - 5,                                   # recent park message
+        "dest-1": now - _RECONNECT_REFRESH_GAP_SECS - 30,    # destination quiet for a while
+    })
+    stale = _parks_needing_refresh(_gap_parks(), now)
+    # park-2 only has the old destination timestamp; park-3 has never been seen.
+    assert [p["id"] for p in stale] == ["park-2", "park-3"]
+
+
+def test_parks_needing_refresh_destination_message_counts_for_its_parks(clean_gap_state):
+    now = time.monotonic()
+    websocket_updater._last_message_at.update({"dest-1": now - 1, "dest-2": now - 1})
+    assert _parks_needing_refresh(_gap_parks(), now) == []
+
+
+def test_parks_needing_refresh_skips_parks_without_attractions(clean_gap_state):
+    parks = [{"id": "park-1", "name": "MK", "destination_id": "dest-1", "attractions": []}]
+    assert _parks_needing_refresh(parks, time.monotonic()) == []
+
+
+def test_refresh_after_reconnect_keeps_newer_ws_values(clean_gap_state, monkeypatch):
+    parks = [{"id": "park-1", "name": "MK", "destination_id": "dest-1", "attractions": [
+        {"id": "attr-1", "name": "Space Mountain", "waitTime": 20, "status": "OPERATING", "lastUpdatedTs": "old", "down_since": ""},
+        {"id": "attr-2", "name": "Big Thunder", "waitTime": 10, "status": "OPERATING", "lastUpdatedTs": "old", "down_since": ""},
+    ]}]
+    started = time.monotonic()
+    # attr-2 was updated by the new stream after the refresh started.
+    websocket_updater._ws_applied_at["attr-2"] = started + 1
+    fetched = []
+
+    async def fake_bulk(session, park):
+        fetched.append((park["id"], session))
+        return [
+            {"id": "attr-1", "waitTime": 55, "status": "OPERATING", "lastUpdatedTs": "rest"},
+            {"id": "attr-2", "waitTime": 99, "status": "OPERATING", "lastUpdatedTs": "rest"},
+        ]
+
+    monkeypatch.setattr(websocket_updater, "fetch_park_live_data", fake_bulk)
+    with patch("updater.websocket_updater.update_parks_operating_status") as mock_update:
+        asyncio.run(_refresh_parks_after_reconnect(parks, started, "shared-session"))
+
+    assert fetched == [("park-1", "shared-session")]
+    by_id = {a["id"]: a for a in parks[0]["attractions"]}
+    assert by_id["attr-1"]["waitTime"] == 55
+    assert by_id["attr-2"]["waitTime"] == 10
+    mock_update.assert_called_once_with(parks)
+
+
+class _RecordingWS(_FakeWS):
+    def __init__(self, events):
+        self._events = events
+
+    async def send_json(self, payload):
+        self._events.append(("subscribe", payload["entityId"]))
+
+
+def test_reconnect_resubscribes_before_refreshing(clean_gap_state, monkeypatch):
+    events = []
+    parks = [{"id": "park-1", "name": "MK", "destination_id": "dest-1",
+              "attractions": [copy.deepcopy(DUMMY_ATTRACTION)]}]
+
+    class Session:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            pass
+
+        def ws_connect(self, url, **kwargs):
+            return _RecordingWS(events)
+
+    async def fake_refresh(stale_parks, started, session):
+        events.append(("refresh", [p["id"] for p in stale_parks], session))
+
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        await real_sleep(0)  # let the spawned refresh task run
+        if len(sleeps) > 1:
+            raise asyncio.CancelledError
+
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr(websocket_updater, "_refresh_parks_after_reconnect", fake_refresh)
+    with patch("updater.websocket_updater.aiohttp.ClientSession", Session), \
+         patch("updater.websocket_updater.asyncio.sleep", fake_sleep):
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(_ws_loop("dummy-key", parks, "rest-session"))
+
+    # First connection: subscribe only. Reconnect: subscribe, then the refresh task runs.
+    assert events == [
+        ("subscribe", "dest-1"),
+        ("subscribe", "dest-1"),
+        ("refresh", ["park-1"], "rest-session"),
+    ]
+
+
+def test_websocket_boot_from_checkpoint_clears_stale_on_first_connect(clean_gap_state, monkeypatch, tmp_path):
+    """An offline boot leaves the checkpointed parks stale; the first connection catches them up."""
+    from updater.checkpoint import save_checkpoint
+    from updater.data_updater import bootstrap_parks_data
+
+    parks = [{"id": "park-1", "name": "MK", "destination_id": "dest-1", "stale": True,
+              "attractions": [copy.deepcopy(DUMMY_ATTRACTION)]}]
+    monkeypatch.setattr("updater.data_updater.fetch_park_and_attractions", lambda park_info: None)
+    asyncio.run(bootstrap_parks_data([{"id": "park-1", "name": "MK"}], parks, session=None, use_websocket=True))
+    assert parks[0]["stale"] is True
+    assert save_checkpoint(parks, str(tmp_path / "state.json")) is False
+
+    async def fake_bulk(session, park):
+        return [dict(DUMMY_ATTRACTION, waitTime=45, lastUpdatedTs="rest")]
+
+    async def fake_sleep(delay):
+        for _ in range(5):
+            await real_sleep(0)  # let the spawned catch-up and its gather run
+        raise asyncio.CancelledError
+
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr(websocket_updater, "fetch_park_live_data", fake_bulk)
+    with patch("updater.websocket_updater.aiohttp.ClientSession", lambda: _FakeSession({})), \
+         patch("updater.websocket_updater.asyncio.sleep", fake_sleep), \
+         patch("updater.websocket_updater.update_parks_operating_status"):
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(_ws_loop("dummy-key", parks, "rest-session"))
+
+    assert "stale" not in parks[0]
+    assert parks[0]["attractions"][0]["waitTime"] == 45
+    assert save_checkpoint(parks, str(tmp_path / "state.json")) is True
+
+
+# --- rolling REST audit ---
+
+def test_find_drift_status_and_wait():
+    assert _find_drift({"status": "OPERATING", "waitTime": 20}, {"status": "OPERATING", "waitTime": 20}) == []
+    assert _find_drift({"status": "OPERATING", "waitTime": 20}, {"status": "OPERATING", "waitTime": 35}) == [
+        ("waitTime", 20, 35)]
+    assert _find_drift({"status": "OPERATING", "waitTime": 20}, {"status": "CLOSED", "waitTime": 20}) == [
+        ("status", "OPERATING", "CLOSED")]
+
+
+def test_find_drift_ignores_down_minutes():
+    # Minutes down are derived at render time, so DOWN state compares equal.
+    assert _find_drift({"status": "DOWN", "waitTime": None}, {"status": "DOWN", "waitTime": None}) == []
+
+
+def test_find_drift_boarding_group():
+    assert _find_drift(
+        {"status": "OPERATING", "waitTime": None, "boardingGroup": {"start": 1, "end": 50}},
+        {"status": "OPERATING", "waitTime": None, "boardingGroup": {"start": 51, "end": 80}},
+    ) == [("boardingGroup", {"start": 1, "end": 50}, {"start": 51, "end": 80})]
+
+
+def _audit_park_fixture():
+    return {"id": "park-1", "name": "MK", "destination_id": "dest-1", "attractions": [
+        {"id": "attr-1", "name": "Space Mountain", "waitTime": 20, "status": "OPERATING", "lastUpdatedTs": "ws", "down_since": ""},
+        {"id": "attr-2", "name": "Big Thunder", "waitTime": 10, "status": "OPERATING", "lastUpdatedTs": "ws", "down_since": ""},
+        {"id": "attr-3", "name": "Haunted Mansion", "waitTime": 15, "status": "OPERATING", "lastUpdatedTs": "ws", "down_since": ""},
+    ]}
+
+
+def test_audit_park_repairs_and_counts_drift(clean_gap_state, monkeypatch):
+    park = _audit_park_fixture()
+    monkeypatch.setattr(websocket_updater, "audit_stats",
+                        {"parks_audited": 0, "attractions_checked": 0, "drift_detected": 0})
+
+    async def fake_bulk(session, p):
+        # attr-3 is updated by the stream while the request is in flight.
+        websocket_updater._ws_applied_at["attr-3"] = time.monotonic() + 1
+        return [
+            {"id": "attr-1", "waitTime": 20, "status": "OPERATING", "lastUpdatedTs": "rest"},
+            {"id": "attr-2", "waitTime": 10, "status": "CLOSED", "lastUpdatedTs": "rest"},
+            {"id": "attr-3", "waitTime": 90, "status": "OPERATING", "lastUpdatedTs": "rest"},
+        ]
+
+    monkeypatch.setattr(websocket_updater, "fetch_park_live_data", fake_bulk)
+    with patch("updater.websocket_updater.update_parks_operating_status") as mock_update:
+        asyncio.run(_audit_park(park, session=None))
+
+    by_id = {a["id"]: a for a in park["attractions"]}
+    assert by_id["attr-1"]["lastUpdatedTs"] == "ws"      # in sync: untouched
+    assert by_id["attr-2"]["status"] == "CLOSED"         # drift repaired
+    assert by_id["attr-3"]["waitTime"] == 15             # newer WS value kept
+    assert websocket_updater.audit_stats == {"parks_audited": 1, "attractions_checked": 2, "drift_detected": 1}
+    mock_update.assert_called_once_with([park])
+
+
+def test_audit_park_no_drift_leaves_state_alone(clean_gap_state, monkeypatch):
+    park = _audit_park_fixture()
+    park["stale"] = True
+
+    async def fake_bulk(session, p):
+        return [{"id": a["id"], "waitTime": a["waitTime"], "status": a["status"], "lastUpdatedTs": "rest"}
+                for a in p["attractions"]]
+
+    monkeypatch.setattr(websocket_updater, "fetch_park_live_data", fake_bulk)
+    with patch("updater.websocket_updater.update_parks_operating_status") as mock_update:
+        asyncio.run(_audit_park(park, session=None))
+    assert all(a["lastUpdatedTs"] == "ws" for a in park["attractions"])
+    mock_update.assert_not_called()
+    # A successful audit means the park is current, even if it was restored from a checkpoint.
+    assert "stale" not in park
+
+
+def test_audit_park_refreshes_timestamps_of_confirmed_attractions(clean_gap_state, monkeypatch):
+    """The stream only sends changes, so an audit that confirms a value keeps its data age current."""
+    park = _audit_park_fixture()
+    for attraction in park["attractions"]:
+        attraction["lastUpdatedEpoch"] = 1000.0
+
+    async def fake_bulk(session, p):
+        return [{"id": a["id"], "waitTime": a["waitTime"], "status": a["status"],
+                 "lastUpdatedTs": "rest", "lastUpdatedEpoch": 2000.0}
+                for a in p["attractions"]]
+
+    monkeypatch.setattr(websocket_updater, "fetch_park_live_data", fake_bulk)
+    with patch("updater.websocket_updater.update_parks_operating_status") as mock_update:
+        asyncio.run(_audit_park(park, session=None))
+    assert all(a["lastUpdatedEpoch"] == 2000.0 and a["lastUpdatedTs"] == "rest" for a in park["attractions"])
+    mock_update.assert_not_called()
+
+
+def test_ws_state_auditor_rotates_one_park_per_cycle(monkeypatch):
+    parks = [
+        {"id": "park-1", "name": "MK", "attractions": [{"id": "a"}]},
+        {"id": "park-2", "name": "EPCOT", "attractions": []},
+        {"id": "park-3", "name": "HS", "attractions": [{"id": "b"}]},
+    ]
+    audited = []
+
+    async def fake_audit(park, session):
+        audited.append(park["id"])
+
+    async def counting_sleep(delay):
+        if len(audited) >= 3:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(websocket_updater, "_audit_park", fake_audit)
+    monkeypatch.setattr("updater.websocket_updater.asyncio.sleep", counting_sleep)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(ws_state_auditor(parks, session=None))
+    # Parks without attractions are skipped; the rotation wraps around.
+    assert audited == ["park-1", "park-3", "park-1"]
+
+
+# --- schedule-aware subscriptions ---
+
+_EASTERN = timezone(timedelta(hours=-4))
+
+
+def _scheduled_park(park_id, dest_id, open_hour, close_hour, day=17):
+    return {
+        "id": park_id, "name": park_id, "destination_id": dest_id,
+        "attractions": [{"id": f"{park_id}-attr", "name": "Ride"}],
+        "schedule": [{
+            "type": "OPERATING",
+            "openingTime": f"2025-03-{day}T{open_hour:02d}:00:00-04:00",
+            "closingTime": f"2025-03-{day}T{close_hour:02d}:00:00-04:00",
+        }],
+    }
+
+
+def _at(hour, minute=0, day=17):
+    return datetime(2025, 3, day, hour, minute, tzinfo=_EASTERN)
+
+
+def test_destination_streams_from_warm_up_until_grace_after_last_close():
+    parks = [_scheduled_park("mk", "wdw", 9, 22), _scheduled_park("ep", "wdw", 10, 21)]
+    assert _destination_should_stream(parks, _at(8, 44)) is False
+    assert _destination_should_stream(parks, _at(8, 45)) is True
+    assert _destination_should_stream(parks, _at(22, 30)) is True
+    assert _destination_should_stream(parks, _at(22, 31)) is False
+
+
+def test_destination_without_schedule_always_streams():
+    parks = [{"id": "p", "destination_id": "d", "schedule": []}]
+    assert _destination_should_stream(parks, _at(3)) is True
+
+
+def test_destination_ignores_non_open_schedule_entries():
+    park = _scheduled_park("mk", "wdw", 9, 22)
+    park["schedule"].append({"type": "INFO", "openingTime": "2025-03-17T00:00:00-04:00",
+                             "closingTime": "2025-03-17T23:59:00-04:00"})
+    assert _destination_should_stream([park], _at(3)) is False
+
+
+def test_next_stream_start():
+    parks = [_scheduled_park("mk", "wdw", 9, 22)]
+    assert _next_stream_start(parks, _at(3)) == _at(8, 45)
+    assert _next_stream_start(parks, _at(23)) is None
+
+
+class _SubscriptionWS:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, payload):
+        self.sent.append((payload["event"], payload["entityId"]))
+
+
+@pytest.fixture
+def clean_subscription_state(monkeypatch):
+    monkeypatch.setattr(websocket_updater, "_paused_destinations", set())
+    monkeypatch.setattr("updater.data_updater._schedule_lookahead_at", {})
+
+
+def test_sync_subscriptions_only_subscribes_open_destinations(clean_subscription_state):
+    parks = [_scheduled_park("mk", "wdw", 9, 22), _scheduled_park("cp", "cedar", 12, 20)]
+    ws = _SubscriptionWS()
+    subscribed = set()
+    asyncio.run(_sync_subscriptions(ws, parks, subscribed, _at(10), None, warm_up=False))
+    assert ws.sent == [("subscribe", "wdw")]
+    assert subscribed == {"wdw"}
+    assert websocket_updater._paused_destinations == {"cedar"}
+
+
+def test_sync_subscriptions_unsubscribes_after_close(clean_subscription_state):
+    parks = [_scheduled_park("mk", "wdw", 9, 22)]
+    ws = _SubscriptionWS()
+    subscribed = {"wdw"}
+    asyncio.run(_sync_subscriptions(ws, parks, subscribed, _at(23), None))
+    assert ws.sent == [("unsubscribe", "wdw")]
+    assert subscribed == set()
+    assert "wdw" in websocket_updater._paused_destinations
+
+
+def test_sync_subscriptions_resubscribes_with_warm_up_refresh(clean_subscription_state, monkeypatch):
+    parks = [_scheduled_park("mk", "wdw", 9, 22)]
+    websocket_updater._paused_destinations.add("wdw")
+    refreshed = []
+
+    async def fake_refresh(stale_parks, started, session):
+        refreshed.append(([p["id"] for p in stale_parks], session))
+
+    monkeypatch.setattr(websocket_updater, "_refresh_parks_after_reconnect", fake_refresh)
+
+    async def run():
+        ws = _SubscriptionWS()
+        await _sync_subscriptions(ws, parks, set(), _at(8, 50), "shared-session")
+        await asyncio.sleep(0)
+        return ws
+
+    ws = asyncio.run(run())
+    assert ws.sent == [("subscribe", "wdw")]
+    assert refreshed == [(["mk"], "shared-session")]
+    assert websocket_updater._paused_destinations == set()
+
+
+def test_sync_subscriptions_refreshes_schedule_when_paused_without_next_opening(clean_subscription_state, monkeypatch):
+    park = _scheduled_park("mk", "wdw", 9, 22)
+    tomorrow = _scheduled_park("mk", "wdw", 8, 23, day=18)["schedule"]
+    fetched = []
+
+    def fake_schedule(park_id):
+        fetched.append(park_id)
+        return tomorrow
+
+    monkeypatch.setattr("updater.data_updater.fetch_park_schedule", fake_schedule)
+    ws = _SubscriptionWS()
+    asyncio.run(_sync_subscriptions(ws, [park], set(), _at(23, 30), None))
+    # Rate limited: a second pass right away doesn't refetch.
+    asyncio.run(_sync_subscriptions(ws, [park], set(), _at(23, 31), None))
+    assert fetched == ["mk"]
+    assert park["schedule"] == tomorrow
+    # The derived fields follow the new schedule, so transition timers re-arm.
+    assert park["openingTime"] == tomorrow[0]["openingTime"]
+    assert park["openingEpoch"] == _at(8, day=18).timestamp()
+    assert _next_stream_start([park], _at(23, 31)) == _at(7, 45, day=18)
+
+
+def test_paused_schedule_refresh_shares_the_prefetcher_rate_limit(clean_subscription_state, monkeypatch):
+    from updater.data_updater import look_ahead_schedule
+
+    park = _scheduled_park("mk", "wdw", 9, 22)
+    fetched = []
+    monkeypatch.setattr("updater.data_updater.fetch_park_schedule", lambda park_id: fetched.append(park_id) or [])
+
+    async def both_tasks():
+        await look_ahead_schedule(park)     # opening prefetcher
+        await _sync_subscriptions(_SubscriptionWS(), [park], set(), _at(23, 30), None)
+
+    asyncio.run(both_tasks())
+    assert fetched == ["mk"]
+
+
+def test_paused_destination_events_are_dropped(clean_subscription_state):
+    parks = [{"id": "park-1", "name": "MK", "destination_id": "dest-1",
+              "attractions": [copy.deepcopy(DUMMY_ATTRACTION)]}]
+    websocket_updater._paused_destinations.add("dest-1")
+    _apply_live_update(_make_livedata_msg(), parks)
+    assert parks[0]["attractions"][0]["lastUpdatedTs"] == "old"
+
+
+# --- sharded connections ---
+
+def _dest_parks(*dest_ids):
+    return [{"id": f"park-{d}", "name": d, "destination_id": d, "attractions": []} for d in dest_ids]
+
+
+def test_shard_destinations_are_dealt_round_robin():
+    parks = _dest_parks("d", "b", "a", "c", "e") + _dest_parks("a")
+    assert _shard_destinations(parks, 0, 2) == {"a", "c", "e"}
+    assert _shard_destinations(parks, 1, 2) == {"b", "d"}
+    assert _shard_destinations(parks, 0, 1) == {"a", "b", "c", "d", "e"}
+
+
+def test_sync_subscriptions_limited_to_shard_destinations(clean_subscription_state):
+    parks = [_scheduled_park("mk", "wdw", 9, 22), _scheduled_park("dl", "dlr", 9, 22)]
+    ws = _SubscriptionWS()
+    subscribed = set()
+    asyncio.run(_sync_subscriptions(ws, parks, subscribed, _at(10), None, warm_up=False,
+                                    destination_ids={"dlr"}))
+    assert ws.sent == [("subscribe", "dlr")]
+    assert subscribed == {"dlr"}
+
+
+class _ShardSession:
+    def __init__(self, sockets):
+        self._sockets = sockets
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    def ws_connect(self, url, **kwargs):
+        events = []
+        self._sockets.append(events)
+        return _RecordingWS(events)
+
+
+def test_websocket_live_updater_spreads_destinations_across_connections(clean_subscription_state, monkeypatch):
+    monkeypatch.setattr(websocket_updater, "ws_shard_health", {})
+    sockets = []
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+        raise asyncio.CancelledError
+
+    parks = _dest_parks("a", "b", "c")
+    with patch("updater.websocket_updater.aiohttp.ClientSession", lambda: _ShardSession(sockets)), \
+         patch("updater.websocket_updater.asyncio.sleep", fake_sleep):
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(websocket_live_updater("dummy-key", parks, "rest-session", connections=5))
+
+    # Never more connections than destinations; each socket subscribes to its own share.
+    assert sorted(sockets) == [[("subscribe", "a")], [("subscribe", "b")], [("subscribe", "c")]]
+    health = websocket_updater.ws_shard_health
+    assert set(health) == {0, 1, 2}
+    assert [health[i]["destinations"] for i in range(3)] == [["a"], ["b"], ["c"]]
+    assert all(h["connects"] == 1 and h["disconnects"] == 1 and not h["connected"] for h in health.values())
+
+
+def test_display_changes_are_stamped_for_latency_tracing():
+    from utils import latency
+    latency.reset()
+    parks = _parks_with_attr()
+    with patch("updater.websocket_updater.update_parks_operating_status"):
+        _apply_live_update(_make_livedata_msg(data={"status": "OPERATING", "queue": {"STANDBY": {"waitTime": 20}}}),
+                           parks)
+        assert latency.stats["changes"] == 0  # same wait, same status: only the timestamp moved
+        _apply_live_update(_make_livedata_msg(), parks)
+    assert latency.stats["changes"] == 1
+    assert latency.note_rendered("attr-1") is not None
+    latency.reset()
@@ -0,0 +1,94 @@
+import pytest
+
+from utils import bandwidth
+
+MB = 1024 * 1024
+
+
+@pytest.fixture(autouse=True)
+def clean_bandwidth():
+    bandwidth.reset()
+    yield
+    bandwidth.configure(0)
+    bandwidth.reset()
+
+
+class _Response:
+    def __init__(self, content_length=None, headers=None):
+        self.content_length = content_length
+        self.headers = headers or {}
+
+
+def test_record_tracks_endpoints_connections_and_rolling_hour():
+    bandwidth.record("live", 1000, connection="rest", now=0)
+    bandwidth.record("live", 500, connection="rest", now=30)
+    bandwidth.record("websocket", 200, connection="ws", now=90)
+
+    assert bandwidth.endpoint_totals["live"] == {"requests": 2, "bytes": 1500}
+    assert bandwidth.connection_totals == {
+        "rest": {"messages": 2, "bytes": 1500},
+        "ws": {"messages": 1, "bytes": 200},
+    }
+    assert bandwidth.bytes_last_hour(now=100) == 1700
+    # The first minute's bucket falls out of the window after an hour.
+    assert bandwidth.bytes_last_hour(now=3600) == 200
+
+
+def test_payload_size_prefers_content_length():
+    assert bandwidth.payload_size(_Response(content_length=123)) == 123
+    assert bandwidth.payload_size(_Response(headers={"Content-Length": "45"})) == 45
+
+
+def test_payload_size_without_content_length_uses_the_received_body():
+    chunked = _Response()
+    chunked.content = b'{"a": 1}'
+    assert bandwidth.payload_size(chunked) == 8
+
+    class _Stream:
+        total_bytes = 321
+
+    streamed = _Response()
+    streamed.content = _Stream()
+    assert bandwidth.payload_size(streamed) == 321
+    assert bandwidth.payload_size(_Response()) == 0
+
+
+def test_unbudgeted_traffic_is_reported_but_not_budgeted():
+    bandwidth.configure(1 * MB)
+    bandwidth.record("websocket", 2 * MB, connection="ws", now=0, budgeted=False)
+    assert bandwidth.bytes_last_hour(now=0) == 0
+    assert bandwidth.connection_totals["ws"]["bytes"] == 2 * MB
+    assert not bandwidth.is_throttled(now=0)
+
+
+def test_unlimited_budget_never_throttles():
+    bandwidth.record("live", 100 * MB, now=0)
+    assert bandwidth.budget_usage(now=0) == 0.0
+    assert bandwidth.interval_multiplier(now=0) == 1
+    assert bandwidth.low_priority_allowed(now=0)
+
+
+def test_throttles_near_and_over_budget():
+    bandwidth.configure(10 * MB)
+    bandwidth.record("live", 7 * MB, now=0)
+    assert bandwidth.interval_multiplier(now=0) == 1
+    assert bandwidth.low_priority_allowed(now=0)
+
+    bandwidth.record("live", 1 * MB, now=0)
+    assert bandwidth.interval_multiplier(now=0) == 2
+    assert not bandwidth.low_priority_allowed(now=0)
+
+    bandwidth.record("live", 3 * MB, now=0)
+    assert bandwidth.interval_multiplier(now=0) == 4
+
+    # Usage ages out of the rolling hour and normal polling resumes.
+    assert bandwidth.interval_multiplier(now=3600) == 1
+
+
+def test_traffic_report_lists_endpoints_and_connections():
+    bandwidth.record("live", 2048, connection="rest", now=0)
+    bandwidth.record("websocket", 100, connection="ws", now=0)
+    report = bandwidth.traffic_report(now=0)
+    assert "live 2.0KB/1" in report
+    assert "websocket 100B/1" in report
+    assert "ws 100B" in report
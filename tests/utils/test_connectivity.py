@@ -0,0 +1,61 @@
+import pytest
+
+from utils import connectivity
+
+
+@pytest.fixture(autouse=True)
+def clean_connectivity():
+    connectivity.reset()
+    yield
+    connectivity.reset()
+
+
+def _go_offline(now=0):
+    for _ in range(connectivity.FAILURES_BEFORE_OFFLINE):
+        connectivity.record_failure("unreachable", now=now)
+
+
+def test_goes_offline_after_consecutive_failures_only():
+    connectivity.record_failure("unreachable", now=0)
+    connectivity.record_success(now=1)
+    connectivity.record_failure("unreachable", now=2)
+    assert not connectivity.is_offline()
+
+    _go_offline(now=3)
+    assert connectivity.is_offline()
+    assert connectivity.stats["outages"] == 1
+
+
+def test_calls_are_suspended_until_the_backoff_expires():
+    _go_offline(now=0)
+    assert connectivity.network_allowed(now=10) is False
+    assert connectivity.seconds_until_retry(now=10) == connectivity.BACKOFF_INITIAL_SECS - 10
+    assert connectivity.network_allowed(now=connectivity.BACKOFF_INITIAL_SECS) is True
+    assert connectivity.stats["suppressed"] == 1
+
+
+def test_failed_probe_doubles_backoff_up_to_the_cap():
+    _go_offline(now=0)
+    retry = connectivity.BACKOFF_INITIAL_SECS
+    connectivity.record_failure("still down", now=retry)
+    # Failures from the same probe burst don't extend it again.
+    connectivity.record_failure("still down", now=retry + 1)
+    assert connectivity.seconds_until_retry(now=retry) == 2 * connectivity.BACKOFF_INITIAL_SECS
+
+    now = retry
+    for _ in range(10):
+        now += connectivity.seconds_until_retry(now=now)
+        connectivity.record_failure("still down", now=now)
+    assert connectivity.seconds_until_retry(now=now) == connectivity.BACKOFF_MAX_SECS
+
+
+def test_success_restores_online_state_and_resets_backoff():
+    _go_offline(now=0)
+    connectivity.record_failure("still down", now=connectivity.BACKOFF_INITIAL_SECS)
+    connectivity.record_success(now=100)
+    assert not connectivity.is_offline()
+    assert connectivity.network_allowed(now=100) is True
+    assert connectivity.status_summary() == "online"
+
+    _go_offline(now=200)
+    assert connectivity.seconds_until_retry(now=200) == connectivity.BACKOFF_INITIAL_SECS
@@ -0,0 +1,64 @@
+import logging
+
+import pytest
+
+from utils import debug
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def captured():
+    handler = _Capture()
+    level = debug.logger.level
+    debug.logger.addHandler(handler)
+    debug.logger.setLevel(logging.INFO)
+    debug.reset_throttle()
+    yield handler.records
+    debug.logger.removeHandler(handler)
+    debug.logger.setLevel(level)
+    debug.reset_throttle()
+
+
+def test_disabled_debug_never_formats_lazy_arguments(captured):
+    calls = []
+    debug.log("parks: %s", debug.Lazy(lambda: calls.append(1) or "expensive"))
+    assert not debug.enabled()
+    assert calls == []
+    assert captured == []
+
+
+def test_lazy_and_fields_format_when_emitted(captured):
+    debug.info("poll %s %s", debug.Fields(park="MK", ms=12), debug.Lazy(str.upper, "done"))
+    assert captured[0].getMessage() == "poll park=MK ms=12 DONE"
+
+
+def test_throttled_drops_repeats_and_reports_the_count(captured):
+    assert debug.throttled("Skipping %s.", "EPCOT", now=0) is True
+    assert debug.throttled("Skipping %s.", "EPCOT", now=10) is False
+    assert debug.throttled("Skipping %s.", "EPCOT", now=20) is False
+    assert debug.throttled("Skipping %s.", "Animal Kingdom", now=20) is True
+    assert debug.throttled("Skipping %s.", "EPCOT", now=debug.THROTTLE_SECS + 1) is True
+
+    messages = [record.getMessage() for record in captured]
+    assert messages == ["Skipping EPCOT.", "Skipping Animal Kingdom.", "Skipping EPCOT. (repeated 2 times)"]
+    assert debug.throttle_stats == {"emitted": 3, "suppressed": 2}
+    assert captured[0].funcName == "test_throttled_drops_repeats_and_reports_the_count"
+
+
+def test_throttled_key_groups_lines_with_changing_arguments(captured):
+    debug.throttled("Hiding %s: %d min old.", "Tron", 121, key=("hidden", "Tron"), now=0)
+    debug.throttled("Hiding %s: %d min old.", "Tron", 125, key=("hidden", "Tron"), now=60)
+    assert len(captured) == 1
+
+
+def test_throttled_below_level_is_free(captured):
+    assert debug.throttled("detail", level=logging.DEBUG) is False
+    assert debug.throttle_stats == {"emitted": 0, "suppressed": 0}
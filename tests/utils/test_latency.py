@@ -0,0 +1,55 @@
+import pytest
+
+from utils import latency, metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_latency():
+    latency.reset()
+    metrics.reset()
+    yield
+    latency.reset()
+    metrics.reset()
+
+
+def test_first_render_records_time_since_oldest_unshown_change():
+    latency.note_change("a1", "ws", now=100.0)
+    latency.note_change("a1", "ws", now=104.0)   # still unshown: keeps the first stamp
+    assert latency.note_rendered("a1", now=110.0) == 10.0
+    assert latency.note_rendered("a1", now=118.0) is None  # nothing new since the last render
+    assert latency.stats == {"changes": 2, "rendered": 1, "expired": 0}
+    assert metrics.snapshot()["histograms"][0]["labels"] == {"source": "ws"}
+
+
+def test_changes_shown_too_late_are_left_out():
+    latency.note_change("a1", "rest", now=0.0)
+    assert latency.note_rendered("a1", now=latency.PENDING_MAX_SECS + 1) is None
+    assert latency.stats["expired"] == 1
+    assert latency.percentiles() is None
+
+
+def test_percentiles_and_report():
+    for i in range(1, 101):
+        latency.note_change(f"ws-{i}", "ws", now=0.0)
+        latency.note_rendered(f"ws-{i}", now=float(i))
+    latency.note_change("rest-1", "rest", now=0.0)
+    latency.note_rendered("rest-1", now=200.0)
+
+    assert latency.percentiles("ws") == {"p50": 50.0, "p95": 95.0, "p99": 99.0, "count": 100}
+    assert latency.percentiles()["p99"] == 100.0
+    text = latency.report()
+    assert "over 101 changes" in text
+    assert "rest: p50 200.0s" in text and "ws: p50 50.0s" in text
+
+
+def test_maybe_report_logs_once_per_interval_and_sets_gauges(monkeypatch):
+    lines = []
+    monkeypatch.setattr(latency.debug, "info", lines.append)
+    latency.note_change("a1", "ws", now=0.0)
+    latency.note_rendered("a1", now=3.0)
+
+    assert latency.maybe_report(now=1000.0) is True
+    assert latency.maybe_report(now=1000.0 + latency.REPORT_SECS - 1) is False
+    assert len(lines) == 1 and "p50 3.0s" in lines[0]
+    gauges = {g["labels"]["quantile"]: g["value"] for g in metrics.snapshot()["gauges"]}
+    assert gauges == {"p50": 3.0, "p95": 3.0, "p99": 3.0}
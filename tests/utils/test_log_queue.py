@@ -0,0 +1,113 @@
+import logging
+import threading
+
+import pytest
+
+from utils.log_queue import BatchRotatingFileHandler, QueueWriterHandler
+
+
+class _Target(logging.Handler):
+    def __init__(self, level=logging.DEBUG):
+        super().__init__(level)
+        self.batches = []
+        self.flushes = 0
+        self.thread_names = set()
+
+    def emit_batch(self, records):
+        self.thread_names.add(threading.current_thread().name)
+        self.batches.append([record.getMessage() for record in records])
+
+    def flush(self):
+        self.flushes += 1
+
+
+def _record(message, *args, level=logging.INFO):
+    return logging.LogRecord("disney-lll", level, __file__, 1, message, args, None)
+
+
+@pytest.fixture
+def queue_handler():
+    handlers = []
+
+    def make(target, **kwargs):
+        handler = QueueWriterHandler([target], **kwargs)
+        handlers.append(handler)
+        return handler
+
+    yield make
+    for handler in handlers:
+        handler.stop()
+
+
+def test_records_are_written_by_the_writer_thread_in_batches(queue_handler):
+    target = _Target()
+    handler = queue_handler(target, flush_interval=0.05)
+    for i in range(5):
+        handler.handle(_record("line %d", i))
+    handler.flush()
+
+    assert [line for batch in target.batches for line in batch] == [f"line {i}" for i in range(5)]
+    assert target.thread_names == {"log-writer"}
+    assert target.flushes >= 1
+    assert handler.stats["written"] == 5
+
+
+def test_message_is_formatted_when_logged_not_when_written():
+    target = _Target()
+    handler = QueueWriterHandler([target], start=False)
+    parks = ["MK"]
+    record = handler.prepare(_record("parks: %s", parks))
+    parks.append("EPCOT")
+    assert record.getMessage() == "parks: ['MK']"
+
+
+def test_overflow_drops_info_but_keeps_warnings_and_reports_it():
+    target = _Target()
+    handler = QueueWriterHandler([target], capacity=2, start=False)
+    handler._thread = object()  # queue without a writer so the overflow is deterministic
+    handler.handle(_record("one"))
+    handler.handle(_record("two"))
+    handler.handle(_record("three"))                           # dropped
+    handler.handle(_record("problem", level=logging.WARNING))  # evicts "one"
+
+    assert handler.stats["dropped"] == 1 and handler.stats["evicted"] == 1
+    handler.write_batch(handler._take_batch(0))
+    assert target.batches == [["two", "problem", "Log queue full: 2 records dropped."]]
+
+
+def test_errors_are_flushed_without_waiting_for_the_timer(queue_handler):
+    target = _Target()
+    handler = queue_handler(target, flush_interval=60)
+    handler.handle(_record("boom", level=logging.ERROR))
+    for _ in range(200):
+        if target.flushes:
+            break
+        threading.Event().wait(0.01)
+    assert target.flushes == 1
+
+
+def test_stop_drains_and_later_records_are_written_directly():
+    target = _Target()
+    handler = QueueWriterHandler([target], flush_interval=60)
+    handler.handle(_record("queued"))
+    handler.stop()
+    handler.handle(_record("after stop"))
+    assert [line for batch in target.batches for line in batch] == ["queued", "after stop"]
+
+
+def test_target_level_is_respected(queue_handler):
+    target = _Target(level=logging.WARNING)
+    handler = queue_handler(target)
+    handler.handle(_record("chatter"))
+    handler.handle(_record("careful", level=logging.WARNING))
+    handler.flush()
+    assert [line for batch in target.batches for line in batch] == ["careful"]
+
+
+def test_batch_file_handler_writes_and_rotates(tmp_path):
+    path = tmp_path / "app.log"
+    handler = BatchRotatingFileHandler(str(path), maxBytes=40, backupCount=1)
+    handler.emit_batch([_record("x" * 30), _record("y" * 30)])
+    handler.close()
+    assert path.read_text() == "y" * 30 + "\n"
+    assert (tmp_path / "app.log.1").read_text() == "x" * 30 + "\n"
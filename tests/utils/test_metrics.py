@@ -0,0 +1,87 @@
+import json
+import urllib.request
+
+import pytest
+
+from utils import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_counters_gauges_and_labels():
+    metrics.inc("rest_requests_total", endpoint="live", outcome="ok")
+    metrics.inc("rest_requests_total", 2, outcome="ok", endpoint="live")
+    metrics.inc("rest_requests_total", endpoint="live", outcome="http_error")
+    metrics.set_gauge("ws_connected", 1, connection="ws")
+    metrics.set_gauge("ws_connected", 0, connection="ws")
+
+    data = metrics.snapshot()
+    assert {(c["labels"]["outcome"], c["value"]) for c in data["counters"]} == {("ok", 3), ("http_error", 1)}
+    assert data["gauges"] == [{"name": "ws_connected", "labels": {"connection": "ws"}, "value": 0}]
+
+
+def test_histogram_buckets_and_quantiles():
+    for value in (0.002, 0.003, 0.02, 0.4, 30):
+        metrics.observe("frame_render_seconds", value, screen="attraction")
+    histogram = metrics.snapshot()["histograms"][0]
+    assert histogram["count"] == 5
+    assert histogram["sum"] == pytest.approx(30.425)
+    assert histogram["buckets"]["0.005"] == 2
+    assert histogram["buckets"]["+Inf"] == 1
+
+    assert metrics.histogram_quantile("frame_render_seconds", 0.5, screen="attraction") == 0.025
+    assert metrics.histogram_quantile("frame_render_seconds", 0.99, screen="attraction") == float("inf")
+    assert metrics.histogram_quantile("frame_render_seconds", 0.5, screen="park") is None
+
+
+def test_timed_observes_the_block():
+    with metrics.timed("merge_seconds"):
+        pass
+    assert metrics.snapshot()["histograms"][0]["count"] == 1
+
+
+def test_prometheus_text_format():
+    metrics.inc("ws_messages_total", 7, connection="ws")
+    metrics.observe("merge_seconds", 0.002)
+    text = metrics.prometheus_text()
+
+    assert "# TYPE disney_lll_ws_messages_total counter" in text
+    assert 'disney_lll_ws_messages_total{connection="ws"} 7' in text
+    assert "# TYPE disney_lll_merge_seconds histogram" in text
+    assert 'disney_lll_merge_seconds_bucket{le="0.001"} 0' in text
+    assert 'disney_lll_merge_seconds_bucket{le="0.005"} 1' in text
+    assert 'disney_lll_merge_seconds_bucket{le="+Inf"} 1' in text
+    assert "disney_lll_merge_seconds_count 1" in text
+
+
+def test_label_values_are_escaped():
+    metrics.inc("weather_requests_total", outcome='bad "quote"')
+    assert 'outcome="bad \\"quote\\""' in metrics.prometheus_text()
+
+
+def test_dump_json(tmp_path):
+    metrics.inc("ws_disconnects_total", connection="ws")
+    path = tmp_path / "metrics" / "metrics.json"
+    metrics.dump_json(str(path))
+    data = json.loads(path.read_text())
+    assert data["counters"][0]["name"] == "ws_disconnects_total"
+
+
+def test_http_endpoint_serves_prometheus_and_json():
+    metrics.inc("ws_messages_total", connection="ws")
+    server = metrics.serve(0)
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{base}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert 'disney_lll_ws_messages_total{connection="ws"} 1' in response.read().decode()
+        with urllib.request.urlopen(f"{base}/metrics.json", timeout=5) as response:
+            assert json.load(response)["counters"][0]["value"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
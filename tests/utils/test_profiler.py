@@ -0,0 +1,72 @@
+import pstats
+import threading
+
+from utils import profiler
+
+
+def _key(name, filename="/app/updater/data_updater.py"):
+    return filename, 1, name
+
+
+def test_classify_by_thread_and_stack():
+    updater = threading.Thread(name=profiler.UPDATER_THREAD_NAME)
+    ws_stack = [_key("run"), _key("listen", "/app/updater/websocket_updater.py")]
+
+    assert profiler.classify(threading.main_thread(), []) == "render"
+    assert profiler.classify(updater, ws_stack) == "ws"
+    assert profiler.classify(updater, [_key("run"), _key("poll")]) == "rest"
+    assert profiler.classify(threading.Thread(name="blocking-io_0"), []) == "rest"
+    assert profiler.classify(threading.Thread(name="log-writer"), []) == "other"
+
+
+def test_sample_records_other_threads_but_not_itself():
+    run = profiler.SamplingProfiler(duration=1, interval=0.01, output_dir="unused")
+    run._check_cpu = False
+    stop = threading.Event()
+    worker = threading.Thread(target=stop.wait, name="blocking-io_0")
+    worker.start()
+    try:
+        sampler = threading.Thread(target=run.sample, name="profiler")
+        sampler.start()
+        sampler.join()
+    finally:
+        stop.set()
+        worker.join()
+
+    assert sum(run.stacks["rest"].values()) == 1
+    assert sum(run.stacks["render"].values()) == 1
+    sampled = [key for stacks in run.stacks.values() for stack in stacks for key in stack]
+    assert profiler._code_key(profiler.SamplingProfiler.sample.__code__) not in sampled
+
+
+def test_reports_are_valid_pstats_and_collapsed_stacks(tmp_path):
+    run = profiler.SamplingProfiler(duration=1, interval=0.01, output_dir=str(tmp_path))
+    main, render, draw = _key("main"), _key("render"), _key("draw")
+    run.stacks = {"render": {(main, render): 3, (main, render, draw): 1}}
+    run.write_reports()
+
+    stats = pstats.Stats(str(tmp_path / "render.pstats")).stats
+    assert stats[render][2:4] == (0.03, 0.04)     # self, cumulative seconds
+    assert stats[main][2:4] == (0.0, 0.04)
+    assert stats[draw][4] == {render: (1, 1, 0.01, 0.01)}
+    assert (tmp_path / "render.collapsed").read_text() == (
+        "main (data_updater.py:1);render (data_updater.py:1) 3\n"
+        "main (data_updater.py:1);render (data_updater.py:1);draw (data_updater.py:1) 1\n")
+
+
+def test_recursive_frames_count_once_per_sample():
+    run = profiler.SamplingProfiler(duration=1, interval=0.01, output_dir="unused")
+    walk = _key("walk")
+    run.stacks = {"rest": {(walk, walk, walk): 2}}
+    calls, _, own, total, _ = run.pstats_data("rest")[walk]
+    assert (calls, own, total) == (2, 0.02, 0.02)
+
+
+def test_run_stops_early_and_writes_what_it_sampled(tmp_path):
+    run = profiler.SamplingProfiler(duration=60, interval=0.001, output_dir=str(tmp_path))
+    run._check_cpu = False
+    run.start()
+    threading.Event().wait(0.05)
+    run.stop()
+    assert run.samples > 0
+    assert (tmp_path / "render.pstats").exists() and (tmp_path / "render.collapsed").exists()
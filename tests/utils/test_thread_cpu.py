@@ -0,0 +1,97 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from utils import metrics, thread_cpu
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    thread_cpu.reset()
+    metrics.reset()
+    yield
+    thread_cpu.reset()
+    metrics.reset()
+
+
+def _fake_tasks(monkeypatch, readings):
+    """Serve read_task() from readings: label -> list of (cpu, run queue, switches), one per call."""
+    main, other = threading.main_thread(), SimpleNamespace(name="live-updates", native_id=-1)
+    monkeypatch.setattr(thread_cpu.threading, "enumerate", lambda: [main, other])
+    by_id = {main.native_id: readings["render"], -1: readings["live-updates"]}
+    monkeypatch.setattr(thread_cpu, "read_task", lambda native_id: by_id[native_id].pop(0))
+
+
+def test_thread_label_groups_numbered_threads():
+    assert thread_cpu.thread_label(threading.main_thread()) == "render"
+    assert thread_cpu.thread_label(threading.Thread(name="live-updates")) == "live-updates"
+    assert thread_cpu.thread_label(threading.Thread(name="blocking-io_0")) == "blocking-io"
+    assert thread_cpu.thread_label(threading.Thread(name="weather-icon-800")) == "weather-icon"
+    assert thread_cpu.thread_label(threading.Thread(name="Thread-3 (process_request_thread)")) == "Thread"
+
+
+@pytest.mark.skipif(not thread_cpu.available(), reason="needs /proc")
+def test_read_task_reads_the_current_thread():
+    cpu, run_queue, switches = thread_cpu.read_task(threading.get_native_id())
+    assert cpu > 0 and run_queue >= 0 and switches >= 0
+    assert thread_cpu.read_task(2 ** 31 - 1) is None
+
+
+def test_account_reports_deltas_and_estimates_gil_wait(monkeypatch):
+    _fake_tasks(monkeypatch, {"render": [(1.0, 0.0, 10), (4.0, 0.5, 110)],
+                              "live-updates": [(2.0, 0.0, 5), (3.0, 0.1, 15)]})
+    assert thread_cpu.account(now=100) is None
+    thread_cpu._probes.extend([0.001, 0.003])
+
+    result = thread_cpu.account(now=110)
+
+    assert result["gil_delay"] == pytest.approx(0.002)
+    render, updates = result["threads"]["render"], result["threads"]["live-updates"]
+    assert render["cpu"] == pytest.approx(3.0) and render["run_queue"] == pytest.approx(0.5)
+    # 100 wake-ups x 2 ms, within the 1 s the other thread held the CPU
+    assert render["gil_wait"] == pytest.approx(0.2)
+    assert updates["gil_wait"] == pytest.approx(0.02)
+
+    data = metrics.snapshot()
+    cpu_total = {c["labels"]["thread"]: c["value"] for c in data["counters"]
+                 if c["name"] == "thread_cpu_seconds_total"}
+    assert cpu_total == {"render": pytest.approx(3.0), "live-updates": pytest.approx(1.0)}
+    ratios = {g["labels"].get("thread"): g["value"] for g in data["gauges"] if g["name"] == "thread_cpu_ratio"}
+    assert ratios["render"] == pytest.approx(0.3)
+    assert "render 30.0% CPU" in thread_cpu.report(result).split("|")[0]
+
+
+def test_gil_wait_is_capped_by_other_threads_cpu(monkeypatch):
+    _fake_tasks(monkeypatch, {"render": [(0.0, 0.0, 0), (5.0, 0.0, 1000)],
+                              "live-updates": [(0.0, 0.0, 0), (0.1, 0.0, 0)]})
+    thread_cpu.account(now=0)
+    thread_cpu._probes.append(0.01)
+    assert thread_cpu.account(now=10)["threads"]["render"]["gil_wait"] == pytest.approx(0.1)
+
+
+@pytest.mark.skipif(not thread_cpu.available(), reason="needs /proc")
+def test_probe_gil_measures_a_non_negative_delay():
+    assert thread_cpu.probe_gil() >= 0
+    assert thread_cpu.stats["probes"] == 1
+
+
+def test_probes_run_in_one_burst_per_window(monkeypatch):
+    sleeps, probes = [], []
+
+    class _Stop(Exception):
+        pass
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) > thread_cpu.PROBE_BURST + 1:
+            raise _Stop
+
+    monkeypatch.setattr(thread_cpu.time, "sleep", fake_sleep)
+    monkeypatch.setattr(thread_cpu, "probe_gil", lambda: probes.append(1))
+    monkeypatch.setattr(thread_cpu, "account", lambda: None)
+    with pytest.raises(_Stop):
+        thread_cpu._run(300)
+
+    assert sleeps[0] == pytest.approx(300 - thread_cpu.PROBE_BURST * thread_cpu.PROBE_INTERVAL_SECS)
+    assert len(probes) == thread_cpu.PROBE_BURST
@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+
+from utils import time_utils
+from utils.time_utils import (
+    format_clock_hour,
+    get_eastern,
+    get_timezone,
+    iso_to_epoch,
+    minutes_since,
+    parse_iso,
+)
+
+
+def test_parse_iso_accepts_z_and_offsets():
+    expected = datetime(2025, 5, 10, 16, 11, tzinfo=timezone.utc)
+    assert parse_iso("2025-05-10T16:11:00Z") == expected
+    assert parse_iso("2025-05-10T12:11:00-04:00") == expected
+
+
+def test_parse_iso_rejects_invalid_and_naive():
+    assert parse_iso("") is None
+    assert parse_iso(None) is None
+    assert parse_iso("not a time") is None
+    assert parse_iso("2025-05-10T16:11:00") is None
+
+
+def test_parse_iso_is_memoized():
+    parse_iso.cache_clear()
+    parse_iso("2025-05-10T16:11:00Z")
+    parse_iso("2025-05-10T16:11:00Z")
+    assert parse_iso.cache_info().hits == 1
+
+
+def test_iso_to_epoch_and_minutes_since():
+    epoch = iso_to_epoch("2025-05-10T16:11:00Z")
+    assert epoch == datetime(2025, 5, 10, 16, 11, tzinfo=timezone.utc).timestamp()
+    assert minutes_since(epoch, now=epoch + 37 * 60) == 37
+    assert minutes_since(None) is None
+    assert iso_to_epoch("bad") is None
+
+
+def test_get_timezone_is_cached():
+    assert get_timezone("US/Eastern") is get_timezone("US/Eastern")
+
+
+def test_get_eastern_formats_utc_timestamps():
+    assert get_eastern("2025-05-10T20:11:00Z") == "2025-05-10 04:11 PM"
+    assert get_eastern("2025-05-10T20:11:00") == "2025-05-10 04:11 PM"
+    assert get_eastern("") is None
+
+
+def test_format_clock_hour_uses_timestamp_offset():
+    assert format_clock_hour("2025-03-17T09:00:00-04:00") == "9AM"
+    assert format_clock_hour("2025-03-17T22:00:00-04:00") == "10PM"
+    assert format_clock_hour("badtime") is None
+
+
+def test_utils_reexports_get_eastern():
+    from utils import utils
+    assert utils.get_eastern is time_utils.get_eastern
@@ -0,0 +1,154 @@
+"""On-disk checkpoint of parks_data for warm restarts."""
+import asyncio
+import json
+import os
+import time
+
+from api.disney_api import park_has_operating_attraction
+from utils import debug
+from utils.utils import run_blocking
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHECKPOINT_PATH = os.path.join(BASE_DIR, "cache", "parks_state.json")
+CHECKPOINT_VERSION = 1
+CHECKPOINT_INTERVAL_SECS = 60
+# Older than this, live data says nothing useful about the parks right now.
+CHECKPOINT_MAX_AGE_SECS = 12 * 60 * 60
+
+# Attraction fields that come from live data and survive a restart.
+LIVE_FIELDS = ("waitTime", "status", "lastUpdatedTs", "lastUpdatedEpoch",
+               "boardingGroup", "down_since", "down_since_epoch")
+# Park flags describing pending work in the process that wrote the checkpoint.
+_TRANSIENT_PARK_KEYS = ("schedule_refresh_needed", "roster_refresh_needed", "prefetched_for")
+
+# Another thread may be mutating parks_data while it is serialized.
+_SNAPSHOT_ATTEMPTS = 3
+
+
+def snapshot(parks_data, now=None):
+    """Serialize parks_data into checkpoint JSON."""
+    now = time.time() if now is None else now
+    for attempt in range(_SNAPSHOT_ATTEMPTS):
+        try:
+            return json.dumps({"version": CHECKPOINT_VERSION, "saved_at": now, "parks": parks_data})
+        except RuntimeError:
+            if attempt == _SNAPSHOT_ATTEMPTS - 1:
+                raise
+
+
+def write_checkpoint(payload, path=CHECKPOINT_PATH):
+    """Atomically replace the checkpoint at path with payload (blocking)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as file:
+        file.write(payload)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def save_checkpoint(parks_data, path=CHECKPOINT_PATH):
+    """
+    Write parks_data to the checkpoint. Skipped while any park is still stale,
+    so an unreconciled boot never overwrites the last good checkpoint with a
+    newer timestamp. Returns True if a checkpoint was written.
+    """
+    if not parks_data or any(park.get("stale") for park in parks_data):
+        return False
+    try:
+        write_checkpoint(snapshot(parks_data), path)
+    except (OSError, RuntimeError, TypeError, ValueError) as e:
+        debug.error(f"Failed to write state checkpoint {path}: {e}")
+        return False
+    debug.log(f"State checkpoint written to {path}")
+    return True
+
+
+def load_checkpoint(path=CHECKPOINT_PATH, park_ids=None, max_age=CHECKPOINT_MAX_AGE_SECS, now=None):
+    """
+    Load the checkpointed parks, marked stale, or [] if there is no usable
+    checkpoint. park_ids limits the result to the currently configured parks.
+    Each park's 'operating' flag is re-evaluated, so a park that closed while
+    the board was off is not shown.
+    """
+    now = time.time() if now is None else now
+    try:
+        with open(path, "r") as file:
+            checkpoint = json.load(file)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        debug.warning(f"Ignoring unreadable state checkpoint {path}: {e}")
+        return []
+
+    if not isinstance(checkpoint, dict) or checkpoint.get("version") != CHECKPOINT_VERSION:
+        debug.warning(f"Ignoring state checkpoint {path} with unknown format.")
+        return []
+    age = now - checkpoint.get("saved_at", 0)
+    if age > max_age:
+        debug.info(f"State checkpoint is {age / 3600:.1f}h old; starting cold.")
+        return []
+
+    parks = []
+    for park in checkpoint.get("parks", []):
+        if park_ids is not None and park.get("id") not in park_ids:
+            continue
+        for key in _TRANSIENT_PARK_KEYS:
+            park.pop(key, None)
+        park["stale"] = True
+        park["operating"] = bool(park.get("operating")) and park_has_operating_attraction(park)
+        parks.append(park)
+    debug.info(f"Loaded state checkpoint ({len(parks)} parks, {age / 60:.0f} min old).")
+    return parks
+
+
+def park_list_from_checkpoint(parks):
+    """
+    Rebuild the configured park list (as resolve_parks_from_config returns it)
+    from checkpointed parks, for starting up while the network is unreachable.
+    """
+    return [{"id": park.get("id"), "name": park.get("name"), "destination_id": park.get("destination_id"),
+             "location": park.get("location"), "schedule": park.get("schedule", [])}
+            for park in parks]
+
+
+def restore_checkpointed_state(fresh_parks, checkpointed_parks):
+    """
+    Carry live state from checkpointed (stale) parks onto freshly fetched parks:
+    attraction live fields, including down_since history, the park's
+    'operating' flag and its last weather. Restored parks stay stale until
+    their first live fetch.
+    """
+    previous = {park.get("id"): park for park in checkpointed_parks if park.get("stale")}
+    for park in fresh_parks:
+        old_park = previous.get(park.get("id"))
+        if old_park is None:
+            continue
+        old_attractions = {attr.get("id"): attr for attr in old_park.get("attractions", [])}
+        for attraction in park.get("attractions", []):
+            old = old_attractions.get(attraction.get("id"))
+            if old is None:
+                continue
+            for field in LIVE_FIELDS:
+                if field in old:
+                    attraction[field] = old[field]
+        park["operating"] = old_park.get("operating", False)
+        park["weather"] = park.get("weather") or old_park.get("weather")
+        park["stale"] = True
+    return fresh_parks
+
+
+async def checkpoint_writer(parks_data, interval=CHECKPOINT_INTERVAL_SECS, path=CHECKPOINT_PATH):
+    """
+    Checkpoint task: snapshot parks_data on the event loop (where every write to
+    it happens) and hand the file write to the blocking-I/O worker.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        if not parks_data or any(park.get("stale") for park in parks_data):
+            continue
+        try:
+            await run_blocking(write_checkpoint, snapshot(parks_data), path)
+            debug.log(f"State checkpoint written to {path}")
+        except Exception as e:
+            debug.error(f"Failed to write state checkpoint {path}: {e}")
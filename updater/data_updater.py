@@ -1,101 +1,392 @@
 import asyncio
 import time
 import traceback
+from datetime import datetime, timedelta, timezone
 
-from api.disney_api import fetch_parks_and_attractions, fetch_live_data, update_parks_operating_status
-from api.weather import fetch_weather_data
-from utils import debug
-from utils.utils import get_eastern
+from api.disney_api import (
+    apply_park_schedule,
+    fetch_live_data,
+    fetch_park_children,
+    fetch_park_live_data,
+    fetch_park_schedule,
+    fetch_park_and_attractions,
+    reconcile_park_attractions,
+    roster_refresh_due,
+    schedule_windows,
+    update_parks_operating_status,
+)
+from api.weather import refresh_interval, refresh_weather
+from updater.checkpoint import restore_checkpointed_state
+from updater.poll_scheduler import ParkPollScheduler
+from updater.schedule_timers import CLOSING, ScheduleTimers
+from utils import bandwidth, connectivity, debug, latency, metrics
+from utils.utils import run_blocking
+
+SCHEDULE_CHECK_SECS = 30
+TRAFFIC_REPORT_SECS = 300
+# How long before a scheduled opening a closed park's data is prefetched.
+PREFETCH_LEAD = timedelta(minutes=5)
+# A roster that would fall due within this window is refreshed during the
+# prefetch, so the daily refresh lands before opening rather than mid-day.
+PREFETCH_ROSTER_AHEAD_SECS = 12 * 60 * 60
+# Closed parks with no upcoming opening in their schedule re-fetch it this often,
+# whether the prefetcher or a paused WebSocket destination asks.
+SCHEDULE_LOOKAHEAD_SECS = 30 * 60
+
+# Park id -> monotonic time its schedule was last re-fetched to find the next opening
+_schedule_lookahead_at = {}
 
 
 def merge_live_data(existing_attractions, new_live_data):
     """ Update existing attractions with new live data. Preserve the 'down_since' field if it already exists. """
 
+    started = time.perf_counter()
     # Create a mapping from attraction id to the existing attraction object.
     attraction_map = {attr["id"]: attr for attr in existing_attractions}
-    debug.log(f"Starting to update new live data for attractions.")
+    debug.log("Starting to update new live data for attractions.")
     for new_attr in new_live_data:
         attr_id = new_attr.get("id")
 
         if attr_id in attraction_map:
             # Merge the new live data fields into the existing attraction.
             existing = attraction_map[attr_id]
+            previous_display = latency.display_state(existing)
             existing.update({
                 "waitTime": new_attr.get("waitTime"),
                 "status": new_attr.get("status"),
                 "lastUpdatedTs": new_attr.get("lastUpdatedTs")
             })
+            for field in ("boardingGroup", "lastUpdatedEpoch"):
+                if field in new_attr:
+                    existing[field] = new_attr[field]
 
             # Do not overwrite down_since if already set, unless status is no longer DOWN.
             if new_attr.get("status") != "DOWN":
                 existing["down_since"] = ""
+                existing.pop("down_since_epoch", None)
             else:
                 # If it's still DOWN and down_since is not set, set it now.
                 if not existing.get("down_since"):
                     existing["down_since"] = new_attr.get("lastUpdatedTs")
+                    existing["down_since_epoch"] = new_attr.get("lastUpdatedEpoch")
                     debug.info(f"DOWN (REST): {existing.get('name')} — down_since set to {existing['down_since']}")
+            if latency.display_state(existing) != previous_display:
+                latency.note_change(attr_id, "rest")
         else:
             # If new attraction is not present in the existing map, add it.
             attraction_map[attr_id] = new_attr
             debug.info(f"Adding new attraction {attr_id}: {new_attr}")
+    metrics.observe("merge_seconds", time.perf_counter() - started)
     return list(attraction_map.values())
 
 
-def update_parks_live_data(parks, use_websocket=False):
-    """
-    For each park in parks, update live data for attractions.
-    If use_websocket is True, skip HTTP live data fetching — the WS handles it.
-    """
+async def update_parks_live_data(parks, session=None):
+    """ For each park in parks, fetch live data for its attractions and merge it in. """
     for park in parks:
-        if not use_websocket and park.get("attractions"):
-            new_live_data = asyncio.run(fetch_live_data(park["attractions"]))
+        if park.get("attractions"):
+            new_live_data = await fetch_live_data(park["attractions"], session)
+            # A failed fetch hands back the attraction itself; the park stays
+            # stale (and out of the checkpoint) until a response arrives.
+            fetched = any(new is not old for new, old in zip(new_live_data, park["attractions"]))
             park["attractions"] = merge_live_data(park["attractions"], new_live_data)
+            if fetched:
+                park.pop("stale", None)
 
-        if park.get("location") and park.get("operating"):
-            park["weather"] = fetch_weather_data(park.get("location").get("latitude"), park.get("location").get("longitude"))
-
-    debug.log(f"Updated parks data: {parks}")
+    debug.log("Updated parks data: %s", parks)
     return parks
 
 
-def live_data_updater(disney_park_list, update_interval, parks_data, use_websocket=False):
+def publish_park(parks_data, park, park_order):
+    """
+    Put park into the shared parks list: replace the entry with the same id (a
+    stale checkpoint the display is already showing), or insert it at its
+    configured position among the parks published so far.
+    """
+    for index, existing in enumerate(parks_data):
+        if existing.get("id") == park.get("id"):
+            parks_data[index] = park
+            return
+    rank = park_order.get(park.get("id"), len(park_order))
+    position = sum(1 for existing in parks_data if park_order.get(existing.get("id"), len(park_order)) < rank)
+    parks_data.insert(position, park)
+
+
+async def bootstrap_parks_data(disney_park_list, parks_data, session, use_websocket=False):
     """
-    Background thread that updates live data for parks every 'update_interval' seconds.
-    When use_websocket is True, skips HTTP live data polling — the WS thread handles that —
-    but continues to poll weather every update_interval seconds.
-    Always performs an initial REST live data fetch so attractions have data before WS catches up.
+    Populate parks_data one park at a time: roster, schedule and weather, then an
+    initial REST live fetch, after which the park is published so the display can
+    show it while the remaining parks load. Live state from a checkpoint loaded
+    at boot carries over until fresh data arrives; a park whose roster can't be
+    fetched keeps its checkpointed entry. Returns the ids of the parks whose live
+    data was fetched, so the poller can start them on their regular slots.
     """
-    parks_data[:] = fetch_parks_and_attractions(disney_park_list)
+    started = time.monotonic()
+    park_order = {park_info.get("id"): index for index, park_info in enumerate(disney_park_list)}
+    fetched_ids = []
+    for park_info in disney_park_list:
+        park = await run_blocking(fetch_park_and_attractions, park_info)
+        if park is None:
+            continue
+        restore_checkpointed_state([park], parks_data)
+        try:
+            await refresh_weather([park], session)
+        except Exception as e:
+            # The weather task retries later; startup must not stop for it.
+            debug.error(f"Error fetching weather for {park.get('name')}: {e}")
+        await update_parks_live_data([park], session)
+        update_parks_operating_status([park])
+        publish_park(parks_data, park, park_order)
+        fetched_ids.append(park["id"])
+        debug.info(f"Startup: {park['name']} ready after {time.monotonic() - started:.1f}s "
+                   f"({len(fetched_ids)}/{len(disney_park_list)} parks).")
     if use_websocket:
-        debug.info("WebSocket mode: performing initial REST live data fetch, then handing off to WS.")
-        initial_parks = update_parks_live_data(list(parks_data), use_websocket=False)
-        initial_parks = update_parks_operating_status(initial_parks)
-        parks_data[:] = initial_parks
         debug.info("Initial REST live data fetch complete — WebSocket will handle attraction updates.")
+    return fetched_ids
+
+
+async def run_park_slots(parks_data, interval, poll_due_parks, label, polled_ids=()):
+    """
+    Call poll_due_parks(due_parks) for each park on its own staggered slot within
+    'interval' (see ParkPollScheduler), until cancelled. The interval stretches
+    while the bandwidth budget is nearly spent, and polling is suspended while
+    utils.connectivity reports the network offline. Parks in polled_ids were just
+    fetched elsewhere and wait for their regular slot instead of polling at once.
+    """
+    scheduler = ParkPollScheduler(interval)
+    if parks_data and polled_ids:
+        scheduler.sync([park["id"] for park in parks_data])
+        for park_id in polled_ids:
+            scheduler.mark_polled(park_id)
     while True:
+        if not connectivity.network_allowed():
+            # Offline: the display keeps its cached data; due parks are polled
+            # together as the next connectivity probe.
+            await asyncio.sleep(connectivity.seconds_until_retry())
+            continue
         try:
+            scheduler.set_interval(interval * bandwidth.interval_multiplier())
             if parks_data:
-                updated_parks = update_parks_live_data(parks_data, use_websocket=use_websocket)
-                # Runs in websocket mode too: the WS thread defers schedule
-                # fetches (schedule_refresh_needed) to this thread.
-                updated_parks = update_parks_operating_status(updated_parks)
-                parks_data[:] = updated_parks
-                if use_websocket:
-                    debug.info("REST loop (websocket_only mode): weather refreshed, attraction polling skipped.")
-                else:
-                    for park in updated_parks:
-                        attrs = park.get("attractions") or []
-                        total = len(attrs)
-                        down = [a for a in attrs if a.get("status") == "DOWN"]
-                        operating = [a for a in attrs if a.get("status") == "OPERATING"]
-                        debug.info(
-                            f"REST poll [{park['name']}]: {len(operating)} operating, "
-                            f"{len(down)} DOWN, {total} total"
-                            + (f" | DOWN: {', '.join(a['name'] for a in down)}" if down else "")
-                        )
+                scheduler.sync([park["id"] for park in parks_data])
+                due_ids = set(scheduler.due_parks())
+                due_parks = [park for park in parks_data if park["id"] in due_ids]
+                # Claim the slots up front so a failing park waits for its next
+                # slot instead of being retried in a tight loop.
+                for park in due_parks:
+                    scheduler.mark_polled(park["id"])
+                if due_parks:
+                    await poll_due_parks(due_parks)
             else:
-                debug.warning("No parks found during live data update.")
+                debug.warning(f"No parks found during {label} update.")
+        except Exception as e:
+            debug.error(f"Error during {label} update: {e}")
+            debug.error(traceback.format_exc())
+        await asyncio.sleep(scheduler.seconds_until_next() if parks_data else scheduler.interval)
+
+
+async def live_data_poller(parks_data, update_interval, session, polled_ids=()):
+    """
+    REST polling task (no WebSocket): refresh each park's live data on its slot.
+    polled_ids are parks bootstrap has already fetched.
+    """
+
+    async def poll(due_parks):
+        await update_parks_live_data(due_parks, session)
+        # Schedule fetches are blocking HTTP; they're flagged here and serviced
+        # by schedule_refresher off the event loop.
+        update_parks_operating_status(due_parks)
+        for park in due_parks:
+            attrs = park.get("attractions") or []
+            total = len(attrs)
+            down = [a for a in attrs if a.get("status") == "DOWN"]
+            operating = [a for a in attrs if a.get("status") == "OPERATING"]
+            debug.info(
+                f"REST poll [{park['name']}]: {len(operating)} operating, "
+                f"{len(down)} DOWN, {total} total"
+                + (f" | DOWN: {', '.join(a['name'] for a in down)}" if down else "")
+            )
+
+    await run_park_slots(parks_data, update_interval, poll, "live data", polled_ids=polled_ids)
+
+
+async def weather_refresher(parks_data, session, interval=None):
+    """
+    Weather task, on its own interval (weather refresh_minutes): refresh every
+    operating park's weather with one concurrent request per coordinate bucket.
+    Requests carry their own timeout and only touch park['weather'], so a slow
+    weather service never holds up live data. Skipped while bandwidth is short
+    or the network is offline.
+    """
+    interval = refresh_interval() if interval is None else interval
+    while True:
+        try:
+            parks = [park for park in parks_data if park.get("operating") and park.get("location")]
+            if parks and connectivity.network_allowed():
+                if bandwidth.low_priority_allowed():
+                    regions = await refresh_weather(parks, session)
+                    debug.info(f"Weather refreshed for: {', '.join(p['name'] for p in parks)} ({regions} regions)")
+                else:
+                    debug.log(f"Bandwidth budget nearly spent; skipping weather for: "
+                              f"{', '.join(p['name'] for p in parks)}")
+        except Exception as e:
+            debug.error(f"Error during weather update: {e}")
+            debug.error(traceback.format_exc())
+        await asyncio.sleep(interval * bandwidth.interval_multiplier())
+
+
+async def schedule_refresher(parks_data, check_interval=SCHEDULE_CHECK_SECS):
+    """
+    Schedule task: services the 'schedule_refresh_needed' flag that
+    update_parks_operating_status sets when a park opens, and refreshes rosters
+    when roster_refresh_due says so (an unknown attraction showed up in live
+    data, or the roster is a day old). The fetches run on the executor; the
+    results are applied here on the event loop.
+    """
+    while True:
+        try:
+            # Offline, the flags stay set until network calls are allowed again.
+            parks = list(parks_data) if connectivity.network_allowed() else []
+            for park in parks:
+                if park.get("schedule_refresh_needed"):
+                    debug.info(f"{park.get('name')} is now operating. Fetching schedule...")
+                    schedule = await run_blocking(fetch_park_schedule, park.get("id"))
+                    apply_park_schedule(park, schedule)
+                    park["schedule_refresh_needed"] = False
+                # The roster is low priority: skip it while bandwidth is short.
+                if roster_refresh_due(park) and bandwidth.low_priority_allowed():
+                    # Stamp the attempt first so a failing fetch is rate limited too.
+                    park["roster_refreshed_at"] = time.time()
+                    children = await run_blocking(fetch_park_children, park)
+                    if children is not None:
+                        reconcile_park_attractions(park, children)
+        except Exception as e:
+            debug.error(f"Error during schedule refresh: {e}")
+            debug.error(traceback.format_exc())
+        await asyncio.sleep(check_interval)
+
+
+def next_opening(park, now, lead=PREFETCH_LEAD):
+    """
+    The opening time of the park's next scheduled window that hasn't closed yet
+    and didn't open more than 'lead' ago, or None if the schedule has none.
+    """
+    openings = [opening for opening, closing in schedule_windows(park.get("schedule"))
+                if closing > now and opening > now - lead]
+    return min(openings) if openings else None
+
+
+async def prefetch_park(park, session):
+    """
+    Warm a closed park up for its opening: schedule, roster (if due soon),
+    weather and one bulk live snapshot, so nothing blocking is left to do when
+    it flips to operating. Returns True if the schedule and (for a park with
+    attractions) the live snapshot were both fetched.
+    """
+    schedule = await run_blocking(fetch_park_schedule, park.get("id"))
+    if schedule:
+        apply_park_schedule(park, schedule)
+    if bandwidth.low_priority_allowed():
+        if roster_refresh_due(park, now=time.time() + PREFETCH_ROSTER_AHEAD_SECS):
+            park["roster_refreshed_at"] = time.time()
+            children = await run_blocking(fetch_park_children, park)
+            if children is not None:
+                reconcile_park_attractions(park, children)
+        await refresh_weather([park], session)
+    live = None
+    if park.get("attractions"):
+        live = await fetch_park_live_data(session, park)
+        if live:
+            park["attractions"] = merge_live_data(park["attractions"], live)
+            park.pop("stale", None)
+    if not schedule or (park.get("attractions") and not live):
+        debug.warning(f"Prefetch for {park.get('name')} incomplete; will retry before opening.")
+        return False
+    debug.info(f"Prefetched {park.get('name')} ahead of its {park.get('openingTime')} opening.")
+    return True
+
+
+async def opening_prefetcher(parks_data, session, lead=PREFETCH_LEAD, check_interval=SCHEDULE_CHECK_SECS):
+    """
+    Prefetch task: 'lead' before each closed park's scheduled opening, run
+    prefetch_park once for that opening. A successful prefetch marks the park
+    'prefetched_for' so update_parks_operating_status doesn't ask for a schedule
+    refresh when it opens; a failed one is retried on the next check.
+    """
+    while True:
+        try:
+            now = datetime.now(timezone.utc)
+            parks = list(parks_data) if connectivity.network_allowed() else []
+            for park in parks:
+                if park.get("operating"):
+                    continue
+                opening = next_opening(park, now, lead)
+                if opening is None:
+                    await look_ahead_schedule(park)
+                    continue
+                key = opening.isoformat()
+                if opening - now > lead or park.get("prefetched_for") == key:
+                    continue
+                if await prefetch_park(park, session):
+                    park["prefetched_for"] = key
+        except Exception as e:
+            debug.error(f"Error during opening prefetch: {e}")
+            debug.error(traceback.format_exc())
+        await asyncio.sleep(check_interval)
+
+
+async def look_ahead_schedule(park):
+    """Re-fetch a closed park's schedule (rate limited) so its next opening becomes known."""
+    last = _schedule_lookahead_at.get(park.get("id"))
+    if last is not None and time.monotonic() - last < SCHEDULE_LOOKAHEAD_SECS:
+        return
+    _schedule_lookahead_at[park.get("id")] = time.monotonic()
+    schedule = await run_blocking(fetch_park_schedule, park.get("id"))
+    if schedule:
+        apply_park_schedule(park, schedule)
+
+
+def apply_schedule_transition(park, transition):
+    """
+    Apply a fired schedule timer. At closing the park stops operating at once;
+    at opening its live data decides (it flips as soon as an attraction is
+    OPERATING, which for a prefetched park is immediately).
+    """
+    was_operating = bool(park.get("operating"))
+    if transition == CLOSING:
+        park["operating"] = False
+    else:
+        update_parks_operating_status([park])
+    if bool(park.get("operating")) != was_operating:
+        debug.info(f"{park.get('name')} {'opened' if park['operating'] else 'closed'} at its scheduled {transition} time.")
+
+
+async def schedule_transitions(parks_data, check_interval=SCHEDULE_CHECK_SECS):
+    """
+    Schedule engine task: keeps a ScheduleTimers armed from each park's parsed
+    opening/closing epochs and applies each transition the moment it fires.
+    Re-syncs at least every check_interval to pick up schedule changes.
+    """
+    timers = ScheduleTimers()
+    while True:
+        try:
+            timers.sync(parks_data)
+            parks_by_id = {park.get("id"): park for park in parks_data}
+            for park_id, transition in timers.due():
+                park = parks_by_id.get(park_id)
+                if park is not None:
+                    apply_schedule_transition(park, transition)
         except Exception as e:
-            debug.error(f"Error during live data update: {e}")
+            debug.error(f"Error applying schedule transitions: {e}")
             debug.error(traceback.format_exc())
-        time.sleep(update_interval)
\ No newline at end of file
+        wait = timers.seconds_until_next()
+        await asyncio.sleep(check_interval if wait is None else min(wait, check_interval))
+
+
+async def traffic_reporter(interval=TRAFFIC_REPORT_SECS):
+    """ Periodically log bytes used per endpoint and connection, and re-evaluate the budget. """
+    while True:
+        await asyncio.sleep(interval)
+        bandwidth.is_throttled()
+        debug.info(bandwidth.traffic_report())
+        if connectivity.is_offline():
+            debug.info(f"Network: {connectivity.status_summary()}")
+        debug.log(debug.queue_handler.summary())
@@ -0,0 +1,88 @@
+import time
+
+
+class ParkPollScheduler:
+    """
+    Spreads per-park polls evenly across one update interval instead of polling
+    every park back to back. With n parks, park i owns the phase i * interval / n
+    of every cycle, so requests (and the CPU spent merging their results) arrive
+    in n small steps rather than one burst.
+
+    Membership is re-synced from the live parks list on every pass: new parks are
+    due immediately (they have no data yet), removed parks are dropped, and the
+    survivors are re-spread over the new slot layout. A park is never rescheduled
+    sooner than half an interval after its last poll, so a re-spread can't cause
+    a double poll, and never later than one and a half intervals.
+    """
+
+    def __init__(self, interval, clock=time.monotonic):
+        self.interval = interval
+        self._clock = clock
+        self._epoch = clock()
+        self._order = []
+        self._phase = {}        # park id -> offset into the cycle (seconds)
+        self._last_polled = {}  # park id -> clock value of the last poll
+        self._next_due = {}     # park id -> clock value the park is next due
+
+    def sync(self, park_ids):
+        """Adopt the current park membership, re-spreading phases if it changed."""
+        ids = list(dict.fromkeys(park_ids))
+        if ids == self._order:
+            return
+
+        now = self._clock()
+        self._order = ids
+        count = len(ids)
+        self._phase = {park_id: index * self.interval / count for index, park_id in enumerate(ids)}
+
+        for park_id in list(self._next_due):
+            if park_id not in self._phase:
+                del self._next_due[park_id]
+                self._last_polled.pop(park_id, None)
+
+        for park_id in ids:
+            if park_id in self._last_polled:
+                self._next_due[park_id] = self._next_slot(park_id, self._last_polled[park_id])
+            else:
+                self._next_due[park_id] = now
+
+    def set_interval(self, interval):
+        """Change the cycle length, re-spreading phases and rescheduling from each park's last poll."""
+        if interval == self.interval:
+            return
+        self.interval = interval
+        count = len(self._order)
+        self._phase = {park_id: index * interval / count for index, park_id in enumerate(self._order)}
+        for park_id, polled_at in self._last_polled.items():
+            self._next_due[park_id] = self._next_slot(park_id, polled_at)
+
+    def due_parks(self, now=None):
+        """Return the ids of parks whose slot has arrived, in park order."""
+        now = self._clock() if now is None else now
+        return [park_id for park_id in self._order if self._next_due[park_id] <= now]
+
+    def mark_polled(self, park_id, now=None):
+        """Record a completed poll and schedule the park's next slot."""
+        if park_id not in self._phase:
+            return
+        now = self._clock() if now is None else now
+        self._last_polled[park_id] = now
+        self._next_due[park_id] = self._next_slot(park_id, now)
+
+    def seconds_until_next(self, now=None):
+        """Seconds until the earliest park is due (0 if one is already due)."""
+        if not self._next_due:
+            return self.interval
+        now = self._clock() if now is None else now
+        return max(0.0, min(self._next_due.values()) - now)
+
+    def _next_slot(self, park_id, polled_at):
+        """First slot for park_id that is at least half an interval after polled_at."""
+        if self.interval <= 0:
+            return polled_at
+        earliest = polled_at + self.interval / 2
+        slot = self._epoch + self._phase[park_id]
+        if slot < earliest:
+            cycles = -(-(earliest - slot) // self.interval)  # ceiling division
+            slot += cycles * self.interval
+        return slot
@@ -0,0 +1,92 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from api.disney_api import create_client_session, resolve_parks_from_config
+from updater.checkpoint import checkpoint_writer, park_list_from_checkpoint
+from updater.data_updater import (
+    bootstrap_parks_data,
+    live_data_poller,
+    opening_prefetcher,
+    schedule_refresher,
+    schedule_transitions,
+    traffic_reporter,
+    weather_refresher,
+)
+from updater.websocket_updater import websocket_live_updater, ws_state_auditor
+from utils import debug
+from utils.utils import run_blocking
+
+# Blocking libraries (requests) run here, one call at a time, so they
+# never stall the event loop and never add more than one extra thread.
+_BLOCKING_IO_WORKERS = 1
+
+
+async def resolve_configured_parks(park_names, parks_data):
+    """
+    Resolve the configured parks after a warm start, while the display shows the
+    checkpoint. Checkpointed parks that are no longer configured are dropped; if
+    the parks can't be resolved (offline boot), the checkpoint's parks are used.
+    """
+    disney_park_list = await run_blocking(resolve_parks_from_config, park_names)
+    if not disney_park_list:
+        debug.warning("Could not resolve parks from config; running on the state checkpoint.")
+        return park_list_from_checkpoint(parks_data)
+    park_ids = {park.get("id") for park in disney_park_list}
+    parks_data[:] = [park for park in parks_data if park.get("id") in park_ids]
+    return disney_park_list
+
+
+async def run_updaters(disney_park_list, update_interval, parks_data, api_key=None, use_websocket=False,
+                       websocket_connections=1, checkpoint_interval=0, park_names=None):
+    """
+    Run every data updater as a cooperating task on the current event loop:
+    REST live data polling (or the WebSocket client, spread over
+    websocket_connections sockets, plus its REST auditor), weather refresh,
+    schedule refresh and transitions, pre-opening prefetch, traffic
+    reporting and, when checkpoint_interval is set, state checkpointing.
+    All writes to parks_data happen on this loop. A disney_park_list of None
+    means the parks are resolved here from park_names (see resolve_configured_parks).
+    """
+    if disney_park_list is None:
+        disney_park_list = await resolve_configured_parks(park_names, parks_data)
+    async with create_client_session() as session:
+        polled_ids = await bootstrap_parks_data(disney_park_list, parks_data, session, use_websocket=use_websocket)
+
+        tasks = [
+            weather_refresher(parks_data, session),
+            schedule_refresher(parks_data),
+            schedule_transitions(parks_data),
+            opening_prefetcher(parks_data, session),
+            traffic_reporter(),
+        ]
+        if checkpoint_interval:
+            tasks.append(checkpoint_writer(parks_data, checkpoint_interval))
+        if use_websocket:
+            tasks.append(websocket_live_updater(api_key, parks_data, session, connections=websocket_connections))
+            tasks.append(ws_state_auditor(parks_data, session))
+        else:
+            tasks.append(live_data_poller(parks_data, update_interval, session, polled_ids=polled_ids or ()))
+        await asyncio.gather(*tasks)
+
+
+def live_updates_runtime(disney_park_list, update_interval, parks_data, api_key=None, use_websocket=False,
+                         websocket_connections=1, checkpoint_interval=0, park_names=None):
+    """
+    Background thread entry point: one event loop (plus a single blocking-I/O
+    worker) drives all live updates while the main thread renders.
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    executor = ThreadPoolExecutor(max_workers=_BLOCKING_IO_WORKERS, thread_name_prefix="blocking-io")
+    loop.set_default_executor(executor)
+    debug.info("Live updates runtime started.")
+    try:
+        loop.run_until_complete(
+            run_updaters(disney_park_list, update_interval, parks_data,
+                         api_key=api_key, use_websocket=use_websocket,
+                         websocket_connections=websocket_connections,
+                         checkpoint_interval=checkpoint_interval, park_names=park_names)
+        )
+    finally:
+        executor.shutdown(wait=False)
+        loop.close()
@@ -0,0 +1,65 @@
+import heapq
+import time
+
+OPENING = "opening"
+CLOSING = "closing"
+
+
+class ScheduleTimers:
+    """
+    Timer queue for park open/close transitions. Each park's opening and closing
+    times are read as epoch seconds ('openingEpoch' / 'closingEpoch', parsed once
+    when the schedule is applied) and armed as timers; nothing is re-parsed
+    between schedule updates.
+
+    Membership and times are re-synced from the live parks list on every pass.
+    A park whose times changed is re-armed: its old timers stay in the heap but
+    are discarded when they surface, because they carry a stale generation.
+    """
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._heap = []        # (epoch, sequence, park id, generation, transition)
+        self._sequence = 0
+        self._armed = {}       # park id -> (openingEpoch, closingEpoch) last armed
+        self._generation = {}  # park id -> current generation
+
+    def sync(self, parks):
+        """Arm timers for parks that are new or whose schedule times changed."""
+        current = {park.get("id"): park for park in parks}
+        for park_id in list(self._armed):
+            if park_id not in current:
+                del self._armed[park_id]
+                self._generation.pop(park_id, None)
+
+        now = self._clock()
+        for park_id, park in current.items():
+            times = (park.get("openingEpoch"), park.get("closingEpoch"))
+            if self._armed.get(park_id) == times:
+                continue
+            self._armed[park_id] = times
+            generation = self._generation.get(park_id, 0) + 1
+            self._generation[park_id] = generation
+            for epoch, transition in zip(times, (OPENING, CLOSING)):
+                if epoch is not None and epoch > now:
+                    self._sequence += 1
+                    heapq.heappush(self._heap, (epoch, self._sequence, park_id, generation, transition))
+
+    def due(self, now=None):
+        """Pop and return (park id, transition) for every timer that has fired, in time order."""
+        now = self._clock() if now is None else now
+        fired = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, park_id, generation, transition = heapq.heappop(self._heap)
+            if self._generation.get(park_id) == generation:
+                fired.append((park_id, transition))
+        return fired
+
+    def seconds_until_next(self, now=None):
+        """Seconds until the next live timer fires, or None if none are armed."""
+        while self._heap and self._generation.get(self._heap[0][2]) != self._heap[0][3]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        now = self._clock() if now is None else now
+        return max(0.0, self._heap[0][0] - now)
@@ -3,21 +3,39 @@ import json
 import ssl
 import time
 import traceback
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import aiohttp
 import certifi
 
-from api.disney_api import fetch_live_data, get_down_time, update_parks_operating_status
-from updater.data_updater import merge_live_data
-from utils import debug
+from api.disney_api import (
+    apply_queue_data,
+    fetch_park_live_data,
+    note_unknown_attraction,
+    schedule_windows,
+    update_parks_operating_status,
+)
+from updater.data_updater import look_ahead_schedule, merge_live_data
+from utils import bandwidth, connectivity, debug, latency, metrics
 
 WS_URL = "wss://ws.themeparks.wiki/v1/live"
 _RECONNECT_DELAY_INITIAL = 5
 _RECONNECT_DELAY_MAX = 60
 _WS_HEARTBEAT_SECS = 30
 _WS_RECEIVE_TIMEOUT_SECS = 120
+# Negotiate permessage-deflate with the server's maximum window (2**15 bytes).
+_WS_COMPRESS_WBITS = 15
 _STABLE_CONNECTION_SECS = 60
+# After a reconnect, only parks that have gone this long without a WS message
+# (for the park or its destination) are re-fetched over REST.
+_RECONNECT_REFRESH_GAP_SECS = 60
+# The auditor re-checks one park per cycle against a single bulk REST request.
+_AUDIT_INTERVAL_SECS = 60
+# Schedule-aware subscriptions: a destination is streamed from WARM_UP before its
+# first park opens until GRACE after its last park closes.
+_SUBSCRIPTION_CHECK_SECS = 60
+_SUBSCRIPTION_WARM_UP = timedelta(minutes=15)
+_SUBSCRIPTION_GRACE = timedelta(minutes=30)
 
 
 def _next_delay(current_delay, connection_duration):
@@ -31,6 +49,56 @@ def _next_delay(current_delay, connection_duration):
 _ws_msg_count = 0
 _ws_last_heartbeat = None
 
+# Destination or park id -> monotonic time of the last WS message about it
+_last_message_at = {}
+# Attraction id -> monotonic time the WS last applied an update to it
+_ws_applied_at = {}
+# Strong references to fire-and-forget tasks so they aren't garbage collected
+_background_tasks = set()
+# Destinations unsubscribed outside their scheduled hours; stray events are dropped
+_paused_destinations = set()
+# Shard index -> connection health, one entry per WebSocket connection
+ws_shard_health = {}
+# Running totals reported by the WS state auditor
+audit_stats = {"parks_audited": 0, "attractions_checked": 0, "drift_detected": 0}
+
+
+def _note_message(*entity_ids):
+    """Record that the stream was alive for these destination/park ids just now."""
+    now = time.monotonic()
+    for entity_id in entity_ids:
+        if entity_id:
+            _last_message_at[entity_id] = now
+
+
+def _updated_by_ws_since(entity_id, since):
+    """True if the WS applied an update to entity_id after monotonic time 'since'."""
+    return _ws_applied_at.get(entity_id, 0) >= since
+
+
+def _parks_needing_refresh(parks_data, now, gap_threshold=_RECONNECT_REFRESH_GAP_SECS):
+    """
+    Parks whose most recent WS message (for the park itself or its destination)
+    is older than gap_threshold, or that have never had one.
+    """
+    stale = []
+    for park in parks_data:
+        if not park.get("attractions"):
+            continue
+        seen = [_last_message_at[key] for key in (park.get("id"), park.get("destination_id"))
+                if key in _last_message_at]
+        if not seen or now - max(seen) > gap_threshold:
+            stale.append(park)
+    return stale
+
+
+def _format_shard_health():
+    return ", ".join(
+        f"#{index + 1} {'up' if health['connected'] else 'down'} "
+        f"({len(health['destinations'])} dest, {health['messages']} msgs, {health['disconnects']} drops)"
+        for index, health in sorted(ws_shard_health.items())
+    )
+
 
 def _log_ws_heartbeat(force=False):
     """Log a periodic WS health summary every 5 minutes."""
@@ -43,6 +111,7 @@ def _log_ws_heartbeat(force=False):
         debug.info(
             f"WS heartbeat: {_ws_msg_count} messages received in last "
             f"{int(elapsed)}s (since {_ws_last_heartbeat.strftime('%H:%M:%S')} UTC)"
+            + (f" | shards: {_format_shard_health()}" if len(ws_shard_health) > 1 else "")
         )
         _ws_msg_count = 0
         _ws_last_heartbeat = now
@@ -53,9 +122,10 @@ def _apply_live_update(data, parks_data):
     global _ws_msg_count
     _ws_msg_count += 1
     event = data.get("event")
-    debug.log(f"WS message: {data}")
+    debug.log("WS message: %s", data)
 
     if event == "subscribed":
+        _note_message(data.get("entityId"))
         debug.info(f"WebSocket subscribed to: {data.get('name') or data.get('entityId')}")
         return
 
@@ -69,57 +139,267 @@ def _apply_live_update(data, parks_data):
     entity_id = data.get("entityId")
     live = data.get("data") or {}
     status = live.get("status")
-    last_updated = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    received_at = time.time()
+    last_updated = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(received_at))
 
     for park in parks_data:
         for attr in park.get("attractions", []):
             if attr.get("id") != entity_id:
                 continue
+            if park.get("destination_id") in _paused_destinations:
+                return
 
+            _note_message(park.get("id"), park.get("destination_id"))
+            _ws_applied_at[entity_id] = time.monotonic()
             prev_status = attr.get("status")
+            prev_display = latency.display_state(attr)
             attr["status"] = status
             attr["lastUpdatedTs"] = last_updated
+            attr["lastUpdatedEpoch"] = received_at
 
             if status == "DOWN":
                 if not attr.get("down_since"):
                     attr["down_since"] = last_updated
+                    attr["down_since_epoch"] = received_at
                     debug.info(f"DOWN (WS): {attr['name']} ({park['name']}) — down_since set to {last_updated}")
-                down_time = get_down_time(attr["down_since"])
-                attr["waitTime"] = f"Down {down_time}" if down_time is not None else "Down"
-            elif status in ("CLOSED", "REFURBISHMENT"):
-                attr["down_since"] = ""
             else:
                 attr["down_since"] = ""
-                queue = live.get("queue", {})
-                standby = queue.get("STANDBY", {}).get("waitTime")
-                if standby is not None:
-                    attr["waitTime"] = standby
-                else:
-                    bg = queue.get("BOARDING_GROUP", {})
-                    start = bg.get("currentGroupStart")
-                    end = bg.get("currentGroupEnd")
-                    if start is not None and end is not None:
-                        attr["waitTime"] = f"Groups {start}-{end}"
-                    elif start is not None:
-                        attr["waitTime"] = f"Group {start}+"
-                    else:
-                        attr["waitTime"] = None
+                attr.pop("down_since_epoch", None)
+            apply_queue_data(attr, status, live.get("queue"))
+            if latency.display_state(attr) != prev_display:
+                latency.note_change(entity_id, "ws")
 
             if prev_status != status:
                 debug.info(
                     f"WS update: {attr['name']} ({park['name']}) "
-                    f"{prev_status} → {status}, wait={attr.get('waitTime')}"
+                    f"{prev_status} → {status}, wait={attr.get('waitTime')}, group={attr.get('boardingGroup')}"
                 )
-                # fetch_schedules=False: we're on the WS event loop — schedule
-                # fetching is blocking HTTP and is deferred to the REST thread.
-                update_parks_operating_status([park], fetch_schedules=False)
+                # Schedule fetching is blocking HTTP and is deferred to schedule_refresher.
+                update_parks_operating_status([park])
             return
 
+    # Not in any roster: if the event says which park it belongs to, ask for
+    # that park's roster to be refreshed (coalesced and rate limited).
+    park_id = live.get("parkId") or data.get("parkId")
+    for park in parks_data:
+        if park.get("id") == park_id and park.get("destination_id") not in _paused_destinations:
+            note_unknown_attraction(park, entity_id)
+            return
+
+
+def _spawn(coro):
+    task = asyncio.ensure_future(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
 
-async def _ws_loop(api_key, parks_data):
+async def _refresh_parks_after_reconnect(stale_parks, started, session):
+    """
+    Catch up after a reconnect (or a schedule-driven resubscribe): bulk-fetch
+    live data for the given parks in parallel on the runtime's shared session.
+    Attractions the new stream has already updated since 'started' keep their
+    newer WS values.
+    """
+    debug.info(f"WebSocket catch-up — refreshing live data via REST for: {[p['name'] for p in stale_parks]}")
+    try:
+        results = await asyncio.gather(*(fetch_park_live_data(session, park) for park in stale_parks))
+    except Exception as e:
+        debug.error(f"REST catch-up refresh failed: {e}")
+        return
+
+    for park, live in zip(stale_parks, results):
+        if live is None:
+            continue
+        live = [a for a in live if not _updated_by_ws_since(a["id"], started)]
+        park["attractions"] = merge_live_data(park["attractions"], live)
+        park.pop("stale", None)
+    update_parks_operating_status(stale_parks)
+    debug.info("REST catch-up refresh complete.")
+
+
+def _find_drift(current, fresh):
+    """
+    Compare the WS-maintained attraction with a REST snapshot of it and return
+    a list of (field, ws_value, rest_value) differences.
+    """
+    drift = []
+    if current.get("status") != fresh.get("status"):
+        drift.append(("status", current.get("status"), fresh.get("status")))
+    else:
+        for field in ("waitTime", "boardingGroup"):
+            if current.get(field) != fresh.get(field):
+                drift.append((field, current.get(field), fresh.get(field)))
+    return drift
+
+
+async def _audit_park(park, session):
+    """
+    Re-check one park's WS-driven state with a bulk REST request. Drifted
+    attractions are reported and repaired from the snapshot unless the stream
+    updated them while the request was in flight; a park still stale from the
+    checkpoint is current again once the snapshot has been applied.
+    """
+    started = time.monotonic()
+    live = await fetch_park_live_data(session, park)
+    if live is None:
+        return
+    current_by_id = {a["id"]: a for a in park.get("attractions", [])}
+    repairs = []
+    checked = 0
+    for fresh in live:
+        current = current_by_id.get(fresh["id"])
+        if current is None or _updated_by_ws_since(fresh["id"], started):
+            continue
+        checked += 1
+        drift = _find_drift(current, fresh)
+        if drift:
+            repairs.append(fresh)
+            debug.warning(
+                f"WS audit drift: {current.get('name')} ({park['name']}) "
+                + ", ".join(f"{field} WS={ws_value!r} REST={rest_value!r}" for field, ws_value, rest_value in drift)
+            )
+        elif (fresh.get("lastUpdatedEpoch") or 0) > (current.get("lastUpdatedEpoch") or 0):
+            # The stream only sends changes; REST confirms unchanged data is still current.
+            current["lastUpdatedTs"] = fresh.get("lastUpdatedTs")
+            current["lastUpdatedEpoch"] = fresh.get("lastUpdatedEpoch")
+    audit_stats["parks_audited"] += 1
+    audit_stats["attractions_checked"] += checked
+    audit_stats["drift_detected"] += len(repairs)
+    if repairs:
+        park["attractions"] = merge_live_data(park["attractions"], repairs)
+        update_parks_operating_status([park])
+    park.pop("stale", None)
+    debug.info(f"WS audit [{park['name']}]: {checked} attractions checked, {len(repairs)} drifted")
+
+
+async def ws_state_auditor(parks_data, session, interval=_AUDIT_INTERVAL_SECS):
+    """
+    Background task for websocket mode: every 'interval' seconds, audit the next
+    park in rotation against REST so missed WS events are noticed and repaired
+    without going back to full polling. The interval stretches while the
+    bandwidth budget is nearly spent.
+    """
+    index = 0
+    while True:
+        await asyncio.sleep(interval * bandwidth.interval_multiplier())
+        if not connectivity.network_allowed():
+            continue
+        try:
+            parks = [park for park in parks_data
+                     if park.get("attractions") and park.get("destination_id") not in _paused_destinations]
+            if not parks:
+                continue
+            park = parks[index % len(parks)]
+            index += 1
+            await _audit_park(park, session)
+        except Exception as e:
+            debug.error(f"Error during WS state audit: {e}")
+            debug.error(traceback.format_exc())
+
+
+def _parks_by_destination(parks_data, destination_ids=None):
+    destinations = {}
+    for park in parks_data:
+        dest_id = park.get("destination_id")
+        if dest_id and (destination_ids is None or dest_id in destination_ids):
+            destinations.setdefault(dest_id, []).append(park)
+    return destinations
+
+
+def _shard_destinations(parks_data, shard_index, shard_count):
+    """Destinations owned by one connection: sorted ids dealt round-robin across shards."""
+    destination_ids = sorted({p["destination_id"] for p in parks_data if p.get("destination_id")})
+    return set(destination_ids[shard_index::shard_count])
+
+
+def _destination_should_stream(parks, now):
+    """
+    True while 'now' falls inside any park's scheduled open window (widened by
+    the warm-up and grace periods). A destination with no usable schedule data
+    is always streamed, since we can't tell when it's closed.
+    """
+    windows = [window for park in parks for window in schedule_windows(park.get("schedule"))]
+    if not windows:
+        return True
+    return any(opening - _SUBSCRIPTION_WARM_UP <= now <= closing + _SUBSCRIPTION_GRACE
+               for opening, closing in windows)
+
+
+def _next_stream_start(parks, now):
+    """When the destination's next warm-up begins, or None if no later opening is known."""
+    starts = [opening - _SUBSCRIPTION_WARM_UP
+              for park in parks for opening, _ in schedule_windows(park.get("schedule"))
+              if opening - _SUBSCRIPTION_WARM_UP > now]
+    return min(starts) if starts else None
+
+
+async def _sync_subscriptions(ws, parks_data, subscribed, now, session, warm_up=True, destination_ids=None):
+    """
+    Subscribe to destinations entering their scheduled hours and unsubscribe from
+    those that have closed. A resubscribe triggers a warm-up REST refresh of the
+    destination's parks so they are current the moment they open. When
+    destination_ids is given, only those destinations (one shard's) are managed.
+    """
+    for dest_id, parks in _parks_by_destination(parks_data, destination_ids).items():
+        wanted = _destination_should_stream(parks, now)
+        if wanted and dest_id not in subscribed:
+            await ws.send_json({"event": "subscribe", "entityId": dest_id})
+            subscribed.add(dest_id)
+            _paused_destinations.discard(dest_id)
+            if warm_up:
+                debug.info(f"Destination {dest_id} opening soon — resubscribed, warming up live data.")
+                _spawn(_refresh_parks_after_reconnect([p for p in parks if p.get("attractions")], time.monotonic(),
+                                                      session))
+        elif not wanted and dest_id in subscribed:
+            await ws.send_json({"event": "unsubscribe", "entityId": dest_id})
+            subscribed.discard(dest_id)
+            _paused_destinations.add(dest_id)
+            next_start = _next_stream_start(parks, now)
+            debug.info(
+                f"All parks closed for destination {dest_id} — unsubscribed"
+                + (f" until {next_start.isoformat()}" if next_start else "")
+            )
+        elif not wanted:
+            _paused_destinations.add(dest_id)
+            if _next_stream_start(parks, now) is None:
+                # Find tomorrow's opening; shares its rate limit with the opening prefetcher.
+                for park in parks:
+                    await look_ahead_schedule(park)
+
+
+async def _manage_subscriptions(ws, parks_data, subscribed, session, destination_ids=None):
+    """Per-connection task: re-evaluate schedule-driven subscriptions every minute."""
+    while True:
+        await asyncio.sleep(_SUBSCRIPTION_CHECK_SECS)
+        try:
+            await _sync_subscriptions(ws, parks_data, subscribed, datetime.now(timezone.utc), session,
+                                      destination_ids=destination_ids)
+        except Exception as e:
+            debug.error(f"Error updating WebSocket subscriptions: {e}")
+
+
+async def _ws_loop(api_key, parks_data, rest_session, shard_index=0, shard_count=1):
+    """
+    Maintain one WebSocket connection; REST catch-up refreshes go through
+    rest_session, the runtime's shared client session. With shard_count > 1 this connection only
+    subscribes to its share of the destinations (see _shard_destinations) and keeps
+    its own backoff and health entry; every shard feeds the same parks_data.
+    """
     ssl_ctx = ssl.create_default_context(cafile=certifi.where())
     delay = _RECONNECT_DELAY_INITIAL
     is_reconnect = False
+    label = "WebSocket" if shard_count == 1 else f"WebSocket shard {shard_index + 1}/{shard_count}"
+    connection = "ws" if shard_count == 1 else f"ws-{shard_index + 1}"
+    health = ws_shard_health.setdefault(shard_index, {
+        "connected": False,
+        "connects": 0,
+        "disconnects": 0,
+        "messages": 0,
+        "last_message_at": None,
+        "reconnect_delay": delay,
+        "destinations": [],
+    })
 
     while True:
         connected_at = None
@@ -132,77 +412,114 @@ async def _ws_loop(api_key, parks_data):
                     ssl=ssl_ctx,
                     heartbeat=_WS_HEARTBEAT_SECS,
                     receive_timeout=_WS_RECEIVE_TIMEOUT_SECS,
+                    compress=_WS_COMPRESS_WBITS,
                 ) as ws:
                     connected_at = time.monotonic()
-                    if is_reconnect:
-                        debug.info("WebSocket reconnected — refreshing live data via REST.")
-                        for park in parks_data:
-                            if park.get("attractions"):
-                                new_live_data = await fetch_live_data(park["attractions"])
-                                park["attractions"] = merge_live_data(park["attractions"], new_live_data)
-                        updated = update_parks_operating_status(list(parks_data), fetch_schedules=False)
-                        parks_data[:] = updated
-                        debug.info("REST refresh after reconnect complete.")
-                    else:
-                        debug.info("WebSocket connected to ThemeParks.wiki")
-                    is_reconnect = True
-
-                    destination_ids = list({
-                        p["destination_id"] for p in parks_data
-                        if p.get("destination_id")
-                    })
+                    connectivity.record_success()
+                    health["connected"] = True
+                    health["connects"] += 1
+                    metrics.set_gauge("ws_connected", 1, connection=connection)
+                    destination_ids = _shard_destinations(parks_data, shard_index, shard_count)
+                    health["destinations"] = sorted(destination_ids)
+                    shard_parks = [p for p in parks_data if p.get("destination_id") in destination_ids]
+                    # Measure gaps before the new stream's messages refresh them.
+                    stale_parks = _parks_needing_refresh(shard_parks, connected_at) if is_reconnect else []
                     if not destination_ids:
-                        debug.warning("No destination IDs in parks_data; will retry")
+                        debug.warning(f"{label}: no destination IDs in parks_data; will retry")
                         break
 
-                    for dest_id in destination_ids:
-                        await ws.send_json({
-                            "event": "subscribe",
-                            "entityId": dest_id,
-                        })
-                    debug.info(f"Subscribed to destinations: {destination_ids}")
-
-                    async for msg in ws:
-                        _log_ws_heartbeat()
-                        if msg.type == aiohttp.WSMsgType.TEXT:
-                            debug.log(f"WS raw: {msg.data}")
-                            try:
-                                _apply_live_update(json.loads(msg.data), parks_data)
-                            except json.JSONDecodeError:
-                                debug.warning(f"Non-JSON WS message: {msg.data}")
-                        elif msg.type == aiohttp.WSMsgType.ERROR:
-                            debug.warning(f"WebSocket error message: {ws.exception()}")
-                            break
+                    subscribed = set()
+                    await _sync_subscriptions(ws, parks_data, subscribed, datetime.now(timezone.utc), rest_session,
+                                              warm_up=False, destination_ids=destination_ids)
+                    debug.info(
+                        f"{label}: subscribed to destinations: {sorted(subscribed)}"
+                        + (f" (paused until opening: {sorted(destination_ids - subscribed)})"
+                           if len(subscribed) < len(destination_ids) else "")
+                    )
+                    subscription_task = _spawn(_manage_subscriptions(ws, parks_data, subscribed, rest_session,
+                                                                     destination_ids))
+                    # Paused destinations get their warm-up refresh when they resubscribe, but
+                    # parks still stale from the checkpoint are caught up now: until they are,
+                    # no checkpoint can be written.
+                    stale_parks = [p for p in stale_parks if p.get("destination_id") not in _paused_destinations]
+                    stale_parks += [p for p in shard_parks
+                                    if p.get("stale") and p.get("attractions") and p not in stale_parks]
+
+                    try:
+                        if not is_reconnect:
+                            debug.info(f"{label} connected to ThemeParks.wiki")
+                        if stale_parks:
+                            # Resubscribed first; the catch-up refresh runs alongside the new stream.
+                            _spawn(_refresh_parks_after_reconnect(stale_parks, connected_at, rest_session))
+                        elif is_reconnect:
+                            debug.info(f"{label} reconnected — no park exceeded the gap threshold, skipping REST refresh.")
+                        is_reconnect = True
+
+                        async for msg in ws:
+                            _log_ws_heartbeat()
+                            health["messages"] += 1
+                            health["last_message_at"] = time.monotonic()
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                # aiohttp inflates compressed frames before we see them, so
+                                # this overstates wire usage; it is reported but kept out
+                                # of the budget, which only REST traffic counts towards.
+                                bandwidth.record("websocket", len(msg.data.encode()), connection=connection,
+                                                 budgeted=False)
+                                metrics.inc("ws_messages_total", connection=connection)
+                                debug.log("WS raw: %s", msg.data)
+                                try:
+                                    with metrics.timed("ws_apply_seconds"):
+                                        _apply_live_update(json.loads(msg.data), parks_data)
+                                except json.JSONDecodeError:
+                                    debug.warning(f"Non-JSON WS message: {msg.data}")
+                            elif msg.type == aiohttp.WSMsgType.ERROR:
+                                debug.warning(f"{label} error message: {ws.exception()}")
+                                break
+                    finally:
+                        subscription_task.cancel()
 
                     # aiohttp ends the async-for on close rather than yielding
                     # a CLOSED message; surface why the connection ended.
                     debug.warning(
-                        f"WebSocket receive loop ended: close_code={ws.close_code}, "
+                        f"{label} receive loop ended: close_code={ws.close_code}, "
                         f"exception={ws.exception()}"
                     )
 
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            connectivity.record_failure(e)
+            debug.warning(f"{label} connection failed: {e}")
         except Exception as e:
-            debug.error(f"WebSocket error: {e}\n{traceback.format_exc()}")
+            debug.error(f"{label} error: {e}\n{traceback.format_exc()}")
 
+        if health["connected"]:
+            health["connected"] = False
+            health["disconnects"] += 1
+            metrics.set_gauge("ws_connected", 0, connection=connection)
+            metrics.inc("ws_disconnects_total", connection=connection)
         _log_ws_heartbeat(force=True)
         duration = (time.monotonic() - connected_at) if connected_at is not None else None
         delay = _next_delay(delay, duration)
-        debug.info(f"WebSocket disconnected; reconnecting in {delay}s")
-        await asyncio.sleep(delay)
+        health["reconnect_delay"] = delay
+        # While offline, reconnects follow the shared connectivity backoff.
+        wait = max(delay, connectivity.seconds_until_retry())
+        debug.info(f"{label} disconnected; reconnecting in {wait:.0f}s")
+        await asyncio.sleep(wait)
 
 
-def websocket_live_updater(api_key, parks_data):
+async def websocket_live_updater(api_key, parks_data, session, connections=1):
     """
-    Background thread entry point. Waits for parks_data to be populated, then
-    maintains a persistent WebSocket connection for real-time attraction updates.
-    Falls back gracefully if the connection cannot be established.
+    WebSocket task. Waits for parks_data to be populated, then maintains
+    persistent WebSocket connections for real-time attraction updates; their
+    REST catch-up refreshes share the runtime's session.
+    With connections > 1, destinations are spread across that many sockets
+    (never more than there are destinations), each reconnecting independently.
+    Falls back gracefully if a connection cannot be established.
     """
     while not parks_data:
-        time.sleep(1)
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        loop.run_until_complete(_ws_loop(api_key, parks_data))
-    finally:
-        loop.close()
+        await asyncio.sleep(1)
+    destination_count = len({p["destination_id"] for p in parks_data if p.get("destination_id")})
+    shard_count = max(1, min(connections, destination_count))
+    if shard_count > 1:
+        debug.info(f"Spreading {destination_count} destinations across {shard_count} WebSocket connections.")
+    await asyncio.gather(*(_ws_loop(api_key, parks_data, session, shard, shard_count)
+                           for shard in range(shard_count)))
@@ -0,0 +1,155 @@
+import time
+from collections import deque
+
+from utils import debug
+
+# Usage is tracked in one-minute buckets over a rolling hour.
+_WINDOW_SECS = 3600
+_BUCKET_SECS = 60
+
+# Fraction of the hourly budget at which REST intervals stretch and
+# low-priority fetches (weather, rosters) are skipped.
+THROTTLE_AT = 0.8
+
+_hourly_budget = 0          # bytes per rolling hour; 0 means unlimited
+_throttle_at = THROTTLE_AT
+_buckets = deque()          # [bucket start (monotonic), bytes]
+_throttled = False
+
+# endpoint -> {"requests": n, "bytes": n}
+endpoint_totals = {}
+# connection label -> {"messages": n, "bytes": n}
+connection_totals = {}
+
+
+def configure(hourly_budget_bytes=0, throttle_at=THROTTLE_AT):
+    """Set the hourly byte budget (0 disables budgeting; accounting always runs)."""
+    global _hourly_budget, _throttle_at
+    _hourly_budget = max(0, int(hourly_budget_bytes or 0))
+    _throttle_at = throttle_at
+    if _hourly_budget:
+        debug.info(f"Bandwidth budget: {_format_bytes(_hourly_budget)} per hour "
+                   f"(throttling at {int(throttle_at * 100)}%)")
+
+
+def reset():
+    """Clear all counters and the rolling window."""
+    global _throttled
+    _buckets.clear()
+    endpoint_totals.clear()
+    connection_totals.clear()
+    _throttled = False
+
+
+def record(endpoint, nbytes, connection=None, now=None, budgeted=True):
+    """
+    Account nbytes received from endpoint (and, optionally, over a named
+    connection). Traffic recorded with budgeted=False shows in the totals but
+    doesn't count towards the hourly budget.
+    """
+    now = time.monotonic() if now is None else now
+    totals = endpoint_totals.setdefault(endpoint, {"requests": 0, "bytes": 0})
+    totals["requests"] += 1
+    totals["bytes"] += nbytes
+    if connection:
+        conn = connection_totals.setdefault(connection, {"messages": 0, "bytes": 0})
+        conn["messages"] += 1
+        conn["bytes"] += nbytes
+    if not budgeted:
+        return
+
+    bucket_start = now - (now % _BUCKET_SECS)
+    if _buckets and _buckets[-1][0] == bucket_start:
+        _buckets[-1][1] += nbytes
+    else:
+        _buckets.append([bucket_start, nbytes])
+
+
+def payload_size(response):
+    """
+    Bytes a response cost on the wire: its Content-Length when the server sent
+    one (the compressed size), otherwise the length of the body as received
+    (requests' content, or what aiohttp fed its stream), or 0 if unknown.
+    """
+    length = getattr(response, "content_length", None)
+    if length is None:
+        headers = getattr(response, "headers", None) or {}
+        length = headers.get("Content-Length")
+    try:
+        return int(length)
+    except (TypeError, ValueError):
+        pass
+    body = getattr(response, "content", None)
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    total_bytes = getattr(body, "total_bytes", None)
+    return total_bytes if isinstance(total_bytes, int) else 0
+
+
+def bytes_last_hour(now=None):
+    now = time.monotonic() if now is None else now
+    while _buckets and _buckets[0][0] <= now - _WINDOW_SECS:
+        _buckets.popleft()
+    return sum(nbytes for _, nbytes in _buckets)
+
+
+def budget_usage(now=None):
+    """Fraction of the hourly budget used in the last hour (0.0 when unlimited)."""
+    if not _hourly_budget:
+        return 0.0
+    return bytes_last_hour(now) / _hourly_budget
+
+
+def is_throttled(now=None):
+    """True while usage is at or above the throttle point; logs each transition."""
+    global _throttled
+    throttled = bool(_hourly_budget) and budget_usage(now) >= _throttle_at
+    if throttled != _throttled:
+        _throttled = throttled
+        if throttled:
+            debug.warning(f"Bandwidth budget nearly spent ({usage_summary(now)}); "
+                          "slowing REST polls and skipping weather and roster fetches.")
+        else:
+            debug.info(f"Bandwidth usage back under budget ({usage_summary(now)}); resuming normal polling.")
+    return throttled
+
+
+def interval_multiplier(now=None):
+    """Factor to stretch REST intervals by: 1 normally, 2 near the budget, 4 over it."""
+    if not is_throttled(now):
+        return 1
+    return 4 if budget_usage(now) >= 1 else 2
+
+
+def low_priority_allowed(now=None):
+    """Whether optional fetches (weather, rosters) should run."""
+    return not is_throttled(now)
+
+
+def usage_summary(now=None):
+    used = bytes_last_hour(now)
+    if not _hourly_budget:
+        return f"{_format_bytes(used)} in the last hour"
+    return f"{_format_bytes(used)} of {_format_bytes(_hourly_budget)} in the last hour"
+
+
+def traffic_report(now=None):
+    """One-line breakdown of usage by endpoint and by connection."""
+    endpoints = ", ".join(
+        f"{name} {_format_bytes(totals['bytes'])}/{totals['requests']}"
+        for name, totals in sorted(endpoint_totals.items(), key=lambda item: -item[1]["bytes"])
+    )
+    connections = ", ".join(
+        f"{name} {_format_bytes(totals['bytes'])}"
+        for name, totals in sorted(connection_totals.items())
+    )
+    return (f"Traffic: {usage_summary(now)} | endpoints: {endpoints or 'none'}"
+            + (f" | connections: {connections}" if connections else ""))
+
+
+def _format_bytes(nbytes):
+    for unit in ("B", "KB", "MB"):
+        if nbytes < 1024:
+            return f"{nbytes:.0f}{unit}" if unit == "B" else f"{nbytes:.1f}{unit}"
+        nbytes /= 1024
+    return f"{nbytes:.1f}GB"
@@ -0,0 +1,96 @@
+import time
+
+from utils import debug
+
+# Consecutive network-level failures (no response at all, as opposed to an
+# HTTP error status) before the app treats itself as offline.
+FAILURES_BEFORE_OFFLINE = 3
+# While offline, network calls are suspended and one probe is let through when
+# the backoff expires; each failed probe doubles the wait up to the maximum.
+BACKOFF_INITIAL_SECS = 30
+BACKOFF_MAX_SECS = 600
+
+_consecutive_failures = 0
+_offline_since = None       # monotonic time offline mode began, or None while online
+_backoff = BACKOFF_INITIAL_SECS
+_retry_at = None            # monotonic time the next probe is allowed
+
+stats = {"failures": 0, "suppressed": 0, "outages": 0}
+
+
+def reset():
+    """Return to the online state and clear the counters."""
+    global _consecutive_failures, _offline_since, _backoff, _retry_at
+    _consecutive_failures = 0
+    _offline_since = None
+    _backoff = BACKOFF_INITIAL_SECS
+    _retry_at = None
+    for key in stats:
+        stats[key] = 0
+
+
+def record_success(now=None):
+    """A network call got a response; leaves offline mode if it was active."""
+    global _consecutive_failures, _offline_since, _backoff, _retry_at
+    _consecutive_failures = 0
+    if _offline_since is not None:
+        now = time.monotonic() if now is None else now
+        debug.info(f"Network reachable again after {(now - _offline_since) / 60:.0f} min offline; "
+                   "resuming live updates.")
+        _offline_since = None
+        _backoff = BACKOFF_INITIAL_SECS
+        _retry_at = None
+
+
+def record_failure(error=None, now=None):
+    """A network call failed without a response; may enter offline mode or extend its backoff."""
+    global _consecutive_failures, _offline_since, _backoff, _retry_at
+    now = time.monotonic() if now is None else now
+    stats["failures"] += 1
+    _consecutive_failures += 1
+    if _offline_since is None:
+        if _consecutive_failures >= FAILURES_BEFORE_OFFLINE:
+            _offline_since = now
+            _retry_at = now + _backoff
+            stats["outages"] += 1
+            debug.warning(f"Network unreachable ({error}); showing cached data and "
+                          f"retrying in {_backoff}s.")
+    elif now >= _retry_at:
+        # The probe failed: wait longer before the next one.
+        _backoff = min(_backoff * 2, BACKOFF_MAX_SECS)
+        _retry_at = now + _backoff
+        debug.info(f"Still offline ({error}); next retry in {_backoff}s.")
+
+
+def is_offline():
+    return _offline_since is not None
+
+
+def network_allowed(now=None):
+    """
+    Whether a network call should be attempted: always while online; while
+    offline only once the backoff has expired (a probe). Suppressed calls are counted.
+    """
+    if _offline_since is None:
+        return True
+    now = time.monotonic() if now is None else now
+    if now >= _retry_at:
+        return True
+    stats["suppressed"] += 1
+    return False
+
+
+def seconds_until_retry(now=None):
+    """Seconds until network calls are allowed again (0 while online)."""
+    if _offline_since is None:
+        return 0.0
+    now = time.monotonic() if now is None else now
+    return max(0.0, _retry_at - now)
+
+
+def status_summary(now=None):
+    if _offline_since is None:
+        return "online"
+    now = time.monotonic() if now is None else now
+    return (f"offline for {(now - _offline_since) / 60:.0f} min, next retry in "
+            f"{seconds_until_retry(now):.0f}s ({stats['suppressed']} calls suppressed)")
@@ -1,6 +1,9 @@
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import threading
+import time
+
+from utils.log_queue import BatchRotatingFileHandler, QueueWriterHandler
 
 logger = logging.getLogger("disney-lll")
 
@@ -16,7 +19,7 @@ if not os.path.exists(LOG_DIR):
 
 # Create handlers for both console and file
 console_handler = logging.StreamHandler()  # For console output
-file_handler = RotatingFileHandler(
+file_handler = BatchRotatingFileHandler(
     os.path.join(LOG_DIR, 'app.log'),
     maxBytes=5 * 1024 * 1024,
     backupCount=10
@@ -27,9 +30,10 @@ formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(module)s:%(lineno
 console_handler.setFormatter(formatter)
 file_handler.setFormatter(formatter)
 
-# Add the handlers to the logger
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
+# Both handlers are written by one background thread (utils/log_queue.py), so
+# logging never waits on the console or the SD card.
+queue_handler = QueueWriterHandler([console_handler, file_handler])
+logger.addHandler(queue_handler)
 
 logger.propagate = False
 
@@ -42,3 +46,77 @@ error = logger.error
 log = logger.debug
 
 exception = logger.exception
+
+# Hot paths log with %-style arguments (debug.log("WS raw: %s", data)) so the
+# message is only formatted if a handler will actually emit it. Arguments that
+# are expensive to build themselves go behind enabled() or Lazy().
+
+def enabled(level=logging.DEBUG):
+    """Whether a record at this level would be emitted (cached by the logging module)."""
+    return logger.isEnabledFor(level)
+
+
+class Lazy:
+    """Defer an expensive call until the record is formatted: debug.log("%s", debug.Lazy(dump, parks))."""
+
+    __slots__ = ("func", "args", "kwargs")
+
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return str(self.func(*self.args, **self.kwargs))
+
+
+class Fields:
+    """Structured key=value pairs, formatted only when emitted: debug.info("poll %s", debug.Fields(park=name, ms=12))."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, **values):
+        self.values = values
+
+    def __str__(self):
+        return " ".join(f"{key}={value}" for key, value in self.values.items())
+
+
+# Repeating lines (e.g. the same park skipped on every rotation) are logged at
+# most once per interval; the next emission reports how many were dropped.
+THROTTLE_SECS = 10 * 60
+
+_throttled = {}     # key -> [monotonic time last emitted, lines suppressed since]
+_throttle_lock = threading.Lock()
+throttle_stats = {"emitted": 0, "suppressed": 0}
+
+
+def reset_throttle():
+    with _throttle_lock:
+        _throttled.clear()
+        throttle_stats.update(emitted=0, suppressed=0)
+
+
+def throttled(message, *args, level=logging.INFO, interval=THROTTLE_SECS, key=None, now=None):
+    """
+    Log message % args unless the same line (or key) was logged within the last
+    interval seconds. Returns True if the line was emitted.
+    """
+    if not logger.isEnabledFor(level):
+        return False
+    key = (message, args) if key is None else key
+    now = time.monotonic() if now is None else now
+    with _throttle_lock:
+        entry = _throttled.get(key)
+        if entry is not None and now - entry[0] < interval:
+            entry[1] += 1
+            throttle_stats["suppressed"] += 1
+            return False
+        suppressed = entry[1] if entry is not None else 0
+        _throttled[key] = [now, 0]
+        throttle_stats["emitted"] += 1
+    if suppressed:
+        logger.log(level, message + " (repeated %d times)", *args, suppressed, stacklevel=2)
+    else:
+        logger.log(level, message, *args, stacklevel=2)
+    return True
@@ -0,0 +1,111 @@
+"""Ingest-to-display latency: how long a live-data change waits before the board shows it."""
+import collections
+import math
+import threading
+import time
+
+from utils import debug, metrics
+
+SAMPLE_WINDOW = 2000            # recent samples kept for the percentile report
+REPORT_SECS = 15 * 60
+# A change still unshown after this long (the attraction was closed or hidden)
+# is dropped instead of being reported as latency.
+PENDING_MAX_SECS = 60 * 60
+DISPLAY_FIELDS = ("status", "waitTime", "boardingGroup")
+
+_lock = threading.Lock()
+_pending = {}                   # attraction id -> (monotonic ingest time, source)
+_samples = collections.deque(maxlen=SAMPLE_WINDOW)  # (seconds, source)
+_last_report = None
+
+stats = {"changes": 0, "rendered": 0, "expired": 0}
+
+
+def reset():
+    global _last_report
+    with _lock:
+        _pending.clear()
+        _samples.clear()
+        _last_report = None
+        for key in stats:
+            stats[key] = 0
+
+
+def display_state(attraction):
+    """The fields that decide what an attraction's screen shows."""
+    return tuple(attraction.get(field) for field in DISPLAY_FIELDS)
+
+
+def note_change(attraction_id, source, now=None):
+    """Stamp a display-relevant change; an older unshown change keeps its stamp."""
+    now = time.monotonic() if now is None else now
+    with _lock:
+        stats["changes"] += 1
+        _pending.setdefault(attraction_id, (now, source))
+
+
+def note_rendered(attraction_id, now=None):
+    """Record the latency of the change this render shows, if any. Returns the seconds or None."""
+    with _lock:
+        stamp = _pending.pop(attraction_id, None)
+    if stamp is None:
+        return None
+    now = time.monotonic() if now is None else now
+    seconds = now - stamp[0]
+    with _lock:
+        if seconds > PENDING_MAX_SECS:
+            stats["expired"] += 1
+            return None
+        stats["rendered"] += 1
+        _samples.append((seconds, stamp[1]))
+    metrics.observe("ingest_to_display_seconds", seconds, source=stamp[1])
+    return seconds
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def percentiles(source=None):
+    """{"p50", "p95", "p99", "count"} over the recent samples (optionally one source), or None."""
+    with _lock:
+        values = sorted(seconds for seconds, sample_source in _samples
+                        if source is None or sample_source == source)
+    if not values:
+        return None
+    return {"p50": percentile(values, 0.50), "p95": percentile(values, 0.95),
+            "p99": percentile(values, 0.99), "count": len(values)}
+
+
+def report():
+    """One-line p50/p95/p99 summary, overall and per source."""
+    overall = percentiles()
+    if overall is None:
+        return "Ingest-to-display latency: no changes rendered yet."
+    parts = [f"Ingest-to-display latency over {overall['count']} changes: p50 {overall['p50']:.1f}s, "
+             f"p95 {overall['p95']:.1f}s, p99 {overall['p99']:.1f}s"]
+    for source in sorted({sample_source for _, sample_source in list(_samples)}):
+        by_source = percentiles(source)
+        if by_source:
+            parts.append(f"{source}: p50 {by_source['p50']:.1f}s / p95 {by_source['p95']:.1f}s "
+                         f"/ p99 {by_source['p99']:.1f}s ({by_source['count']})")
+    if stats["expired"]:
+        parts.append(f"{stats['expired']} changes left out (shown after more than {PENDING_MAX_SECS // 60} min)")
+    return " | ".join(parts)
+
+
+def maybe_report(now=None, interval=REPORT_SECS):
+    """Log report() and publish the percentiles as gauges at most once per interval."""
+    global _last_report
+    now = time.monotonic() if now is None else now
+    if _last_report is not None and now - _last_report < interval:
+        return False
+    _last_report = now
+    overall = percentiles()
+    if overall is not None:
+        for key in ("p50", "p95", "p99"):
+            metrics.set_gauge("ingest_to_display_quantile_seconds", overall[key], quantile=key)
+    debug.info(report())
+    return True
@@ -0,0 +1,187 @@
+"""Non-blocking logging: callers enqueue records, one writer thread does the I/O."""
+import collections
+import logging
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+QUEUE_CAPACITY = 10000
+BATCH_SIZE = 256
+FLUSH_INTERVAL_SECS = 2.0
+STOP_TIMEOUT_SECS = 5.0
+
+
+class BatchRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that writes a batch of records without flushing after each one."""
+
+    def emit_batch(self, records):
+        self.acquire()
+        try:
+            for record in records:
+                try:
+                    if self.shouldRollover(record):
+                        self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+                    self.stream.write(self.format(record) + self.terminator)
+                except Exception:
+                    self.handleError(record)
+        finally:
+            self.release()
+
+
+class QueueWriterHandler(logging.Handler):
+    """Hands records to a single writer thread that owns the target handlers."""
+
+    def __init__(self, targets, capacity=QUEUE_CAPACITY, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL_SECS, start=True):
+        super().__init__()
+        self.targets = list(targets)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = collections.deque()
+        self._ready = threading.Condition(threading.Lock())
+        self._stopping = False
+        self._outstanding = 0   # records enqueued but not yet written
+        self._thread = None
+        self._reported_drops = 0
+        self.stats = {"enqueued": 0, "written": 0, "dropped": 0, "evicted": 0,
+                      "batches": 0, "flushes": 0, "max_depth": 0, "write_errors": 0}
+        if start:
+            self.start()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def prepare(self, record):
+        """
+        Format the message on the calling thread (as QueueHandler does), so the
+        record no longer references mutable arguments such as parks_data.
+        """
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        try:
+            record = self.prepare(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._ready:
+            if not self._stopping and self._thread is not None:
+                if len(self._queue) >= self.capacity:
+                    if record.levelno < logging.WARNING:
+                        self.stats["dropped"] += 1
+                        return
+                    self._queue.popleft()
+                    self._outstanding -= 1
+                    self.stats["evicted"] += 1
+                self._queue.append(record)
+                self._outstanding += 1
+                self.stats["enqueued"] += 1
+                self.stats["max_depth"] = max(self.stats["max_depth"], len(self._queue))
+                self._ready.notify()
+                return
+        # Stopped (or never started): nothing will drain the queue, write directly.
+        self.write_batch([record])
+
+    def depth(self):
+        return len(self._queue)
+
+    def summary(self):
+        stats = self.stats
+        return (f"Log queue: {self.depth()} queued (peak {stats['max_depth']}), {stats['written']} written "
+                f"in {stats['batches']} batches, {stats['flushes']} flushes, "
+                f"{stats['dropped'] + stats['evicted']} dropped, {stats['write_errors']} write errors")
+
+    def _take_batch(self, timeout):
+        with self._ready:
+            if not self._queue and not self._stopping:
+                self._ready.wait(timeout)
+            count = min(len(self._queue), self.batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _drop_notice(self):
+        lost = self.stats["dropped"] + self.stats["evicted"] - self._reported_drops
+        if not lost:
+            return None
+        self._reported_drops += lost
+        return logging.LogRecord("disney-lll", logging.WARNING, __file__, 0,
+                                 f"Log queue full: {lost} records dropped.", None, None, "log_writer")
+
+    def write_batch(self, records):
+        """Write records to every target."""
+        notice = self._drop_notice()
+        if notice is not None:
+            records = records + [notice]
+        for target in self.targets:
+            try:
+                if hasattr(target, "emit_batch"):
+                    target.emit_batch([r for r in records if r.levelno >= target.level])
+                else:
+                    for record in records:
+                        if record.levelno >= target.level:
+                            target.handle(record)
+            except Exception:
+                self.stats["write_errors"] += 1
+        self.stats["written"] += len(records)
+        self.stats["batches"] += 1
+
+    def flush_targets(self):
+        for target in self.targets:
+            try:
+                target.flush()
+            except Exception:
+                self.stats["write_errors"] += 1
+        self.stats["flushes"] += 1
+
+    def _run(self):
+        last_flush = time.monotonic()
+        dirty = False
+        while True:
+            batch = self._take_batch(self.flush_interval)
+            if batch:
+                self.write_batch(batch)
+                with self._ready:
+                    self._outstanding -= len(batch)
+                dirty = True
+            now = time.monotonic()
+            urgent = any(record.levelno >= logging.ERROR for record in batch)
+            if dirty and (urgent or now - last_flush >= self.flush_interval):
+                self.flush_targets()
+                last_flush = now
+                dirty = False
+            if self._stopping and not self._queue:
+                if dirty:
+                    self.flush_targets()
+                return
+
+    def flush(self):
+        """Wait (bounded) until everything queued so far is written, then flush the targets."""
+        deadline = time.monotonic() + STOP_TIMEOUT_SECS
+        while self._outstanding and self._thread is not None and self._thread.is_alive():
+            if time.monotonic() >= deadline:
+                return
+            time.sleep(0.01)
+        self.flush_targets()
+
+    def stop(self, timeout=STOP_TIMEOUT_SECS):
+        """Drain the queue, flush and stop the writer thread."""
+        with self._ready:
+            self._stopping = True
+            self._ready.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def close(self):
+        self.stop()
+        for target in self.targets:
+            target.close()
+        super().close()
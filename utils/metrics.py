@@ -0,0 +1,224 @@
+"""In-process metrics registry: counters, gauges and histograms with labels."""
+import contextlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils import debug
+
+PREFIX = "disney_lll_"
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+AGE_BUCKETS = (10, 30, 60, 120, 300, 600, 900, 1800, 3600, 7200)
+DISPLAY_LATENCY_BUCKETS = (1, 2, 5, 10, 15, 30, 60, 120, 300, 600, 1800, 3600)
+JSON_DUMP_SECS = 60
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    "rest_requests_total": ("counter", "ThemeParks REST requests by endpoint and outcome.", None),
+    "rest_request_seconds": ("histogram", "ThemeParks REST request latency.", LATENCY_BUCKETS),
+    "ws_messages_total": ("counter", "WebSocket messages received, by connection.", None),
+    "ws_apply_seconds": ("histogram", "Time to decode and apply one WebSocket message.", LATENCY_BUCKETS),
+    "ws_connected": ("gauge", "1 while the WebSocket connection is up.", None),
+    "ws_disconnects_total": ("counter", "WebSocket connections lost.", None),
+    "merge_seconds": ("histogram", "Time to merge a batch of REST live data into a park.", LATENCY_BUCKETS),
+    "weather_requests_total": ("counter", "Weather API requests by outcome.", None),
+    "weather_request_seconds": ("histogram", "Weather API request latency.", LATENCY_BUCKETS),
+    "frame_render_seconds": ("histogram", "Time to draw one screen, by screen.", LATENCY_BUCKETS),
+    "attraction_data_age_seconds": ("histogram", "Age of the live data behind each rendered attraction.",
+                                    AGE_BUCKETS),
+    "ingest_to_display_seconds": ("histogram", "Time from a live-data change arriving to it being drawn, by source.",
+                                  DISPLAY_LATENCY_BUCKETS),
+    "ingest_to_display_quantile_seconds": ("gauge", "Recent ingest-to-display latency percentiles.", None),
+    "thread_cpu_seconds_total": ("counter", "CPU time used, by thread.", None),
+    "thread_runqueue_wait_seconds_total": ("counter", "Time runnable but waiting for a CPU core, by thread.", None),
+    "thread_gil_wait_seconds_total": ("counter", "Estimated time spent waiting for the GIL, by thread.", None),
+    "thread_cpu_ratio": ("gauge", "Share of one core used over the last accounting window, by thread.", None),
+    "gil_acquire_delay_seconds": ("gauge", "Mean measured delay to retake the GIL over the last window.", None),
+}
+
+_lock = threading.Lock()
+_counters = {}      # (name, labels) -> value
+_gauges = {}        # (name, labels) -> value
+_histograms = {}    # (name, labels) -> [bucket counts..., +Inf count], sum
+_server = None
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
+
+
+def _buckets_for(name):
+    return METRICS.get(name, (None, None, LATENCY_BUCKETS))[2] or LATENCY_BUCKETS
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name, amount=1, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def set_gauge(name, value, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _gauges[key] = value
+
+
+def observe(name, value, **labels):
+    buckets = _buckets_for(name)
+    key = _key(name, labels)
+    with _lock:
+        entry = _histograms.get(key)
+        if entry is None:
+            entry = _histograms[key] = [[0] * (len(buckets) + 1), 0.0]
+        counts = entry[0]
+        for index, bound in enumerate(buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+        entry[1] += value
+
+
+@contextlib.contextmanager
+def timed(name, **labels):
+    """Observe the wall time of the with-block in histogram name."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def histogram_quantile(name, quantile, **labels):
+    """Estimate a quantile from a histogram's buckets (upper bound of the bucket), or None."""
+    with _lock:
+        entry = _histograms.get(_key(name, labels))
+        counts = list(entry[0]) if entry else None
+    if not counts or not sum(counts):
+        return None
+    buckets = _buckets_for(name)
+    target = quantile * sum(counts)
+    running = 0
+    for index, count in enumerate(counts):
+        running += count
+        if running >= target:
+            return buckets[index] if index < len(buckets) else float("inf")
+    return float("inf")
+
+
+def snapshot():
+    """All metrics as plain data (the JSON dump format)."""
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        histograms = {key: (list(entry[0]), entry[1]) for key, entry in _histograms.items()}
+    result = {"timestamp": time.time(), "counters": [], "gauges": [], "histograms": []}
+    for (name, labels), value in sorted(counters.items()):
+        result["counters"].append({"name": name, "labels": dict(labels), "value": value})
+    for (name, labels), value in sorted(gauges.items()):
+        result["gauges"].append({"name": name, "labels": dict(labels), "value": value})
+    for (name, labels), (counts, total) in sorted(histograms.items()):
+        bounds = [str(bound) for bound in _buckets_for(name)] + ["+Inf"]
+        result["histograms"].append({"name": name, "labels": dict(labels), "count": sum(counts), "sum": total,
+                                     "buckets": dict(zip(bounds, counts))})
+    return result
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels.items()) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def prometheus_text():
+    """The registry in Prometheus text exposition format."""
+    data = snapshot()
+    lines = []
+    described = set()
+
+    def describe(name, kind):
+        if name not in described:
+            described.add(name)
+            lines.append(f"# HELP {PREFIX}{name} {METRICS.get(name, (None, name, None))[1]}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+    for kind in ("counters", "gauges"):
+        for metric in data[kind]:
+            describe(metric["name"], kind[:-1])
+            lines.append(f"{PREFIX}{metric['name']}{_format_labels(metric['labels'])} {metric['value']}")
+    for metric in data["histograms"]:
+        name = metric["name"]
+        describe(name, "histogram")
+        running = 0
+        for bound, count in metric["buckets"].items():
+            running += count
+            lines.append(f"{PREFIX}{name}_bucket{_format_labels(metric['labels'], ('le', bound))} {running}")
+        lines.append(f"{PREFIX}{name}_sum{_format_labels(metric['labels'])} {metric['sum']}")
+        lines.append(f"{PREFIX}{name}_count{_format_labels(metric['labels'])} {metric['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def dump_json(path):
+    """Write snapshot() to path atomically."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(snapshot(), file, indent=1)
+    os.replace(tmp_path, path)
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = prometheus_text().encode(), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body, content_type = json.dumps(snapshot()).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        debug.log("Metrics request: " + format, *args)
+
+
+def serve(port, host="127.0.0.1"):
+    """Serve /metrics (Prometheus) and /metrics.json on a daemon thread. Returns the server."""
+    global _server
+    _server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+    debug.info(f"Metrics available at http://{host}:{_server.server_address[1]}/metrics")
+    return _server
+
+
+def start_json_dump(path, interval=JSON_DUMP_SECS):
+    """Dump the registry to path every interval seconds on a daemon thread."""
+    def dump_forever():
+        while True:
+            time.sleep(interval)
+            try:
+                dump_json(path)
+            except OSError as e:
+                debug.error(f"Failed to write metrics to {path}: {e}")
+
+    threading.Thread(target=dump_forever, name="metrics-dump", daemon=True).start()
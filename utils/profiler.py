@@ -0,0 +1,152 @@
+"""Sampling profiler writing per-subsystem pstats and collapsed-stack reports."""
+import marshal
+import os
+import sys
+import threading
+import time
+
+from utils import debug
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
+DEFAULT_DURATION_SECS = 300
+DEFAULT_INTERVAL_SECS = 0.01
+UPDATER_THREAD_NAME = "live-updates"
+_WS_MODULE = os.path.join("updater", "websocket_updater.py")
+_PROC_TASKS = "/proc/self/task"
+
+
+def _code_key(code):
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+def _stack(frame):
+    """Code keys from outermost to innermost frame."""
+    keys = []
+    while frame is not None:
+        keys.append(_code_key(frame.f_code))
+        frame = frame.f_back
+    keys.reverse()
+    return keys
+
+
+def _frame_label(key):
+    filename, lineno, name = key
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+def classify(thread, stack):
+    """The subsystem a sampled stack belongs to."""
+    if thread is threading.main_thread():
+        return "render"
+    if thread.name == UPDATER_THREAD_NAME:
+        return "ws" if any(key[0].endswith(_WS_MODULE) for key in stack) else "rest"
+    if thread.name.startswith("blocking-io"):
+        return "rest"
+    return "other"
+
+
+def _on_cpu(native_id):
+    """True if the thread is running (Linux), None if that can't be told."""
+    try:
+        with open(f"{_PROC_TASKS}/{native_id}/stat", "rb") as file:
+            stat = file.read()
+    except OSError:
+        return None
+    # The state follows the parenthesised thread name, which may contain spaces.
+    return stat[stat.rindex(b")") + 2:stat.rindex(b")") + 3] == b"R"
+
+
+class SamplingProfiler:
+    """Samples all threads for duration seconds, then writes per-subsystem reports."""
+
+    def __init__(self, duration=DEFAULT_DURATION_SECS, interval=DEFAULT_INTERVAL_SECS, output_dir=None):
+        self.duration = duration
+        self.interval = interval
+        self.output_dir = output_dir or os.path.join(PROFILE_DIR, time.strftime("%Y%m%d-%H%M%S"))
+        self.stacks = {}        # subsystem -> {tuple(code keys): samples}
+        self.samples = 0
+        self.skipped_idle = 0
+        self.overhead_secs = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._check_cpu = os.path.isdir(_PROC_TASKS)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        debug.info(f"Profiling for {self.duration:.0f}s (every {self.interval * 1000:.0f} ms); "
+                   f"reports go to {self.output_dir}")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def sample(self):
+        """Take one sample of every other thread."""
+        started = time.thread_time()
+        threads = {thread.ident: thread for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            thread = threads.get(ident)
+            if thread is None or ident == threading.get_ident():
+                continue
+            if self._check_cpu and _on_cpu(thread.native_id) is False:
+                self.skipped_idle += 1
+                continue
+            stack = tuple(_stack(frame))
+            by_stack = self.stacks.setdefault(classify(thread, stack), {})
+            by_stack[stack] = by_stack.get(stack, 0) + 1
+            self.samples += 1
+        self.overhead_secs += time.thread_time() - started
+
+    def _run(self):
+        deadline = time.monotonic() + self.duration
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            self.sample()
+            self._stop.wait(self.interval)
+        try:
+            self.write_reports()
+        except OSError as e:
+            debug.error(f"Failed to write profile reports to {self.output_dir}: {e}")
+
+    def pstats_data(self, subsystem):
+        """
+        Sample counts as the dict pstats.Stats loads: {func: (calls, calls,
+        self seconds, cumulative seconds, {caller: (calls, calls, self, cumulative)})},
+        with each sample worth one interval.
+        """
+        stats = {}
+        callers = {}
+        for stack, count in self.stacks.get(subsystem, {}).items():
+            seconds = count * self.interval
+            for depth, key in enumerate(stack):
+                if key in stack[:depth]:
+                    continue  # recursion: count each function once per sample
+                own = seconds if key == stack[-1] else 0.0
+                calls, _, self_secs, total = stats.get(key, (0, 0, 0.0, 0.0))
+                stats[key] = (calls + count, calls + count, self_secs + own, total + seconds)
+                if depth:
+                    edges = callers.setdefault(key, {})
+                    caller = stack[depth - 1]
+                    c_calls, _, c_self, c_total = edges.get(caller, (0, 0, 0.0, 0.0))
+                    edges[caller] = (c_calls + count, c_calls + count, c_self + own, c_total + seconds)
+        return {key: value + (callers.get(key, {}),) for key, value in stats.items()}
+
+    def collapsed(self, subsystem):
+        """Collapsed stacks ("outer;inner count" lines) for flame graphs."""
+        lines = [";".join(_frame_label(key) for key in stack) + f" {count}"
+                 for stack, count in self.stacks.get(subsystem, {}).items()]
+        return "\n".join(sorted(lines)) + "\n"
+
+    def write_reports(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        for subsystem in sorted(self.stacks):
+            with open(os.path.join(self.output_dir, f"{subsystem}.pstats"), "wb") as file:
+                marshal.dump(self.pstats_data(subsystem), file)
+            with open(os.path.join(self.output_dir, f"{subsystem}.collapsed"), "w") as file:
+                file.write(self.collapsed(subsystem))
+        counts = ", ".join(f"{subsystem} {sum(stacks.values())}" for subsystem, stacks in sorted(self.stacks.items()))
+        debug.info(f"Profile written to {self.output_dir}: {self.samples} samples ({counts}), "
+                   f"{self.skipped_idle} idle samples skipped, sampler CPU {self.overhead_secs:.2f}s")
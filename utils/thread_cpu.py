@@ -0,0 +1,167 @@
+"""Per-thread CPU, run-queue and estimated GIL wait, read from /proc once per window."""
+import os
+import re
+import threading
+import time
+
+from utils import debug, metrics
+
+REPORT_SECS = 300
+PROBE_BURST = 20
+PROBE_INTERVAL_SECS = 0.01
+PROBE_SLEEP_SECS = 0.001
+_TASKS = "/proc/self/task"
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+_lock = threading.Lock()
+_previous = {}          # native thread id -> (label, (cpu, run queue, switches))
+_previous_at = None
+_probes = []            # GIL acquire delays measured this window
+
+stats = {"windows": 0, "probes": 0}
+
+
+def reset():
+    global _previous_at
+    with _lock:
+        _previous.clear()
+        _probes.clear()
+        _previous_at = None
+        for key in stats:
+            stats[key] = 0
+
+
+def available():
+    return os.path.isdir(_TASKS)
+
+
+def thread_label(thread):
+    """A stable metric label: the main thread is the render loop, numbered threads are grouped."""
+    if thread is threading.main_thread():
+        return "render"
+    # "blocking-io_0", "weather-icon-800", "Thread-3 (process_request_thread)"
+    return re.sub(r"[-_ ]?\d.*$", "", thread.name) or thread.name
+
+
+def read_task(native_id):
+    """(cpu seconds, run-queue seconds, voluntary switches) for a thread, or None if it's gone."""
+    base = f"{_TASKS}/{native_id}"
+    try:
+        try:
+            with open(f"{base}/schedstat") as file:
+                run_ns, wait_ns = file.read().split()[:2]
+            cpu, run_queue = int(run_ns) / 1e9, int(wait_ns) / 1e9
+        except (OSError, ValueError):
+            with open(f"{base}/stat") as file:
+                # utime and stime follow the parenthesised name (fields 14 and 15).
+                fields = file.read().rsplit(")", 1)[1].split()
+            cpu, run_queue = (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS, 0.0
+        switches = 0
+        with open(f"{base}/status") as file:
+            for line in file:
+                if line.startswith("voluntary_ctxt_switches:"):
+                    switches = int(line.split()[1])
+                    break
+    except (OSError, ValueError, IndexError):
+        return None
+    return cpu, run_queue, switches
+
+
+def probe_gil(sleep=PROBE_SLEEP_SECS):
+    """How much later than asked a short sleep returns, less time queued for a core. Returns seconds."""
+    native_id = threading.get_native_id()
+    before = read_task(native_id)
+    started = time.perf_counter()
+    time.sleep(sleep)
+    late = time.perf_counter() - started - sleep
+    after = read_task(native_id)
+    if before and after:
+        late -= after[1] - before[1]
+    late = max(0.0, late)
+    with _lock:
+        _probes.append(late)
+        stats["probes"] += 1
+    return late
+
+
+def account(now=None):
+    """
+    Per-label CPU, run-queue wait and estimated GIL wait since the previous
+    call, published to metrics. The first call only takes the baseline and
+    returns None.
+    """
+    global _previous_at
+    now = time.monotonic() if now is None else now
+    current = {}
+    for thread in threading.enumerate():
+        reading = read_task(thread.native_id) if thread.native_id is not None else None
+        if reading is not None:
+            current[thread.native_id] = (thread_label(thread), reading)
+    with _lock:
+        previous, previous_at = dict(_previous), _previous_at
+        probes = list(_probes)
+        _previous.clear()
+        _previous.update(current)
+        _previous_at = now
+        _probes.clear()
+    if previous_at is None:
+        return None
+    elapsed = max(now - previous_at, 1e-9)
+    gil_delay = sum(probes) / len(probes) if probes else 0.0
+
+    deltas = {}
+    for native_id, (label, reading) in current.items():
+        _, before = previous.get(native_id, (label, (0.0, 0.0, 0)))
+        deltas[native_id] = (label,) + tuple(max(0, now_value - then) for now_value, then in zip(reading, before))
+    total_cpu = sum(cpu for _, cpu, _, _ in deltas.values())
+
+    threads = {}
+    for label, cpu, run_queue, switches in deltas.values():
+        # Every wake-up retakes the GIL, which can only be held while another thread runs.
+        gil_wait = min(switches * gil_delay, total_cpu - cpu, elapsed)
+        entry = threads.setdefault(label, {"cpu": 0.0, "run_queue": 0.0, "gil_wait": 0.0, "count": 0})
+        entry["cpu"] += cpu
+        entry["run_queue"] += run_queue
+        entry["gil_wait"] += max(0.0, gil_wait)
+        entry["count"] += 1
+
+    for label, entry in threads.items():
+        metrics.inc("thread_cpu_seconds_total", entry["cpu"], thread=label)
+        metrics.inc("thread_runqueue_wait_seconds_total", entry["run_queue"], thread=label)
+        metrics.inc("thread_gil_wait_seconds_total", entry["gil_wait"], thread=label)
+        metrics.set_gauge("thread_cpu_ratio", entry["cpu"] / elapsed, thread=label)
+    metrics.set_gauge("gil_acquire_delay_seconds", gil_delay)
+    stats["windows"] += 1
+    return {"elapsed": elapsed, "gil_delay": gil_delay, "probes": len(probes), "threads": threads}
+
+
+def report(result):
+    """One line per window, busiest thread first."""
+    parts = [f"{label} {entry['cpu'] / result['elapsed']:.1%} CPU, ~{entry['gil_wait']:.2f}s GIL wait, "
+             f"{entry['run_queue']:.2f}s run queue" + (f" ({entry['count']} threads)" if entry["count"] > 1 else "")
+             for label, entry in sorted(result["threads"].items(), key=lambda item: -item[1]["cpu"])]
+    return (f"Thread CPU over {result['elapsed']:.0f}s (GIL retake ~{result['gil_delay'] * 1000:.1f} ms): "
+            + " | ".join(parts))
+
+
+def _run(interval):
+    account()
+    while True:
+        # Sleep through the window; probing only in a burst at its end keeps the
+        # cost to a few dozen /proc reads per window.
+        time.sleep(max(0.0, interval - PROBE_BURST * PROBE_INTERVAL_SECS))
+        for _ in range(PROBE_BURST):
+            probe_gil()
+            time.sleep(PROBE_INTERVAL_SECS)
+        result = account()
+        if result is not None:
+            debug.info(report(result))
+
+
+def start(interval=REPORT_SECS):
+    """Account thread CPU every interval seconds on a daemon thread. Returns False where /proc is missing."""
+    if not available():
+        debug.log("Per-thread CPU accounting needs /proc; disabled.")
+        return False
+    threading.Thread(target=_run, args=(interval,), name="cpu-accounting", daemon=True).start()
+    return True
@@ -0,0 +1,65 @@
+"""Memoized timestamp parsing and formatting shared by the updaters and the display."""
+import functools
+import time
+from datetime import datetime, timezone
+
+import pytz
+
+_PARSE_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=None)
+def get_timezone(name):
+    """Return a cached pytz timezone."""
+    return pytz.timezone(name)
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def parse_iso(value):
+    """
+    Parse an ISO-8601 timestamp ('Z' suffix allowed) into an aware datetime.
+    Returns None for empty, invalid or offset-less values.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else None
+
+
+def iso_to_epoch(value):
+    """Epoch seconds for an ISO-8601 timestamp, or None if it can't be parsed."""
+    parsed = parse_iso(value)
+    return parsed.timestamp() if parsed is not None else None
+
+
+def minutes_since(epoch, now=None):
+    """Whole minutes elapsed since an epoch timestamp, or None if epoch is None."""
+    if epoch is None:
+        return None
+    now = time.time() if now is None else now
+    return round((now - epoch) / 60)
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def get_eastern(utc_timestamp):
+    """Format a UTC timestamp as US/Eastern 12-hour time, e.g. '2025-05-10 04:11 PM'."""
+    if not utc_timestamp:
+        return None
+    parsed = parse_iso(utc_timestamp)
+    if parsed is None:
+        # Offset-less timestamps are UTC by ThemeParks convention.
+        parsed = datetime.fromisoformat(utc_timestamp).replace(tzinfo=timezone.utc)
+    return parsed.astimezone(get_timezone("US/Eastern")).strftime("%Y-%m-%d %I:%M %p")
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def format_clock_hour(iso_str):
+    """'2025-03-17T09:00:00-04:00' -> '9AM', in the timestamp's own offset; None if unparseable."""
+    try:
+        parsed = datetime.fromisoformat(iso_str)
+    except (TypeError, ValueError):
+        return None
+    return parsed.strftime("%I%p").lstrip("0").upper()
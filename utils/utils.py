@@ -1,11 +1,11 @@
 import argparse
+import asyncio
+import functools
 import json
 from collections.abc import Mapping
-from datetime import datetime
-
-import pytz
 
 from utils import debug
+from utils.time_utils import get_eastern  # noqa: F401 (re-exported)
 
 
 def pretty_print_json(json_obj):
@@ -138,6 +138,16 @@ def args():
     parser.add_argument(
         "--drop-privileges", action="store_true", help="Force the matrix driver to drop root privileges after setup."
     )
+    parser.add_argument(
+        "--profile",
+        action="store",
+        nargs="?",
+        help="Sample where each thread spends CPU for this many seconds and write reports to profiles/. "
+        "(Default: 300 when given without a value)",
+        const=300,
+        default=None,
+        type=int,
+    )
     return parser.parse_args()
 
 
@@ -205,15 +215,7 @@ def deep_update(source, overrides):
     return source
 
 
-def get_eastern(utc_timestamp):
-    if not utc_timestamp:
-        return None
-    # Parse the timestamp and create a UTC datetime object
-    utc_time = datetime.fromisoformat(utc_timestamp[:-1])  # Remove 'Z' for parsing
-    utc_time = utc_time.replace(tzinfo=pytz.utc)
-    # Define the Eastern Time zone
-    eastern = pytz.timezone('US/Eastern')
-    # Convert to Eastern Time
-    eastern_time = utc_time.astimezone(eastern)
-    # Format the time in a non-military format (12-hour) with AM/PM
-    return eastern_time.strftime("%Y-%m-%d %I:%M %p")  # e.g., "2025-05-10 04:11 PM"
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call (requests) on the event loop's executor and await it."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))